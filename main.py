@@ -6,20 +6,27 @@ Point d'entrée principal pour l'application de détection d'anomalies dans les
 """
 
 import argparse
+import asyncio
 import sys
 import subprocess
+import pandas as pd
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
 from src.ia.modele import ModeleIA
+from src.ia.artefacts import SUFFIXE_COMPILE
+from src.ia.registre import obtenir_modele
+from src.ia.algorithmes import ALGORITHMES
 from src.affichage.cli import AffichageCLI
+from src.affichage.cli_async import MoniteurAsync
 from src.affichage.graphique import AffichageGraphique
 from src.utils.dataset_generator import DatasetGenerator
+from src.utils.stockage import StockageMesures
 
 def parse_arguments():
     """Parse les arguments de ligne de commande."""
     parser = argparse.ArgumentParser(description='Détection d\'anomalies dans les liaisons faisceaux hertziens')
     
-    parser.add_argument('--mode', type=str, choices=['cli', 'gui', 'streamlit'], default='cli',
-                        help='Mode d\'affichage (cli, gui ou streamlit)')
+    parser.add_argument('--mode', type=str, choices=['cli', 'cli-async', 'gui', 'streamlit'], default='cli',
+                        help='Mode d\'affichage (cli, cli-async, gui ou streamlit)')
     
     parser.add_argument('--condition', type=str, 
                         choices=['normal_urbain', 'pluie_urbain', 'brouillard_urbain', 'normal_rural', 'pluie_rural', 'brouillard_rural'],
@@ -36,7 +43,29 @@ def parse_arguments():
                         help='Nombre d\'échantillons par condition pour la génération de dataset')
     
     parser.add_argument('--output', type=str, default='dataset.csv',
-                        help='Fichier de sortie pour le dataset généré')
+                        help='Fichier de sortie pour le dataset généré (.csv, .parquet ou .feather)')
+    
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Graine aléatoire pour une génération reproductible')
+    
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Nombre de processus pour la génération de dataset')
+    
+    parser.add_argument('--historique', type=str, default=None,
+                        help='Fichier SQLite où enregistrer les mesures et états (ex. historique_fh.db)')
+    
+    parser.add_argument('--rechercher-hyperparametres', action='store_true',
+                        help='Chercher les meilleurs hyperparamètres et exporter le gagnant dans modele.pkl')
+    
+    parser.add_argument('--budget-cpu', type=float, default=600.0,
+                        help='Budget de temps CPU de la recherche, en secondes (tous processus confondus)')
+    
+    parser.add_argument('--algorithmes', type=str, nargs='+', default=None,
+                        choices=ALGORITHMES,
+                        help='Algorithmes en lice pour la recherche (tous par défaut)')
+    
+    parser.add_argument('--cache-recherche', type=str, default='.cache_recherche',
+                        help='Dossier du cache des plis, qui permet de reprendre une recherche interrompue')
     
     return parser.parse_args()
 
@@ -45,14 +74,13 @@ def main():
     args = parse_arguments()
     
     # Initialiser le simulateur
-    simulateur = SimulateurFaisceauHertzien()
+    simulateur = SimulateurFaisceauHertzien(seed=args.seed)
     
     # Génération de dataset
     if args.generer_dataset:
         print(f"Génération d'un dataset avec {args.samples} échantillons par condition...")
         generator = DatasetGenerator(simulateur)
-        dataset = generator.generer_dataset(args.samples)
-        dataset.to_csv(args.output, index=False)
+        generator.ecrire_dataset(args.output, args.samples, seed=args.seed, workers=args.workers)
         print(f"Dataset généré et sauvegardé dans {args.output}")
         return
     
@@ -63,17 +91,44 @@ def main():
     if args.entrainer_modele:
         print("Génération d'un dataset pour l'entraînement...")
         generator = DatasetGenerator(simulateur)
-        dataset = generator.generer_dataset(args.samples)
+        dataset = generator.generer_dataset(args.samples, seed=args.seed, workers=args.workers)
         
         print("Entraînement du modèle...")
         modele.entrainer_et_evaluer(dataset)
         modele.sauvegarder("modele.pkl")
+        modele.exporter_compile("modele.pkl" + SUFFIXE_COMPILE)
         print("Modèle entraîné et sauvegardé dans modele.pkl")
         return
     
+    # Recherche d'hyperparamètres
+    if args.rechercher_hyperparametres:
+        # Import tardif : scipy et les quatre algorithmes ne sont chargés que pour la recherche
+        from src.ia.recherche_hyperparametres import rechercher, exporter_meilleur
+        
+        # Graine fixe par défaut : même dataset, donc reprise depuis le cache après interruption
+        graine = args.seed if args.seed is not None else 42
+        print("Génération d'un dataset pour la recherche...")
+        generator = DatasetGenerator(simulateur)
+        dataset = pd.concat(list(generator.generer_flux(args.samples, seed=graine, workers=args.workers)),
+                            ignore_index=True)
+        X, y = modele.preparer_dataset(dataset)
+        
+        print(f"Recherche d'hyperparamètres (budget CPU : {args.budget_cpu:.0f} s)...")
+        resultat = rechercher(X, y, algorithmes=args.algorithmes, budget_cpu=args.budget_cpu,
+                              workers=None, dossier_cache=args.cache_recherche, graine=graine)
+        meilleur = resultat["meilleur"]
+        print(f"Meilleure configuration : {meilleur['algo']} {meilleur['params']} "
+              f"(précision {meilleur['score']:.4f} sur {meilleur['ressource']} lignes)")
+        print(f"CPU de la recherche : {resultat['cpu_utilise']:.1f} s, plis calculés : {resultat['plis_calcules']}, "
+              f"repris du cache : {resultat['plis_en_cache']}")
+        exporter_meilleur(resultat, X, y, "modele.pkl")
+        print(f"Modèle gagnant réentraîné et sauvegardé dans modele.pkl "
+              f"(CPU : {resultat['cpu_entrainement_final']:.1f} s, total {resultat['cpu_utilise']:.1f} s)")
+        return
+    
     # Charger ou entraîner un modèle
     try:
-        modele.charger("modele.pkl")
+        modele = obtenir_modele("modele.pkl")
         print("Modèle pré-entraîné chargé")
     except FileNotFoundError:
         print("Aucun modèle pré-entraîné trouvé. Entraînement d'un nouveau modèle...")
@@ -81,27 +136,38 @@ def main():
         dataset = generator.generer_dataset(1000)
         modele.entrainer_et_evaluer(dataset)
         modele.sauvegarder("modele.pkl")
+        modele.exporter_compile("modele.pkl" + SUFFIXE_COMPILE)
+    
+    # Historique persistant (optionnel)
+    stockage = StockageMesures(args.historique) if args.historique else None
     
     # Sélection du mode d'affichage
-    if args.mode == 'cli':
-        affichage = AffichageCLI(simulateur, modele)
-        affichage.demarrer(args.condition)
-    elif args.mode == 'gui':
-        affichage = AffichageGraphique(simulateur, modele)
-        affichage.demarrer(args.condition)
-    elif args.mode == 'streamlit':
-        # Lancer l'application Streamlit
-        try:
-            subprocess.run([
-                sys.executable, "-m", "streamlit", "run", 
-                "src/affichage/streamlit_app.py", 
-                "--", 
-                "--condition", args.condition
-            ], check=True)
-        except subprocess.CalledProcessError:
-            print("Erreur lors du lancement de l'application Streamlit")
-        except FileNotFoundError:
-            print("Streamlit n'est pas installé. Veuillez l'installer avec: pip install streamlit")
+    try:
+        if args.mode == 'cli':
+            affichage = AffichageCLI(simulateur, modele, stockage=stockage)
+            affichage.demarrer(args.condition)
+        elif args.mode == 'cli-async':
+            moniteur = MoniteurAsync(simulateur, modele, args.condition, stockage=stockage)
+            asyncio.run(moniteur.executer())
+        elif args.mode == 'gui':
+            affichage = AffichageGraphique(simulateur, modele, stockage=stockage)
+            affichage.demarrer(args.condition)
+        elif args.mode == 'streamlit':
+            # Lancer l'application Streamlit
+            try:
+                subprocess.run([
+                    sys.executable, "-m", "streamlit", "run", 
+                    "src/affichage/streamlit_app.py", 
+                    "--", 
+                    "--condition", args.condition
+                ], check=True)
+            except subprocess.CalledProcessError:
+                print("Erreur lors du lancement de l'application Streamlit")
+            except FileNotFoundError:
+                print("Streamlit n'est pas installé. Veuillez l'installer avec: pip install streamlit")
+    finally:
+        if stockage is not None:
+            stockage.fermer()
 
 if __name__ == "__main__":
     try:
@@ -3,11 +3,13 @@
 
 import sys
 import time
-import pandas as pd
+from typing import Dict
+import numpy as np
 from tabulate import tabulate  # pip install tabulate
 
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
 from src.ia.modele import ModeleIA
+from src.utils.tampon_circulaire import TamponCirculaire
 
 
 class AffichageCLI:
@@ -19,9 +21,13 @@ class AffichageCLI:
         self.simulateur = simulateur
         self.modele = modele
         self.running = False
-        self.data_history = pd.DataFrame()
+        # Historique à capacité fixe : seuls les 20 derniers points sont affichés
+        self.data_history = TamponCirculaire(20, {
+            "rssi": float, "snr": float, "ber": float,
+            "disponibilite": float, "condition": object, "etat": object
+        })
 
-    def afficher_parametres(self, data: pd.DataFrame) -> None:
+    def afficher_parametres(self, data: Dict[str, np.ndarray]) -> None:
         """
         Affiche les derniers points simulés sous forme de tableau
         """
@@ -35,15 +41,15 @@ class AffichageCLI:
             else:
                 return f"\033[91m{etat}\033[0m"
 
-        df = data.copy()
-        df["Etat"] = df["etat"].apply(color_etat)
+        table = dict(data)
+        table["Etat"] = [color_etat(etat) for etat in data["etat"]]
 
         # Afficher tableau dans CLI
         print("\033[H\033[J", end="")  # Effacer écran
         print("=" * 80)
         print("SIMULATION LIAISON FAISCEAU HERTZIEN (FH)".center(80))
         print("=" * 80)
-        print(tabulate(df, headers='keys', tablefmt='fancy_grid', showindex=False))
+        print(tabulate(table, headers='keys', tablefmt='fancy_grid', showindex=False))
         print("=" * 80)
         print("\nTapez le numéro de la condition pour changer ou Ctrl+C pour quitter:")
         for i, cond in enumerate(self.simulateur.get_conditions_disponibles()):
@@ -59,24 +65,24 @@ class AffichageCLI:
         print("Démarrage de la simulation CLI...")
         print("Appuyez sur Ctrl+C pour quitter.\n")
 
+        # Évaluateur construit avant la première mesure, pas pendant
+        self.modele.preparer_rapide()
+
         try:
             while self.running:
                 # Générer de nouvelles données
-                new_data = self.simulateur.generer_donnees(condition_actuelle)
-
-                # Préparer les données pour IA
-                X = new_data[["rssi", "snr", "ber", "disponibilite"]]
+                new_data = self.simulateur.generer_mesure(condition_actuelle)
 
                 # Prédire l'état via IA
-                etat = self.modele.predire(X)[0]
-                new_data["etat"] = etat
+                new_data["etat"] = self.modele.predire_rapide(
+                    new_data["rssi"], new_data["snr"], new_data["ber"], new_data["disponibilite"]
+                )
 
-                # Ajouter à l'historique et limiter à 20 derniers points pour tableau
-                self.data_history = pd.concat([self.data_history, new_data], ignore_index=True)
-                display_data = self.data_history.tail(20)
+                # Ajouter à l'historique (20 derniers points pour le tableau)
+                self.data_history.ajouter(**new_data)
 
                 # Afficher
-                self.afficher_parametres(display_data)
+                self.afficher_parametres(self.data_history.fenetre())
 
                 # Gestion entrée utilisateur avec timeout 1s
                 import select
@@ -3,7 +3,8 @@
 
 import sys
 import time
-import pandas as pd
+from typing import Dict
+import numpy as np
 from tabulate import tabulate  # pip install tabulate
 import select
 import os
@@ -12,6 +13,14 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
+from src.utils.tampon_circulaire import TamponCirculaire
+
+# Colonnes d'un échantillon simulate_fh()
+COLONNES_HISTORIQUE = {
+    "Condition": object, "Distance_km": float, "Frequency_GHz": int, "Bandwidth_MHz": int,
+    "Modulation": object, "TxPower_dBm": float, "Gain_dBi": float, "RSSI_dBm": float,
+    "SNR_dB": float, "BER": float, "Availability_percent": float, "Status": object
+}
 
 
 class CLISimulateurFH:
@@ -22,10 +31,11 @@ class CLISimulateurFH:
     def __init__(self, simulateur: SimulateurFaisceauHertzien):
         self.simulateur = simulateur
         self.running = False
-        self.data_history = pd.DataFrame()
+        # Historique à capacité fixe : seuls les 20 derniers points sont affichés
+        self.data_history = TamponCirculaire(20, COLONNES_HISTORIQUE)
 
     @staticmethod
-    def afficher_parametres(df: pd.DataFrame):
+    def afficher_parametres(df: Dict[str, np.ndarray]):
         """
         Affiche les derniers points simulés sous forme de tableau
         """
@@ -38,8 +48,8 @@ class CLISimulateurFH:
             else:
                 return f"\033[91m{etat}\033[0m"
 
-        display_df = df.copy()
-        display_df["Etat"] = display_df["Status"].apply(color_etat)
+        display_df = dict(df)
+        display_df["Etat"] = [color_etat(status) for status in df["Status"]]
 
         # Effacer l'écran et afficher le tableau
         print("\033[H\033[J", end="")
@@ -80,12 +90,11 @@ class CLISimulateurFH:
                 sample = self.simulateur.simulate_fh()
                 sample["Condition"] = condition_actuelle
 
-                # Ajouter à l'historique et garder les 20 derniers points
-                self.data_history = pd.concat([self.data_history, pd.DataFrame([sample])], ignore_index=True)
-                display_data = self.data_history.tail(20)
+                # Ajouter à l'historique (20 derniers points pour le tableau)
+                self.data_history.ajouter(**sample)
 
                 # Afficher le tableau
-                self.afficher_parametres(display_data)
+                self.afficher_parametres(self.data_history.fenetre())
 
                 # Gestion changement de condition
                 i, o, e = select.select([sys.stdin], [], [], 1)
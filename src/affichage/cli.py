@@ -7,43 +7,56 @@ Module contenant la classe AffichageCLI pour l'interface en ligne de commande.
 
 import time
 import sys
-import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
 from src.ia.modele import ModeleIA
+from src.utils.detection_anomalies import SurveillanceMesures
+from src.utils.stockage import StockageMesures
+from src.utils.tampon_circulaire import TamponCirculaire
 
 class AffichageCLI:
     """
     Classe pour l'affichage en ligne de commande des résultats de la simulation.
     """
     
-    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA):
+    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA,
+                 stockage: Optional[StockageMesures] = None, liaison: str = "FH-0"):
         """
         Initialise l'affichage CLI.
         
         Args:
             simulateur: Une instance de SimulateurFaisceauHertzien
             modele: Une instance de ModeleIA
+            stockage: L'historique persistant où enregistrer les mesures (aucun si None)
+            liaison: L'identifiant de la liaison dans l'historique
         """
         self.simulateur = simulateur
         self.modele = modele
+        self.stockage = stockage
+        self.liaison = liaison
         self.running = False
-        self.data_history = pd.DataFrame()
+        # Détection d'anomalies en flux (médiane et MAD glissantes)
+        self.surveillance = SurveillanceMesures()
+        # Historique des 100 derniers points, mémoire constante
+        self.data_history = TamponCirculaire(100, {
+            "timestamp": float, "rssi": float, "snr": float, "ber": float,
+            "disponibilite": float, "condition": object, "etat": object, "anomalies": object
+        })
     
-    def afficher_parametres(self, data: pd.DataFrame) -> None:
+    def afficher_parametres(self, data: Dict[str, Any]) -> None:
         """
         Affiche les paramètres de la liaison.
         
         Args:
-            data: Les données à afficher
+            data: La dernière mesure (rssi, snr, ber, disponibilite, condition, etat, anomalies)
         """
         # Extraire les valeurs
-        rssi = data["rssi"].values[0]
-        snr = data["snr"].values[0]
-        ber = data["ber"].values[0]
-        disponibilite = data["disponibilite"].values[0]
-        condition = data["condition"].values[0]
-        etat = data["etat"].values[0]
+        rssi = data["rssi"]
+        snr = data["snr"]
+        ber = data["ber"]
+        disponibilite = data["disponibilite"]
+        condition = data["condition"]
+        etat = data["etat"]
         
         # Déterminer les couleurs pour l'état
         if etat == "OK":
@@ -66,6 +79,8 @@ class AffichageCLI:
         print(f"Disponibilité: {disponibilite:.2f}%")
         print("-" * 50)
         print(f"ÉTAT: {etat_color}{etat}{reset_color}")
+        if data.get("anomalies"):
+            print(f"\033[91mANOMALIE: {', '.join(data['anomalies']).upper()}{reset_color}")
         print("=" * 50)
         print("\nAppuyez sur Ctrl+C pour quitter ou entrez une nouvelle condition:")
         for i, cond in enumerate(self.simulateur.get_conditions_disponibles()):
@@ -84,22 +99,28 @@ class AffichageCLI:
         print("Démarrage de la simulation en mode CLI...")
         print("Appuyez sur Ctrl+C pour quitter.")
         
+        # Évaluateur construit avant la première mesure, pas pendant
+        self.modele.preparer_rapide()
+        
         try:
             while self.running:
                 # Générer de nouvelles données
-                new_data = self.simulateur.generer_donnees(condition_actuelle)
+                new_data = self.simulateur.generer_mesure(condition_actuelle)
                 
                 # Prédire l'état avec le modèle IA
-                X = new_data[["rssi", "snr", "ber", "disponibilite"]]
-                etat = self.modele.predire(X)[0]
-                new_data["etat"] = etat
+                new_data["etat"] = self.modele.predire_rapide(
+                    new_data["rssi"], new_data["snr"], new_data["ber"], new_data["disponibilite"]
+                )
+                
+                new_data["timestamp"] = time.time()
+                if self.stockage is not None:
+                    self.stockage.ajouter(self.liaison, **new_data)
                 
-                # Ajouter à l'historique
-                self.data_history = pd.concat([self.data_history, new_data], ignore_index=True)
+                # Détecter les anomalies par rapport aux mesures précédentes
+                new_data["anomalies"] = self.surveillance.evaluer(new_data)
                 
-                # Limiter l'historique aux 100 derniers points
-                if len(self.data_history) > 100:
-                    self.data_history = self.data_history.tail(100)
+                # Ajouter à l'historique (le plus ancien point est écrasé)
+                self.data_history.ajouter(**new_data)
                 
                 # Afficher les paramètres
                 self.afficher_parametres(new_data)
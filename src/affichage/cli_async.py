@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant la classe MoniteurAsync, version asyncio de la supervision en ligne de commande.
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from src.simulateur.simulateur import SimulateurFaisceauHertzien
+from src.ia.modele import ModeleIA
+from src.affichage.cli import AffichageCLI
+from src.utils.detection_anomalies import SurveillanceMesures
+from src.utils.stockage import StockageMesures
+from src.utils.tampon_circulaire import TamponCirculaire
+
+
+async def cadence(periode: float) -> AsyncIterator[int]:
+    """
+    Produit un tick toutes les `periode` secondes, sans dérive.
+
+    Les échéances sont calculées depuis le départ sur l'horloge de la boucle :
+    le temps passé entre deux ticks ne décale pas les suivants. Un tick
+    légèrement en retard part aussitôt ; seules les périodes entières
+    manquées (boucle bloquée plus d'une période) sont sautées, pas rattrapées.
+
+    Args:
+        periode: L'intervalle entre deux ticks, en secondes
+
+    Returns:
+        Un itérateur asynchrone du numéro de tick
+    """
+    loop = asyncio.get_running_loop()
+    depart = loop.time()
+    tick = 0
+    while True:
+        yield tick
+        tick += 1
+        retard = loop.time() - (depart + tick * periode)
+        if retard > 0:
+            tick += int(retard // periode)
+        await asyncio.sleep(depart + tick * periode - loop.time())
+
+
+def deposer(file: asyncio.Queue, element: Any) -> None:
+    """
+    Dépose un élément dans une file bornée sans attendre.
+
+    Si la file est pleine, l'élément le plus ancien est retiré : un
+    consommateur lent voit des données récentes, jamais un arriéré.
+
+    Args:
+        file: La file de destination
+        element: L'élément à déposer
+    """
+    if file.full():
+        file.get_nowait()
+    file.put_nowait(element)
+
+
+class MoniteurAsync:
+    """
+    Supervision d'une liaison en tâches asyncio : acquisition, inférence,
+    rendu et saisie utilisateur tournent séparément, reliées par des files
+    bornées. Peut être lancé seul (asyncio.run) ou intégré à un service existant.
+    """
+
+    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA,
+                 condition_initiale: str, periode: float = 1.0, taille_file: int = 8,
+                 rendu: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 stockage: Optional[StockageMesures] = None, liaison: str = "FH-0"):
+        """
+        Initialise le moniteur.
+
+        Args:
+            simulateur: Une instance de SimulateurFaisceauHertzien
+            modele: Une instance de ModeleIA
+            condition_initiale: La condition initiale de simulation
+            periode: L'intervalle entre deux mesures, en secondes
+            taille_file: La capacité de chaque file entre deux tâches
+            rendu: La fonction d'affichage d'une mesure (affichage CLI par défaut)
+            stockage: L'historique persistant où enregistrer les mesures (aucun si None)
+            liaison: L'identifiant de la liaison dans l'historique
+        """
+        self.simulateur = simulateur
+        self.modele = modele
+        self.condition = condition_initiale
+        self.periode = periode
+        self.taille_file = taille_file
+        self.stockage = stockage
+        self.liaison = liaison
+        self.rendu = rendu or AffichageCLI(simulateur, modele).afficher_parametres
+        self.running = False
+        # Détection d'anomalies en flux (médiane et MAD glissantes)
+        self.surveillance = SurveillanceMesures()
+        # Historique des 100 derniers points, mémoire constante
+        self.data_history = TamponCirculaire(100, {
+            "timestamp": float, "rssi": float, "snr": float, "ber": float,
+            "disponibilite": float, "condition": object, "etat": object, "anomalies": object
+        })
+        self._taches = []
+        self._arret = False
+
+    async def acquerir(self, sortie: asyncio.Queue) -> None:
+        """Tâche d'acquisition : une mesure par tick."""
+        async for _ in cadence(self.periode):
+            mesure = self.simulateur.generer_mesure(self.condition)
+            mesure["timestamp"] = time.time()
+            deposer(sortie, mesure)
+
+    async def inferer(self, entree: asyncio.Queue, sortie: asyncio.Queue) -> None:
+        """Tâche d'inférence : classe chaque mesure, cherche les anomalies et l'ajoute à l'historique."""
+        while True:
+            mesure = await entree.get()
+            mesure["etat"] = self.modele.predire_rapide(
+                mesure["rssi"], mesure["snr"], mesure["ber"], mesure["disponibilite"]
+            )
+            if self.stockage is not None:
+                # Écritures groupées par lots : le coût par mesure reste négligeable
+                self.stockage.ajouter(self.liaison, **mesure)
+            mesure["anomalies"] = self.surveillance.evaluer(mesure)
+            self.data_history.ajouter(**mesure)
+            deposer(sortie, mesure)
+
+    async def afficher(self, entree: asyncio.Queue) -> None:
+        """Tâche de rendu : n'affiche que la mesure la plus récente disponible."""
+        while True:
+            mesure = await entree.get()
+            while not entree.empty():
+                mesure = entree.get_nowait()
+            self.rendu(mesure)
+
+    async def lire_entree(self) -> None:
+        """Tâche de saisie : change de condition quand l'utilisateur tape son numéro."""
+        loop = asyncio.get_running_loop()
+        lignes = asyncio.Queue(maxsize=self.taille_file)
+        try:
+            loop.add_reader(sys.stdin, lambda: deposer(lignes, sys.stdin.readline()))
+            lecteur = True
+        except (NotImplementedError, ValueError):
+            # Pas de add_reader (Windows, stdin non sélectionnable) : lecture dans un thread
+            lecteur = False
+        try:
+            while True:
+                if lecteur:
+                    ligne = await lignes.get()
+                else:
+                    ligne = await loop.run_in_executor(None, sys.stdin.readline)
+                if not ligne:
+                    return
+                try:
+                    index = int(ligne.strip()) - 1
+                except ValueError:
+                    continue
+                conditions = self.simulateur.get_conditions_disponibles()
+                if 0 <= index < len(conditions):
+                    self.condition = conditions[index]
+        finally:
+            if lecteur:
+                loop.remove_reader(sys.stdin)
+
+    async def executer(self, entree_clavier: bool = True) -> None:
+        """
+        Lance toutes les tâches et attend leur fin (arreter() ou annulation).
+
+        Args:
+            entree_clavier: False pour ne pas lire stdin (moniteur intégré à un service)
+        """
+        mesures = asyncio.Queue(maxsize=self.taille_file)
+        etats = asyncio.Queue(maxsize=self.taille_file)
+        coroutines = [self.acquerir(mesures), self.inferer(mesures, etats), self.afficher(etats)]
+        if entree_clavier:
+            coroutines.append(self.lire_entree())
+
+        # Évaluateur construit avant la première mesure, sans bloquer la boucle
+        await asyncio.get_running_loop().run_in_executor(None, self.modele.preparer_rapide)
+
+        self.running = True
+        self._arret = False
+        self._taches = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            await asyncio.gather(*self._taches)
+        except asyncio.CancelledError:
+            # Arrêt demandé par arreter() : fin normale ; sinon l'annulation vient de l'appelant
+            if not self._arret:
+                raise
+        finally:
+            for tache in self._taches:
+                tache.cancel()
+            await asyncio.gather(*self._taches, return_exceptions=True)
+            self._taches = []
+            self.running = False
+
+    def arreter(self) -> None:
+        """Annule toutes les tâches du moniteur."""
+        self._arret = True
+        for tache in self._taches:
+            tache.cancel()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Conversion des figures matplotlib en images PNG, pour les mettre en cache côté Streamlit.
+"""
+
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+
+
+def figure_en_png(fig, dpi: int = 200) -> bytes:
+    """
+    Rend une figure en PNG puis la ferme.
+
+    Une image en cache (st.cache_data) s'affiche avec st.image sans
+    refaire le rendu matplotlib à chaque rerun ; la figure fermée ne
+    reste pas non plus dans la mémoire de pyplot.
+
+    Args:
+        fig: La figure matplotlib
+        dpi: La résolution (celle de st.pyplot par défaut)
+
+    Returns:
+        Le contenu de l'image PNG
+    """
+    tampon = BytesIO()
+    fig.savefig(tampon, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return tampon.getvalue()
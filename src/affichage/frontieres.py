@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frontières de décision d'un classifieur, tracées dans le plan des deux premières composantes principales.
+
+Le coût ne dépend pas de la taille du dataset : l'ACP et le modèle 2D sont
+ajustés sur un sous-échantillon stratifié, la grille a une résolution fixe
+bornée par des percentiles (une queue de distribution lourde ne l'étire
+pas), et seul un sous-échantillon des points est dessiné.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+from sklearn.decomposition import PCA
+
+from src.affichage.figures import figure_en_png
+from src.ia.courbes_apprentissage import sans_calibration
+
+
+def sous_echantillon_stratifie(y, n: int, random_state: int = 42) -> np.ndarray:
+    """
+    Tire n indices en respectant la proportion de chaque classe (au moins un par classe).
+
+    Args:
+        y: Les étiquettes
+        n: Le nombre d'indices voulus
+        random_state: La graine du tirage
+
+    Returns:
+        Les indices retenus, triés (tous si len(y) <= n)
+    """
+    y = np.asarray(y)
+    if len(y) <= n:
+        return np.arange(len(y))
+    rng = np.random.default_rng(random_state)
+    classes, codes, effectifs = np.unique(y, return_inverse=True, return_counts=True)
+    quotas = np.maximum(np.round(effectifs * n / len(y)).astype(int), 1)
+    indices = [rng.choice(np.flatnonzero(codes == k), size=min(quota, effectif), replace=False)
+               for k, (quota, effectif) in enumerate(zip(quotas, effectifs))]
+    return np.sort(np.concatenate(indices))
+
+
+def calculer_frontieres(estimateur, X, y, resolution: int = 200, max_ajustement: int = 5000,
+                        max_points: int = 1500, percentiles: Tuple[float, float] = (0.5, 99.5),
+                        random_state: int = 42) -> Dict[str, Any]:
+    """
+    Projette les données sur deux composantes principales et y évalue le classifieur sur une grille.
+
+    Args:
+        estimateur: Le classifieur sklearn (cloné, jamais modifié)
+        X: Les caractéristiques (normalisées)
+        y: Les étiquettes
+        resolution: Le nombre de points de la grille par axe
+        max_ajustement: Le nombre maximal de lignes pour ajuster l'ACP et le modèle 2D
+        max_points: Le nombre maximal de points dessinés
+        percentiles: Les percentiles des projections qui bornent la grille
+        random_state: La graine des sous-échantillons
+
+    Returns:
+        Un dict : xx, yy et zones (classe prédite, en code, sur la grille), points
+        (projections dessinées), codes (leur classe) et classes (étiquettes des codes)
+    """
+    X = np.asarray(X, dtype=float)
+    classes, codes = np.unique(np.asarray(y), return_inverse=True)
+
+    ajustement = sous_echantillon_stratifie(codes, max_ajustement, random_state)
+    pca = PCA(n_components=2, random_state=random_state).fit(X[ajustement])
+    X_2d = pca.transform(X[ajustement])
+    # Seul predict() sert : inutile de calibrer les probabilités (5 ajustements de plus pour SVC)
+    modele = sans_calibration(estimateur)
+    modele.fit(X_2d, codes[ajustement])
+
+    # Grille de taille fixe, bornée par percentiles plus une marge de 5 %
+    bas = np.percentile(X_2d, percentiles[0], axis=0)
+    haut = np.percentile(X_2d, percentiles[1], axis=0)
+    marge = 0.05 * np.maximum(haut - bas, 1e-9)
+    xx, yy = np.meshgrid(np.linspace(bas[0] - marge[0], haut[0] + marge[0], resolution),
+                         np.linspace(bas[1] - marge[1], haut[1] + marge[1], resolution))
+    zones = modele.predict(np.c_[xx.ravel(), yy.ravel()]).reshape(xx.shape)
+
+    dessines = sous_echantillon_stratifie(codes[ajustement], max_points, random_state)
+    return {
+        "xx": xx,
+        "yy": yy,
+        "zones": zones,
+        "points": X_2d[dessines],
+        "codes": codes[ajustement][dessines],
+        "classes": classes,
+    }
+
+
+def figure_frontieres(frontieres: Dict[str, Any], titre: str, cmap: Optional[str] = "Pastel1",
+                      couleurs: Optional[Sequence[str]] = None, figsize=(10, 2)) -> bytes:
+    """
+    Dessine les frontières calculées par calculer_frontieres().
+
+    Args:
+        frontieres: Le résultat de calculer_frontieres()
+        titre: Le titre du graphique
+        cmap: La palette des zones (ignorée si couleurs est donné)
+        couleurs: Des couleurs de zones explicites (ex. ["#d3d3d3"])
+        figsize: La taille de la figure
+
+    Returns:
+        L'image PNG
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    if couleurs is not None:
+        ax.contourf(frontieres["xx"], frontieres["yy"], frontieres["zones"], alpha=0.3, colors=list(couleurs))
+    else:
+        ax.contourf(frontieres["xx"], frontieres["yy"], frontieres["zones"], alpha=0.3, cmap=cmap)
+    points = frontieres["points"]
+    ax.scatter(points[:, 0], points[:, 1], c=frontieres["codes"], cmap="Set1", edgecolor='k')
+    ax.set_xlim(frontieres["xx"][0, 0], frontieres["xx"][0, -1])
+    ax.set_ylim(frontieres["yy"][0, 0], frontieres["yy"][-1, 0])
+    ax.set_title(titre)
+    return figure_en_png(fig)
@@ -6,34 +6,59 @@ Module contenant la classe AffichageGraphique pour l'interface graphique.
 """
 
 import time
+import queue
 import threading
 import tkinter as tk
 from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
 from src.ia.modele import ModeleIA
+from src.affichage.rendu_blit import RenduBlit
+from src.utils.decimation import decimer
+from src.utils.detection_anomalies import SurveillanceMesures
+from src.utils.stockage import StockageMesures
+from src.utils.tampon_circulaire import TamponCirculaire
 
 class AffichageGraphique:
     """
     Classe pour l'affichage graphique des résultats de la simulation.
     """
     
-    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA):
+    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA,
+                 intervalle: float = 0.5, fps: int = 20,
+                 stockage: Optional[StockageMesures] = None, liaison: str = "FH-0"):
         """
         Initialise l'affichage graphique.
         
         Args:
             simulateur: Une instance de SimulateurFaisceauHertzien
             modele: Une instance de ModeleIA
+            intervalle: L'intervalle entre deux mesures simulées, en secondes
+            fps: Le nombre maximal de rafraîchissements de l'interface par seconde
+            stockage: L'historique persistant où enregistrer les mesures (aucun si None)
+            liaison: L'identifiant de la liaison dans l'historique
         """
         self.simulateur = simulateur
         self.modele = modele
+        self.stockage = stockage
+        self.liaison = liaison
+        self.intervalle = intervalle
+        self.fps = fps
         self.running = False
-        self.data_history = pd.DataFrame()
+        # Mesures produites par le thread de simulation, consommées par la boucle Tk
+        self.file_mesures = queue.SimpleQueue()
+        self.condition = None
+        self.arret_simulation = threading.Event()
+        # Détection d'anomalies en flux (médiane et MAD glissantes), dans le thread de simulation
+        self.surveillance = SurveillanceMesures()
+        # Historique des 100 derniers points, mémoire constante
+        self.data_history = TamponCirculaire(100, {
+            "timestamp": float, "rssi": float, "snr": float, "ber": float,
+            "disponibilite": float, "condition": object, "etat": object, "anomalies": object
+        })
         self.simulation_thread = None
     
     def creer_interface(self) -> None:
@@ -44,6 +69,9 @@ class AffichageGraphique:
         
         # Variables
         self.condition_actuelle = tk.StringVar(value="normal_urbain")
+        # Copie lue par le thread de simulation (les variables Tk ne sont sûres que dans la boucle Tk)
+        self.condition = self.condition_actuelle.get()
+        self.condition_actuelle.trace_add("write", lambda *_: setattr(self, "condition", self.condition_actuelle.get()))
         self.etat_actuel = tk.StringVar(value="En attente...")
         
         # Frame principale
@@ -105,6 +133,12 @@ class AffichageGraphique:
         self.axes[1, 1].set_xlabel("Temps (s)")
         self.axes[1, 1].set_ylabel("Disponibilité (%)")
         self.disponibilite_line, = self.axes[1, 1].plot([], [], 'y-')
+        
+        # Rendu incrémental : seules les courbes sont redessinées à chaque image
+        self.rendu = RenduBlit(self.canvas, [self.rssi_line, self.snr_line, self.ber_line, self.disponibilite_line])
+        
+        # Consommation des mesures dans la boucle Tk
+        self.root.after(0, self.consommer_mesures)
     
     def demarrer_simulation(self) -> None:
         """Démarre la simulation."""
@@ -112,34 +146,79 @@ class AffichageGraphique:
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
-        # Réinitialiser l'historique des données
-        self.data_history = pd.DataFrame()
+        # Réinitialiser l'historique des données et les statistiques de détection
+        self.data_history.vider()
+        self.surveillance = SurveillanceMesures()
         
-        # Démarrer la simulation dans un thread séparé
-        self.simulation_thread = threading.Thread(target=self.executer_simulation)
+        # Démarrer la simulation dans un thread séparé (un événement d'arrêt par lancement)
+        self.arret_simulation = threading.Event()
+        self.simulation_thread = threading.Thread(target=self.executer_simulation,
+                                                  args=(self.arret_simulation,))
         self.simulation_thread.daemon = True
         self.simulation_thread.start()
     
     def arreter_simulation(self) -> None:
         """Arrête la simulation."""
         self.running = False
+        self.arret_simulation.set()
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
     
-    def executer_simulation(self) -> None:
-        """Exécute la simulation en continu."""
-        while self.running:
+    def executer_simulation(self, arret: threading.Event) -> None:
+        """
+        Exécute la simulation en continu (thread de simulation, sans appel Tk).
+        
+        Args:
+            arret: L'événement qui termine ce thread
+        """
+        # Évaluateur construit avant la première mesure, hors de la boucle Tk
+        self.modele.preparer_rapide()
+        while not arret.is_set():
             # Générer de nouvelles données
-            condition = self.condition_actuelle.get()
-            new_data = self.simulateur.generer_donnees(condition)
+            new_data = self.simulateur.generer_mesure(self.condition)
             
             # Prédire l'état avec le modèle IA
-            X = new_data[["rssi", "snr", "ber", "disponibilite"]]
-            etat = self.modele.predire(X)[0]
-            new_data["etat"] = etat
+            new_data["etat"] = self.modele.predire_rapide(
+                new_data["rssi"], new_data["snr"], new_data["ber"], new_data["disponibilite"]
+            )
+            new_data["timestamp"] = time.time()
+            if self.stockage is not None:
+                self.stockage.ajouter(self.liaison, **new_data)
+            
+            # Détecter les anomalies par rapport aux mesures précédentes
+            new_data["anomalies"] = self.surveillance.evaluer(new_data)
+            
+            # Transmettre à la boucle Tk
+            self.file_mesures.put(new_data)
+            
+            # Attendre un peu (interrompu dès l'arrêt)
+            arret.wait(self.intervalle)
+    
+    def consommer_mesures(self) -> None:
+        """
+        Vide la file des mesures et rafraîchit l'interface une seule fois (boucle Tk).
+        
+        Une rafale de mesures arrivées entre deux images est ajoutée à
+        l'historique en entier, mais ne coûte qu'un rafraîchissement.
+        """
+        derniere = None
+        try:
+            while True:
+                derniere = self.file_mesures.get_nowait()
+                # Ajouter à l'historique (le plus ancien point est écrasé)
+                self.data_history.ajouter(**derniere)
+        except queue.Empty:
+            pass
+        
+        if derniere is not None:
+            etat = derniere["etat"]
             
             # Mettre à jour l'affichage de l'état
-            self.etat_actuel.set(f"État: {etat}")
+            anomalies = derniere["anomalies"]
+            if anomalies:
+                self.etat_actuel.set(f"État: {etat} - Anomalie: {', '.join(anomalies).upper()}")
+            else:
+                self.etat_actuel.set(f"État: {etat}")
             
             # Changer la couleur de l'étiquette en fonction de l'état
             if etat == "OK":
@@ -149,45 +228,26 @@ class AffichageGraphique:
             else:  # KO
                 self.etat_label.config(foreground="red")
             
-            # Ajouter à l'historique
-            if self.data_history.empty:
-                self.data_history = new_data
-            else:
-                self.data_history = pd.concat([self.data_history, new_data], ignore_index=True)
-            
-            # Limiter l'historique aux 100 derniers points
-            if len(self.data_history) > 100:
-                self.data_history = self.data_history.tail(100)
-            
             # Mettre à jour les graphiques
             self.mettre_a_jour_graphiques()
-            
-            # Attendre un peu
-            time.sleep(0.5)
+        
+        self.root.after(max(1, int(1000 / self.fps)), self.consommer_mesures)
     
     def mettre_a_jour_graphiques(self) -> None:
         """Met à jour les graphiques avec les données actuelles."""
         if len(self.data_history) == 0:
             return
             
+        # Vues sur le tampon, sans copie
+        fenetre = self.data_history.fenetre()
+        
         # Calculer le temps relatif
-        start_time = self.data_history["timestamp"].min()
-        relative_time = self.data_history["timestamp"] - start_time
-        
-        # Mettre à jour les données des graphiques
-        self.rssi_line.set_data(relative_time, self.data_history["rssi"])
-        self.snr_line.set_data(relative_time, self.data_history["snr"])
-        self.ber_line.set_data(relative_time, self.data_history["ber"])
-        self.disponibilite_line.set_data(relative_time, self.data_history["disponibilite"])
-        
-        # Ajuster les limites des axes
-        for ax, param in zip([self.axes[0, 0], self.axes[0, 1], self.axes[1, 0], self.axes[1, 1]], 
-                            ["rssi", "snr", "ber", "disponibilite"]):
-            ax.relim()
-            ax.autoscale_view()
-        
-        # Redessiner le canvas
-        self.canvas.draw_idle()
+        relative_time = fenetre["timestamp"] - fenetre["timestamp"][0]
+        
+        # Mettre à jour les courbes (décimées ; axes élargis seulement si les données en sortent)
+        self.rendu.mettre_a_jour([
+            decimer(relative_time, fenetre[param]) for param in ["rssi", "snr", "ber", "disponibilite"]
+        ])
     
     def demarrer(self, condition_initiale: str) -> None:
         """
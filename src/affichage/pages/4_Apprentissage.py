@@ -1,5 +1,7 @@
 # src/affichage/pages/3_Apprentissage.py
 import os
+import sys
+import time
 import graphviz;
 import streamlit as st
 import pandas as pd
@@ -7,18 +9,22 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
-from io import BytesIO
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report, f1_score
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import learning_curve
 from sklearn.tree import export_graphviz
 from sklearn.metrics import confusion_matrix
-from scipy.interpolate import make_interp_spline, PchipInterpolator
+
+# Ajouter la racine du projet au PYTHONPATH pour importer src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.dataset_format import lire_dataset
+from src.utils.etats import ETATS
+from src.ia.algorithmes import ALGORITHMES, creer_modele
+from src.ia.artefacts import sauvegarder_artefact
+from src.ia.comparaison import algorithmes_par_defaut, comparer_algorithmes
+from src.ia.courbes_apprentissage import calculer_courbe, taille_suffisante
+from src.affichage.frontieres import calculer_frontieres, figure_frontieres
+from src.ia.preparation import empreinte, preparer_donnees, vers_csv
+from src.affichage.figures import figure_en_png
 
 # --------------------------------------------------
 # Page config & style (mode clair, thème FH-Check)
@@ -146,6 +152,254 @@ st.markdown(
     '<div class="title-card">Apprentissage Automatique<div class="title-sub">Entraînement, évaluation et sauvegarde des modèles</div></div>',
     unsafe_allow_html=True)
 
+# --------------------------------------------------
+# Étapes coûteuses mises en cache, par empreinte du contenu du dataset
+# (un rerun déclenché par un widget ne relit ni ne réentraîne rien)
+# --------------------------------------------------
+def empreinte_fichier(fichier) -> str:
+    """Empreinte du fichier importé, calculée une seule fois par import."""
+    cle = getattr(fichier, "file_id", None)
+    empreintes = st.session_state.setdefault("empreintes_fichiers", {})
+    if cle in empreintes:
+        return empreintes[cle]
+    valeur = empreinte(fichier.getbuffer())
+    if cle is not None:
+        empreintes[cle] = valeur
+    return valeur
+
+
+@st.cache_resource(show_spinner="Lecture du dataset...", max_entries=4)
+def charger_dataset(empreinte_dataset: str, _fichier) -> pd.DataFrame:
+    """Lit le dataset importé (objet partagé entre les reruns : à ne pas modifier)."""
+    _fichier.seek(0)
+    return lire_dataset(_fichier)
+
+
+@st.cache_resource(show_spinner="Prétraitement...", max_entries=4)
+def pretraiter(empreinte_dataset: str, _df: pd.DataFrame) -> dict:
+    """Nettoyage, encodage, séparation et normalisation (objets partagés : à ne pas modifier)."""
+    return preparer_donnees(_df)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def figure_distribution_etats(empreinte_dataset: str, _df: pd.DataFrame) -> bytes:
+    counts = _df["Etat"].value_counts().reindex(ETATS).fillna(0)
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.barplot(
+        x=counts.index,
+        y=counts.values,
+        palette=["#442288", "#6ca2ea", "#b5d33d"],
+        edgecolor="white",
+        ax=ax
+    )
+    for i, v in enumerate(counts.values):
+        ax.text(i, v + max(counts.values)*0.02, f"{int(v)}", ha='center', color='white', fontsize=15, fontweight='bold')
+    ax.set_ylabel("Nombre", fontsize=12)
+    ax.set_xlabel("État", fontsize=12)
+    ax.set_title("Distribution des états", fontsize=14, fontweight='semibold')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(axis='y', color="#eeeeee", linestyle='-', linewidth=1.5, alpha=1)
+    ax.set_facecolor("#f9f9f9")
+    plt.tight_layout()
+    return figure_en_png(fig)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def figure_correlation(empreinte_dataset: str, _df: pd.DataFrame):
+    """Carte thermique des corrélations (None sans colonne numérique)."""
+    numeric_cols = _df.select_dtypes(include=[np.number]).columns.tolist()
+    if not numeric_cols:
+        return None
+
+    corr = _df[numeric_cols].corr()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.heatmap(
+        corr, annot=False,  # annot=True avec petits nombres si nécessaire
+        cmap="plasma",
+        linewidths=2,
+        linecolor='white',
+        cbar_kws={'shrink': 0.7},
+        ax=ax
+    )
+    ax.set_title("Matrice de corrélation", fontsize=14, fontweight='semibold')
+    ax.set_facecolor("#f9f9f9")
+    plt.tight_layout()
+    return figure_en_png(fig)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def figures_separation(empreinte_dataset: str, _donnees: dict):
+    """Distribution des classes des jeux d'entraînement et de test (même échelle)."""
+    train_counts = _donnees["y_train"].value_counts().reindex(ETATS).fillna(0)
+    test_counts = _donnees["y_test"].value_counts().reindex(ETATS).fillna(0)
+    max_count = max(train_counts.max(), test_counts.max())
+    hist_palette = ["#6a0dad", "#d6b3f2", "#c99ff0"]
+
+    images = []
+    for counts, titre in [(train_counts, "Distribution du jeu d'entraînement"),
+                          (test_counts, "Distribution du jeu de test")]:
+        fig, ax = plt.subplots(figsize=(6, 3.5))
+        sns.barplot(
+            x=counts.index, y=counts.values,
+            palette=hist_palette, edgecolor="#fff", ax=ax
+        )
+        for i, v in enumerate(counts.values):
+            ax.text(i, v + max_count*0.025, int(v), color="#222", ha='center', fontsize=13, fontweight='bold')
+        ax.set_ylim(0, max_count * 1.1)
+        ax.set_ylabel("Nombre", fontsize=12, color="#333")
+        ax.set_xlabel("Classe", fontsize=12, color="#333")
+        ax.set_title(titre, fontsize=14, fontweight='semibold', color="#222")
+        ax.spines["top"].set_visible(False)
+        ax.spines["right"].set_visible(False)
+        ax.spines["left"].set_color("#e0e0e0")
+        ax.spines["bottom"].set_color("#e0e0e0")
+        ax.grid(axis='y', color="#ededed", linestyle='--', linewidth=1, alpha=0.9)
+        ax.set_facecolor("#fff")
+        fig.patch.set_facecolor("#fff")
+        plt.tight_layout()
+        images.append(figure_en_png(fig))
+    return tuple(images)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def csv_separation(empreinte_dataset: str, _donnees: dict):
+    """Contenu des fichiers donnees_train.csv et donnees_test.csv."""
+    return (vers_csv(_donnees["X_train"], _donnees["y_train"]),
+            vers_csv(_donnees["X_test"], _donnees["y_test"]))
+
+
+@st.cache_resource(show_spinner="Entraînement...", max_entries=16)
+def entrainer_modele(empreinte_dataset: str, algo: str, params: dict, _donnees: dict) -> dict:
+    """Entraîne et évalue un modèle (objet partagé : cloner avant de le réentraîner)."""
+    model = creer_modele(algo, params)
+    model.fit(_donnees["X_train_scaled"], _donnees["y_train"])
+    y_pred = model.predict(_donnees["X_test_scaled"])
+    y_test = _donnees["y_test"]
+    return {
+        "model": model,
+        "y_pred": y_pred,
+        "acc": accuracy_score(y_test, y_pred),
+        "f1_macro": f1_score(y_test, y_pred, average='macro'),
+        "report": pd.DataFrame(classification_report(y_test, y_pred, output_dict=True)).transpose(),
+        "cm": confusion_matrix(y_test, y_pred, labels=ETATS),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def figure_confusion(cm: np.ndarray) -> bytes:
+    plt.rcParams.update({'font.size': 12, 'font.family': 'DejaVu Sans'})
+
+    fig, ax = plt.subplots(figsize=(4, 3))
+
+    # Créer une palette bleu clair
+    light_blue_cmap = sns.light_palette("blue", as_cmap=True)
+
+    sns.heatmap(
+        cm,
+        annot=True,
+        fmt="d",
+        cmap=light_blue_cmap,
+        linewidths=0,
+        square=False,
+        annot_kws={"size": 12, "weight": "bold", "color": "black", "va": "center", "ha": "center"},
+        cbar=True,
+        ax=ax,
+        cbar_kws={"shrink": 0.8, "aspect": 15, "pad": 0.02, "orientation": "vertical"}
+    )
+    cbar = ax.collections[0].colorbar
+    cbar.ax.tick_params(labelsize=10)
+
+    ax.set_xlabel("Étiquette prédite", fontsize=14, labelpad=10)
+    ax.set_ylabel("Étiquette réelle", fontsize=14, labelpad=10)
+    ax.set_title("Matrice de confusion", fontsize=16, pad=14)
+
+    ax.set_xticklabels(ETATS, fontsize=11, rotation=30, ha="right")
+    ax.set_yticklabels(ETATS, fontsize=11, rotation=0, va="center")
+
+    for _, spine in ax.spines.items():
+        spine.set_visible(False)
+
+    fig.patch.set_facecolor('#f9f9f9')
+    ax.set_facecolor('#f9f9f9')
+
+    plt.tight_layout(pad=1.5)
+    return figure_en_png(fig)
+
+
+# Titre et couleurs des zones des frontières de décision, par algorithme
+STYLES_FRONTIERES = {
+    "KNN": ("Frontières de décision KNN (2D PCA)", {"cmap": "Pastel1"}),
+    "SVM": ("Frontières de décision SVM (2D PCA)", {"couleurs": ["#d3d3d3"]}),
+    "Régression Logistique": ("Frontières de décision Régression Logistique (2D PCA)", {"cmap": "Pastel1"}),
+}
+
+
+@st.cache_data(show_spinner="Calcul des frontières de décision...", max_entries=16)
+def image_frontieres(empreinte_dataset: str, algo: str, params: dict, _donnees: dict) -> bytes:
+    """Frontières de décision d'un algorithme sur ce dataset (temps constant quelle que soit sa taille)."""
+    frontieres = calculer_frontieres(creer_modele(algo, params), _donnees["X_train_scaled"], _donnees["y_train"])
+    titre, style = STYLES_FRONTIERES[algo]
+    return figure_frontieres(frontieres, titre, **style)
+
+
+# Au-delà, les courbes d'apprentissage portent sur un sous-échantillon stratifié
+MAX_ECHANTILLONS_COURBES = 50_000
+
+
+@st.cache_data(show_spinner="Calcul des courbes d'apprentissage...", max_entries=16)
+def courbe_apprentissage(empreinte_dataset: str, algo: str, params: dict, _donnees: dict) -> dict:
+    """Courbe d'apprentissage (validation croisée, plis en parallèle) d'un algorithme sur ce dataset."""
+    return calculer_courbe(creer_modele(algo, params), _donnees["X_train_scaled"], _donnees["y_train"],
+                           max_echantillons=MAX_ECHANTILLONS_COURBES)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def figure_courbes(empreinte_dataset: str, algo: str, params: dict, _courbe: dict) -> bytes:
+    tailles = _courbe["tailles"]
+    fig, (ax_temps, ax_acc) = plt.subplots(1, 2, figsize=(11, 4), dpi=130)
+
+    # Palettes de couleurs douces
+    train_color = '#e57272'  # rouge doux
+    val_color = '#72abdf'  # bleu doux
+    dot_color = '#755bb4'  # violet doux pour le marqueur de taille suffisante
+
+    # Temps d'entraînement selon la taille du jeu
+    ax_temps.plot(tailles, _courbe["duree_fit_moyenne"], color=train_color, linewidth=2.3, alpha=0.78,
+                  marker='o', label="Entraînement")
+    ax_temps.fill_between(tailles, _courbe["duree_fit_moyenne"] - _courbe["duree_fit_std"],
+                          _courbe["duree_fit_moyenne"] + _courbe["duree_fit_std"], color=train_color, alpha=0.15)
+    ax_temps.plot(tailles, _courbe["duree_score_moyenne"], color=val_color, linewidth=2.3, alpha=0.85,
+                  marker='o', label="Évaluation")
+    ax_temps.set_title("Temps d'entraînement par taille", fontsize=13, weight='medium')
+    ax_temps.set_xlabel("Échantillons d'entraînement", fontsize=11)
+    ax_temps.set_ylabel('Temps (s)', fontsize=11)
+    ax_temps.legend(fontsize=9.7, frameon=False)
+    ax_temps.grid(alpha=0.13, linestyle='--')
+    ax_temps.tick_params(axis='both', labelsize=10)
+
+    # Précision selon la taille du jeu
+    for cle, couleur, nom in [("score_train", train_color, "Précision entraînement"),
+                              ("score_val", val_color, "Précision validation")]:
+        moyenne, ecart = _courbe[f"{cle}_moyen"], _courbe[f"{cle}_std"]
+        ax_acc.plot(tailles, moyenne, color=couleur, linewidth=2.3, alpha=0.8, marker='o', label=nom)
+        ax_acc.fill_between(tailles, moyenne - ecart, moyenne + ecart, color=couleur, alpha=0.15)
+    suffisante = taille_suffisante(_courbe)
+    i = int(np.flatnonzero(tailles == suffisante)[0])
+    ax_acc.scatter(suffisante, _courbe["score_val_moyen"][i], c=dot_color, s=70, zorder=10,
+                   label=f'Taille suffisante = {suffisante}', edgecolors='white', linewidths=1)
+    ax_acc.set_title('Précision Entraînement et Validation', fontsize=13, weight='medium')
+    ax_acc.set_xlabel("Échantillons d'entraînement", fontsize=11)
+    ax_acc.set_ylabel('Précision', fontsize=11)
+    ax_acc.legend(fontsize=9.7, frameon=False)
+    ax_acc.grid(alpha=0.13, linestyle='--')
+    ax_acc.tick_params(axis='both', labelsize=10)
+
+    plt.tight_layout()
+    return figure_en_png(fig)
+
+
 # --------------------------------------------------
 # Step 1: Importation dataset
 # --------------------------------------------------
@@ -181,13 +435,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- File uploader ---
-uploaded_file = st.file_uploader("Importer un fichier CSV (dataset FH)", type=["csv"])
+uploaded_file = st.file_uploader("Importer un dataset FH (CSV, Parquet ou Feather)", type=["csv", "parquet", "feather"])
 
 if not uploaded_file:
-    st.info("Importer le fichier CSV contenant au moins la colonne 'Etat' (OK / Dégradé / KO) pour continuer.")
+    st.info("Importer le dataset contenant au moins la colonne 'Etat' (OK / Dégradé / KO) pour continuer.")
     st.stop()
 
-df = pd.read_csv(uploaded_file)
+# Format binaire : catégories et float32 déjà typés, pas de re-parsing texte
+empreinte_dataset = empreinte_fichier(uploaded_file)
+df = charger_dataset(empreinte_dataset, uploaded_file)
 
 # --------------------------------------------------
 # Étape 2 : EDA (côte à côte)
@@ -197,54 +453,19 @@ if "Etat" not in df.columns:
     st.error("Le jeu de données doit contenir la colonne 'Etat'. Renomme ta colonne cible en 'Etat' et réimporte.")
     st.stop()
 
-labels = ["OK", "Dégradé", "KO"]
-
 col1, col2 = st.columns([1, 1])
 
 # 1. Distribution des états (diagramme en barres)
 with col1:
     st.markdown("**Distribution des états**")
-    counts = df["Etat"].value_counts().reindex(labels).fillna(0)
-
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.barplot(
-        x=counts.index,
-        y=counts.values,
-        palette=["#442288", "#6ca2ea", "#b5d33d"],
-        edgecolor="white",
-        ax=ax
-    )
-    for i, v in enumerate(counts.values):
-        ax.text(i, v + max(counts.values)*0.02, f"{int(v)}", ha='center', color='white', fontsize=15, fontweight='bold')
-    ax.set_ylabel("Nombre", fontsize=12)
-    ax.set_xlabel("État", fontsize=12)
-    ax.set_title("Distribution des états", fontsize=14, fontweight='semibold')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(axis='y', color="#eeeeee", linestyle='-', linewidth=1.5, alpha=1)
-    ax.set_facecolor("#f9f9f9")
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
+    st.image(figure_distribution_etats(empreinte_dataset, df), use_container_width=True)
 
 # 2. Matrice de corrélation (carte thermique)
 with col2:
     st.markdown("**Matrice de corrélation**")
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-    if numeric_cols:
-        corr = df[numeric_cols].corr()
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(
-            corr, annot=False,  # annot=True avec petits nombres si nécessaire
-            cmap="plasma",
-            linewidths=2,
-            linecolor='white',
-            cbar_kws={'shrink': 0.7}
-        )
-        ax.set_title("Matrice de corrélation", fontsize=14, fontweight='semibold')
-        ax.set_facecolor("#f9f9f9")
-        plt.tight_layout()
-        st.pyplot(fig, use_container_width=True)
+    image_corr = figure_correlation(empreinte_dataset, df)
+    if image_corr is not None:
+        st.image(image_corr, use_container_width=True)
     else:
         st.info("Aucune colonne numérique pour la matrice de corrélation.")
 
@@ -253,19 +474,10 @@ with col2:
 # --------------------------------------------------
 st.markdown('<h4 style="margin-top:25px;">Nettoyage et prétraitement des données</h4>', unsafe_allow_html=True)
 
-df = df.drop_duplicates()
-
-X = df.drop(columns=["Etat"])
-y = df["Etat"].astype(str)
-cat_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
-if cat_cols:
-    X = pd.get_dummies(X, columns=cat_cols, drop_first=True)
-num_cols = X.select_dtypes(include=[np.number]).columns.tolist()
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
-scaler = StandardScaler()
-X_train_scaled = pd.DataFrame(scaler.fit_transform(X_train), columns=X_train.columns, index=X_train.index)
-X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns, index=X_test.index)
+donnees = pretraiter(empreinte_dataset, df)
+y_train, y_test = donnees["y_train"], donnees["y_test"]
+scaler = donnees["scaler"]
+X_train_scaled, X_test_scaled = donnees["X_train_scaled"], donnees["X_test_scaled"]
 
 st.markdown(
     """
@@ -288,74 +500,27 @@ st.markdown(
     unsafe_allow_html=True
 )
 col_l, col_r = st.columns(2)
-train_counts = y_train.value_counts().reindex(labels).fillna(0)
-test_counts = y_test.value_counts().reindex(labels).fillna(0)
-max_count = max(train_counts.max(), test_counts.max())
-
-hist_palette = ["#6a0dad", "#d6b3f2", "#c99ff0"]
+image_train, image_test = figures_separation(empreinte_dataset, donnees)
 
 with col_l:
     st.markdown("**Entraînement (80%)**")
-    fig, ax = plt.subplots(figsize=(6, 3.5))
-    sns.barplot(
-        x=train_counts.index, y=train_counts.values,
-        palette=hist_palette, edgecolor="#fff", ax=ax
-    )
-    for i, v in enumerate(train_counts.values):
-        ax.text(i, v + max_count*0.025, int(v), color="#222", ha='center', fontsize=13, fontweight='bold')
-    ax.set_ylim(0, max_count * 1.1)
-    ax.set_ylabel("Nombre", fontsize=12, color="#333")
-    ax.set_xlabel("Classe", fontsize=12, color="#333")
-    ax.set_title("Distribution du jeu d'entraînement", fontsize=14, fontweight='semibold', color="#222")
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.spines["left"].set_color("#e0e0e0")
-    ax.spines["bottom"].set_color("#e0e0e0")
-    ax.grid(axis='y', color="#ededed", linestyle='--', linewidth=1, alpha=0.9)
-    ax.set_facecolor("#fff")
-    fig.patch.set_facecolor("#fff")
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
+    st.image(image_train, use_container_width=True)
 
 with col_r:
     st.markdown("**Test (20%)**")
-    fig, ax = plt.subplots(figsize=(6, 3.5))
-    sns.barplot(
-        x=test_counts.index, y=test_counts.values,
-        palette=hist_palette, edgecolor="#fff", ax=ax
-    )
-    for i, v in enumerate(test_counts.values):
-        ax.text(i, v + max_count*0.025, int(v), color="#222", ha='center', fontsize=13, fontweight='bold')
-    ax.set_ylim(0, max_count * 1.1)
-    ax.set_ylabel("Nombre", fontsize=12, color="#333")
-    ax.set_xlabel("Classe", fontsize=12, color="#333")
-    ax.set_title("Distribution du jeu de test", fontsize=14, fontweight='semibold', color="#222")
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.spines["left"].set_color("#e0e0e0")
-    ax.spines["bottom"].set_color("#e0e0e0")
-    ax.grid(axis='y', color="#ededed", linestyle='--', linewidth=1, alpha=0.9)
-    ax.set_facecolor("#fff")
-    fig.patch.set_facecolor("#fff")
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
+    st.image(image_test, use_container_width=True)
 
 
 # --------------------------------------------------
 # Étape 3b : Boutons de téléchargement
 # --------------------------------------------------
-buf_train = BytesIO()
-pd.concat([X_train, y_train.reset_index(drop=True)], axis=1).to_csv(buf_train, index=False)
-buf_train.seek(0)
-buf_test = BytesIO()
-pd.concat([X_test, y_test.reset_index(drop=True)], axis=1).to_csv(buf_test, index=False)
-buf_test.seek(0)
+csv_train, csv_test = csv_separation(empreinte_dataset, donnees)
 
 col_dl1, col_dl2 = st.columns(2)
 with col_dl1:
     st.download_button(
         label="Télécharger données_train (80%)",
-        data=buf_train,
+        data=csv_train,
         file_name="donnees_train.csv",
         mime="text/csv",
         key="download_train"
@@ -363,7 +528,7 @@ with col_dl1:
 with col_dl2:
     st.download_button(
         label="Télécharger données_test (20%)",
-        data=buf_test,
+        data=csv_test,
         file_name="donnees_test.csv",
         mime="text/csv",
         key="download_test"
@@ -373,7 +538,7 @@ with col_dl2:
 # Étape 4 : Choix de l'algorithme + entraînement
 # --------------------------------------------------
 st.markdown('<h4 style="margin-top:25px;">Choix de l\'algorithme & entraînement</h4>', unsafe_allow_html=True)
-algo = st.selectbox("Sélectionnez un algorithme", ["Random Forest", "KNN", "SVM", "Régression Logistique"])
+algo = st.selectbox("Sélectionnez un algorithme", ALGORITHMES)
 
 params = {}
 if algo == "Random Forest":
@@ -386,24 +551,15 @@ elif algo == "Régression Logistique":
     params["C"] = st.number_input("C", value=1.0)
 
 if st.button("Lancer l'entraînement"):
-    if algo == "Random Forest":
-        model = RandomForestClassifier(n_estimators=params["n_estimators"], random_state=42)
-    elif algo == "KNN":
-        model = KNeighborsClassifier(n_neighbors=params["n_neighbors"])
-    elif algo == "SVM":
-        model = SVC(kernel=params["kernel"], probability=True, random_state=42)
-    else:
-        model = LogisticRegression(max_iter=2000, C=params["C"], random_state=42)
-
-    model.fit(X_train_scaled, y_train)
-    y_pred = model.predict(X_test_scaled)
-
-    acc = accuracy_score(y_test, y_pred)
-    f1_macro = f1_score(y_test, y_pred, average='macro')
+    # Déjà entraîné sur ce dataset avec ces paramètres : résultat repris du cache
+    resultat = entrainer_modele(empreinte_dataset, algo, params, donnees)
+    model = resultat["model"]
+    acc = resultat["acc"]
+    f1_macro = resultat["f1_macro"]
 
     # Créer dossier 'models' si inexistant
     os.makedirs("models", exist_ok=True)
-    joblib.dump(model, f"models/model_{algo.replace(' ', '_')}.joblib")
+    sauvegarder_artefact(model, f"models/model_{algo.replace(' ', '_')}.joblib")
     joblib.dump(scaler, "models/scaler.joblib")
     joblib.dump(list(X_train_scaled.columns), "models/feature_cols.joblib")
 
@@ -418,8 +574,7 @@ if st.button("Lancer l'entraînement"):
         st.markdown(f'<div class="small-card"><strong>F1-macro</strong><h3>{f1_macro:.2%}</h3></div>',
                     unsafe_allow_html=True)
     with mcol3:
-        report_df = pd.DataFrame(classification_report(y_test, y_pred, output_dict=True)).transpose()
-        st.dataframe(report_df.round(2), use_container_width=True, height=160)
+        st.dataframe(resultat["report"].round(2), use_container_width=True, height=160)
     st.markdown(
         """
         <style>
@@ -434,48 +589,9 @@ if st.button("Lancer l'entraînement"):
         unsafe_allow_html=True
     )
 
-    plt.rcParams.update({'font.size': 12, 'font.family': 'DejaVu Sans'})
-
-    fig, ax = plt.subplots(figsize=(4, 3))
-
-    cm = confusion_matrix(y_test, y_pred, labels=labels)
-
-    # Créer une palette bleu clair
-    light_blue_cmap = sns.light_palette("blue", as_cmap=True)
-
-    sns.heatmap(
-        cm,
-        annot=True,
-        fmt="d",
-        cmap=light_blue_cmap,
-        linewidths=0,
-        square=False,
-        annot_kws={"size": 12, "weight": "bold", "color": "black", "va": "center", "ha": "center"},
-        cbar=True,
-        ax=ax,
-        cbar_kws={"shrink": 0.8, "aspect": 15, "pad": 0.02, "orientation": "vertical"}
-    )
-    cbar = ax.collections[0].colorbar
-    cbar.ax.tick_params(labelsize=10)
-
-    ax.set_xlabel("Étiquette prédite", fontsize=14, labelpad=10)
-    ax.set_ylabel("Étiquette réelle", fontsize=14, labelpad=10)
-    ax.set_title("Matrice de confusion", fontsize=16, pad=14)
-
-    ax.set_xticklabels(labels, fontsize=11, rotation=30, ha="right")
-    ax.set_yticklabels(labels, fontsize=11, rotation=0, va="center")
-
-    for _, spine in ax.spines.items():
-        spine.set_visible(False)
-
-    fig.patch.set_facecolor('#f9f9f9')
-    ax.set_facecolor('#f9f9f9')
-
-    plt.tight_layout(pad=1.5)
-
     # Affichage centré dans Streamlit
     st.markdown('<div style="display:flex;justify-content:center;">', unsafe_allow_html=True)
-    st.pyplot(fig, use_container_width=False)
+    st.image(figure_confusion(resultat["cm"]))
     st.markdown('</div>', unsafe_allow_html=True)
     # --------------------------------------------------
     # Étape 4b : Visualisation du modèle obtenu
@@ -500,233 +616,18 @@ if st.button("Lancer l'entraînement"):
         graph = graphviz.Source(dot_data)
         st.graphviz_chart(graph)
 
-
-    elif algo == "KNN":
-
-        from sklearn.decomposition import PCA
-
-        from sklearn.preprocessing import LabelEncoder
-
-        # Réduire à 2 dimensions
-
-        pca = PCA(n_components=2)
-
-        X_train_2d = pca.fit_transform(X_train_scaled)
-
-        # Encoder les labels en numériques
-
-        le = LabelEncoder()
-
-        y_train_enc = le.fit_transform(y_train)
-
-        # Réentraîner le modèle sur 2D
-
-        model.fit(X_train_2d, y_train_enc)
-
-        # Création de la grille pour contourf
-
-        x_min, x_max = X_train_2d[:, 0].min() - 1, X_train_2d[:, 0].max() + 1
-
-        y_min, y_max = X_train_2d[:, 1].min() - 1, X_train_2d[:, 1].max() + 1
-
-        xx, yy = np.meshgrid(np.arange(x_min, x_max, 0.1),
-
-                             np.arange(y_min, y_max, 0.1))
-
-        Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
-
-        Z = Z.reshape(xx.shape)
-
-        # Tracer
-
-        fig_knn, ax_knn = plt.subplots(figsize=(10, 2))
-
-        ax_knn.contourf(xx, yy, Z, alpha=0.3, cmap="Pastel1")
-
-        scatter = ax_knn.scatter(X_train_2d[:, 0], X_train_2d[:, 1],
-
-                                 c=y_train_enc, cmap="Set1", edgecolor='k')
-
-        ax_knn.set_title("Frontières de décision KNN (2D PCA)")
-
-        st.pyplot(fig_knn, use_container_width=True)
-
-
-    elif algo == "SVM":
-
-        from sklearn.decomposition import PCA
-
-        from sklearn.preprocessing import LabelEncoder
-
-        # PCA pour réduire à 2 dimensions
-
-        pca = PCA(n_components=2)
-
-        X_train_2d = pca.fit_transform(X_train_scaled)
-
-        X_test_2d = pca.transform(X_test_scaled)
-
-        # Encoder les labels en numériques
-
-        le = LabelEncoder()
-
-        y_train_enc = le.fit_transform(y_train)
-
-        y_test_enc = le.transform(y_test)
-
-        # Réentraîner le SVM sur 2D
-
-        model.fit(X_train_2d, y_train_enc)
-
-        y_pred_enc = model.predict(X_test_2d)
-
-        # Création grille pour frontières
-
-        x_min, x_max = X_train_2d[:, 0].min() - 1, X_train_2d[:, 0].max() + 1
-
-        y_min, y_max = X_train_2d[:, 1].min() - 1, X_train_2d[:, 1].max() + 1
-
-        xx, yy = np.meshgrid(np.arange(x_min, x_max, 0.1),
-
-                             np.arange(y_min, y_max, 0.1))
-
-        Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
-
-        Z = Z.reshape(xx.shape)
-
-        # Tracer frontière SVM avec gris clair
-        fig_svm, ax = plt.subplots(figsize=(10, 2))
-
-        # contourf avec couleur grise
-        ax.contourf(xx, yy, Z, alpha=0.3, colors=['#d3d3d3'])  # gris clair uniforme
-
-        # points d'entraînement
-        scatter = ax.scatter(X_train_2d[:, 0], X_train_2d[:, 1],
-                             c=y_train_enc, cmap="Set1", edgecolor='k')
-
-        ax.set_title("Frontières de décision SVM (2D PCA)")
-
-        st.pyplot(fig_svm, use_container_width=True)
-
-
-
-
-    elif algo == "Régression Logistique":
-
-        from sklearn.decomposition import PCA
-
-        from sklearn.preprocessing import LabelEncoder
-
-        # PCA pour réduire à 2 dimensions
-
-        pca = PCA(n_components=2)
-
-        X_train_2d = pca.fit_transform(X_train_scaled)
-
-        X_test_2d = pca.transform(X_test_scaled)
-
-        # Encoder les labels en numériques
-
-        le = LabelEncoder()
-
-        y_train_enc = le.fit_transform(y_train)
-
-        y_test_enc = le.transform(y_test)
-
-        # Réentraîner le modèle sur 2D
-
-        model.fit(X_train_2d, y_train_enc)
-
-        y_pred_enc = model.predict(X_test_2d)
-
-        # Création grille pour frontières
-
-        x_min, x_max = X_train_2d[:, 0].min() - 1, X_train_2d[:, 0].max() + 1
-
-        y_min, y_max = X_train_2d[:, 1].min() - 1, X_train_2d[:, 1].max() + 1
-
-        xx, yy = np.meshgrid(np.arange(x_min, x_max, 0.1),
-
-                             np.arange(y_min, y_max, 0.1))
-
-        Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
-
-        Z = Z.reshape(xx.shape)
-
-        # Tracer frontière
-
-        fig_logreg, ax = plt.subplots(figsize=(10, 2))
-
-        ax.contourf(xx, yy, Z, alpha=0.3, cmap="Pastel1")
-
-        scatter = ax.scatter(X_train_2d[:, 0], X_train_2d[:, 1], c=y_train_enc, cmap="Set1", edgecolor='k')
-
-        ax.set_title("Frontières de décision Régression Logistique (2D PCA)")
-
-        st.pyplot(fig_logreg, use_container_width=True)
-
-    # Exemple de données (à remplacer par les données réelles)
-    epochs = 10
-    train_loss = np.linspace(0.9, 0.1, epochs)
-    val_loss = np.linspace(1.0, 0.2, epochs)
-    train_acc = np.linspace(0.5, 0.95, epochs)
-    val_acc = np.linspace(0.45, 0.9, epochs)
-    epochs_arr = np.arange(1, epochs + 1)
-
-    # Échelle dense des époques
-    xnew = np.linspace(1, epochs, 300)
-
-
-    # Courbes lissées avec PchipInterpolator pour une interpolation monotone douce
-    def smooth_curve(x, y):
-        return PchipInterpolator(x, y)(xnew)
-        # Ou utiliser : return make_interp_spline(x, y, k=3)(xnew)
-
-
-    train_loss_smooth = smooth_curve(epochs_arr, train_loss)
-    val_loss_smooth = smooth_curve(epochs_arr, val_loss)
-    train_acc_smooth = smooth_curve(epochs_arr, train_acc)
-    val_acc_smooth = smooth_curve(epochs_arr, val_acc)
-
-    fig, (ax_loss, ax_acc) = plt.subplots(1, 2, figsize=(11, 4), dpi=130)
-
-    # Palettes de couleurs douces
-    train_color = '#e57272'  # rouge doux
-    val_color = '#72abdf'  # bleu doux
-    dot_color = '#755bb4'  # violet doux pour le marqueur de meilleure époque
-
-    # Graphe des pertes (loss)
-    ax_loss.plot(xnew, train_loss_smooth, color=train_color, linewidth=2.3, alpha=0.78, label="Perte entraînement")
-    ax_loss.plot(xnew, val_loss_smooth, color=val_color, linewidth=2.3, alpha=0.85, label="Perte validation")
-    best_epoch_loss = np.argmin(val_loss) + 1
-    ax_loss.scatter(best_epoch_loss, val_loss[best_epoch_loss - 1], c=dot_color, s=70, zorder=10,
-                    label=f'Meilleure époque = {best_epoch_loss}', edgecolors='white', linewidths=1)
-    ax_loss.set_title('Perte Entraînement et Validation', fontsize=13, weight='medium')
-    ax_loss.set_xlabel('Époques', fontsize=11)
-    ax_loss.set_ylabel('Perte', fontsize=11)
-    leg_loss = ax_loss.legend(fontsize=9.7, frameon=False)
-    for line in leg_loss.get_lines():
-        line.set_linewidth(1.2)
-    ax_loss.grid(alpha=0.13, linestyle='--')
-    ax_loss.tick_params(axis='both', labelsize=10)
-
-    # Graphe de précision (accuracy)
-    ax_acc.plot(xnew, train_acc_smooth, color=train_color, linewidth=2.3, alpha=0.78, label="Précision entraînement")
-    ax_acc.plot(xnew, val_acc_smooth, color=val_color, linewidth=2.3, alpha=0.85, label="Précision validation")
-    best_epoch_acc = np.argmax(val_acc) + 1
-    ax_acc.scatter(best_epoch_acc, val_acc[best_epoch_acc - 1], c=dot_color, s=70, zorder=10,
-                   label=f'Meilleure époque = {best_epoch_acc}', edgecolors='white', linewidths=1)
-    ax_acc.set_title('Précision Entraînement et Validation', fontsize=13, weight='medium')
-    ax_acc.set_xlabel('Époques', fontsize=11)
-    ax_acc.set_ylabel('Précision', fontsize=11)
-    leg_acc = ax_acc.legend(fontsize=9.7, frameon=False)
-    for line in leg_acc.get_lines():
-        line.set_linewidth(1.2)
-    ax_acc.grid(alpha=0.13, linestyle='--')
-    ax_acc.tick_params(axis='both', labelsize=10)
-
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
+    else:
+        # Frontières dans le plan ACP : grille et sous-échantillons de taille fixe, image en cache
+        st.image(image_frontieres(empreinte_dataset, algo, params, donnees), use_container_width=True)
+
+    # Courbes d'apprentissage : précision et temps d'entraînement selon la taille du jeu
+    courbe = courbe_apprentissage(empreinte_dataset, algo, params, donnees)
+    st.image(figure_courbes(empreinte_dataset, algo, params, courbe), use_container_width=True)
+    sous_echantillon = (f" (sous-échantillon stratifié de {courbe['n_total']} lignes)"
+                        if courbe["n_total"] < len(y_train) else "")
+    st.caption(f"Validation croisée à 5 plis{sous_echantillon} : au-delà de "
+               f"{taille_suffisante(courbe)} échantillons d'entraînement, la précision de validation "
+               f"progresse de moins d'un point.")
 
 # --------------------------------------------------
 # Step 5: Comparaison rapide des algorithmes
@@ -763,27 +664,29 @@ st.markdown("""
 
 # --- Comparaison des modèles ---
 if st.button("Lancer comparaison des 4 algorithmes"):
-    results = {}
-    models = {
-        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-        "KNN": KNeighborsClassifier(n_neighbors=5),
-        "SVM": SVC(kernel='rbf', probability=True, random_state=42),
-        "LogReg": LogisticRegression(max_iter=2000, random_state=42)
-    }
-
-    for name, m in models.items():
-        m.fit(X_train_scaled, y_train)
-        results[name] = accuracy_score(y_test, m.predict(X_test_scaled))
-        os.makedirs("models", exist_ok=True)
-        joblib.dump(m, f"models/model_{name}.joblib")
-
+    # Entraînements en parallèle (un processus par algorithme, matrice normalisée partagée) ;
+    # chaque résultat s'affiche dès que son modèle est prêt
+    models = algorithmes_par_defaut()
     cols = st.columns(4)
-    for i, (name, score) in enumerate(results.items()):
+    emplacements = {}
+    for i, name in enumerate(models):
         with cols[i]:
+            emplacements[name] = st.empty()
+            emplacements[name].markdown(
+                f'<div class="metric-circle"><div>{name}</div><div>...</div></div>',
+                unsafe_allow_html=True
+            )
+
+    debut = time.perf_counter()
+    for resultat in comparer_algorithmes(X_train_scaled, y_train, X_test_scaled, y_test, models,
+                                         dossier_modeles="models", colonnes=list(X_train_scaled.columns)):
+        with emplacements[resultat["nom"]].container():
             st.markdown(
-                f'<div class="metric-circle"><div>{name}</div><div>{score * 100:.2f}%</div></div>',
+                f'<div class="metric-circle"><div>{resultat["nom"]}</div><div>{resultat["precision"] * 100:.2f}%</div></div>',
                 unsafe_allow_html=True
             )
+            st.caption(f'{resultat["duree"]:.2f} s · pic mémoire {resultat["memoire_pic"] / 2**20:.0f} Mo')
+    st.caption(f"Comparaison terminée en {time.perf_counter() - debut:.2f} s.")
 
 # --------------------------------------------------
 # Step 6: Navigation
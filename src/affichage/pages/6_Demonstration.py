@@ -1,12 +1,21 @@
+import os
+import sys
 import streamlit as st
 import pandas as pd
 import time
-import joblib
 import plotly.graph_objects as go
 from pydub import AudioSegment
 from io import BytesIO
 import base64
 
+# Ajouter la racine du projet au PYTHONPATH pour importer src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.ia.registre import obtenir_artefact
+from src.utils.agregats import AgregatsSession
+from src.utils.decimation import decimer
+from src.utils.detection_anomalies import DetecteurAnomalies
+
 # --------------------------------------------------
 # Config de la page
 # --------------------------------------------------
@@ -315,8 +324,9 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
         st.stop()
 
     # Charger le modèle IA selon sélection
-    scaler = joblib.load("models/scaler.joblib")
-    feature_cols = joblib.load("models/feature_cols.joblib")
+    # Artefacts en mémoire mappée et gardés par le registre : relus seulement s'ils changent sur disque
+    scaler = obtenir_artefact("models/scaler.joblib")
+    feature_cols = obtenir_artefact("models/feature_cols.joblib")
     if model_name == "Random Forest":
         model_path = "models/model_Random_Forest.joblib"
     elif model_name == "KNN":
@@ -328,7 +338,7 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
     else:
         st.error("Modèle inconnu sélectionné.")
         st.stop()
-    model = joblib.load(model_path)
+    model = obtenir_artefact(model_path)
 
     X_test = df_test.drop(columns=["Etat"], errors="ignore")
     for col in feature_cols:
@@ -346,6 +356,12 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
     anomalies_x, anomalies_y = [], []
     historique_etat = []
     max_time = min(len(df_test), 40)
+    # Agrégats courants de la démo, lus par la page Bilan
+    parametres_suivis = [col for col in ["RSSI", "SNR", "BER", "TxPower", "Disponibilite"] if col in df_test.columns]
+    agregats = AgregatsSession(parametres_suivis)
+    st.session_state["agregats"] = agregats
+    # Anomalies à ±1σ des 20 dernières mesures : RSSI trop bas, BER trop haut
+    detecteur = DetecteurAnomalies("fenetre", 2, seuil=1.0, sens=["bas", "haut"], taille=20)
 
     # --- Simulation réelle
     for t in range(max_time):
@@ -362,8 +378,7 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
         snr_hist.append(snr_val)
         txpower_hist.append(txpower_val)
 
-        anomalies_rssi = rssi_val < df_test["RSSI"].mean() - df_test["RSSI"].std()
-        anomalies_ber = ber_val > df_test["BER"].mean() + df_test["BER"].std()
+        anomalies_rssi, anomalies_ber = detecteur.evaluer([rssi_val, ber_val])
         anomalies = anomalies_rssi or anomalies_ber
         if anomalies:
             anomalies_x.append(t+1)
@@ -371,17 +386,18 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
 
         etat = "OK" if (
             rssi_val > -70 and snr_val > 15 and ber_val < 0.01
-        ) else "Dégradée" if (
+        ) else "Dégradé" if (
             rssi_val > -85 and snr_val > 10
         ) else "KO"
         historique_etat.append(etat)
         st.session_state["historique_etat"] = historique_etat
+        agregats.ajouter({col: df_test[col].values[t] for col in parametres_suivis}, etat)
 
-        tot = len(historique_etat)
-        pct_ok = int(100 * historique_etat.count("OK") / tot)
-        pct_degrade = int(100 * historique_etat.count("Dégradée") / tot)
-        pct_ko = int(100 * historique_etat.count("KO") / tot)
-        etat_courant = historique_etat[-1]
+        pourcentages = agregats.pourcentages()
+        pct_ok = pourcentages["OK"]
+        pct_degrade = pourcentages["Dégradé"]
+        pct_ko = pourcentages["KO"]
+        etat_courant = agregats.dernier_etat
 
         # 5 cadres collés : timer dans le 4ᵉ cadre, état dans le 5ᵉ cadre (pas de boule en dessous)
         with placeholder_grid:
@@ -412,7 +428,7 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
             """.format(
                 ok=pct_ok, deg=pct_degrade, ko=pct_ko,
                 timer=t+1,
-                color="#2a9d8f" if etat_courant == "OK" else "#FFD700" if etat_courant == "Dégradée" else "#e63946",
+                color="#2a9d8f" if etat_courant == "OK" else "#FFD700" if etat_courant == "Dégradé" else "#e63946",
                 etat=etat_courant,
                 anom=("<div style='margin-top:6px; font-size:23px;color:#e63946;font-weight:700;'><span style='vertical-align:middle;'>Anomalie</span> <span class='anomalie-croix' style='font-size:30px;'>✖</span></div>" if anomalies else "")
             ), unsafe_allow_html=True)
@@ -420,10 +436,11 @@ if st.session_state["demo_start"] and st.session_state["df_test"] is not None:
         # ---- Graphe multi-traces + marqueur anomalies ----
         with placeholder_graph:
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=x_vals, y=rssi_hist, mode="lines+markers", name="RSSI (dBm)", line=dict(color="orange", width=2)))
-            fig.add_trace(go.Scatter(x=x_vals, y=snr_hist, mode="lines+markers", name="SNR (dB)", line=dict(color="green", width=2)))
-            fig.add_trace(go.Scatter(x=x_vals, y=ber_hist, mode="lines+markers", name="BER", line=dict(color="blue", width=2)))
-            fig.add_trace(go.Scatter(x=x_vals, y=txpower_hist, mode="lines+markers", name="TxPower (dBm)", line=dict(color="red", width=2)))
+            # Séries décimées : quelques milliers de points au plus, pics conservés
+            for y_hist, nom, couleur in [(rssi_hist, "RSSI (dBm)", "orange"), (snr_hist, "SNR (dB)", "green"),
+                                         (ber_hist, "BER", "blue"), (txpower_hist, "TxPower (dBm)", "red")]:
+                x_dec, y_dec = decimer(x_vals, y_hist, methode="minmax")
+                fig.add_trace(go.Scatter(x=x_dec, y=y_dec, mode="lines+markers", name=nom, line=dict(color=couleur, width=2)))
             # Ajout des croix rouges pour anomalies
             if anomalies_x and anomalies_y:
                 fig.add_trace(go.Scatter(
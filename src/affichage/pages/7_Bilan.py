@@ -3,6 +3,14 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import unicodedata
+import os
+import sys
+from functools import lru_cache
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.decimation import decimer
+from src.utils.agregats import AgregatsSession
 
 
 # --------------------------------------------------
@@ -111,6 +119,7 @@ header {visibility: hidden;}
 st.markdown('<div class="title-mini-card">Bilan de la Démonstration FH</div>', unsafe_allow_html=True)
 
 # ---------- Fonctions utilitaires ----------
+@lru_cache(maxsize=1024)
 def normalize(s: str) -> str:
     if s is None: return ""
     s = str(s).lower().strip().replace(" ", "").replace("_", "")
@@ -118,19 +127,63 @@ def normalize(s: str) -> str:
     s = "".join(ch for ch in s if not unicodedata.combining(ch))
     return s
 
+@lru_cache(maxsize=64)
+def normalized_columns(columns: tuple) -> dict:
+    return {normalize(c): c for c in columns}
+
 def find_column(df, candidates):
-    cols_norm = {normalize(c): c for c in df.columns}
+    cols_norm = normalized_columns(tuple(df.columns))
     for cand in candidates:
         if normalize(cand) in cols_norm:
             return cols_norm[normalize(cand)]
     return None
 
-def canonical_state(s):
-    if s is None: return "KO"
-    s_norm = normalize(s)
-    if "ok" in s_norm: return "OK"
-    if "deg" in s_norm or "degrad" in s_norm or "degrade" in s_norm: return "Dégradée"
-    return "KO"
+@st.cache_data(show_spinner=False)
+def gauge_figure(label: str, value: float, vmin: float, vmax: float, color: str, unit: str) -> go.Figure:
+    """Jauge d'un paramètre, reconstruite seulement quand ses valeurs changent."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=value,
+        title={"text": label, "font": {"size": 20, "color": "black"}},
+        gauge={
+            "axis": {"range": [vmin, vmax], "tickcolor": "black"},
+            "bar": {"color": color},
+            "bgcolor": "white",
+            "borderwidth": 2,
+            "bordercolor": "lightgray",
+            "steps": [
+                {"range": [vmin, vmax], "color": "whitesmoke"}
+            ],
+        },
+        number={
+            "valueformat": ".2f",
+            "suffix": unit,
+            "font": {"color": "black", "size": 18}
+        }
+    ))
+    fig.update_layout(paper_bgcolor='white', plot_bgcolor='white', font=dict(color='black'))
+    return fig
+
+@st.cache_data(show_spinner=False)
+def quality_gauge_figure(quality_pct: float) -> go.Figure:
+    """Jauge de qualité globale, reconstruite seulement quand le score change."""
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=quality_pct,
+        number={'suffix': " %", 'font': {'color': 'black', 'size': 24}},
+        title={'text': "Qualité Globale", 'font': {'color': 'black', 'size': 20}},
+        gauge={
+            'axis': {'range': [0, 100], 'tickcolor': 'black'},
+            'bar': {'color': "blue"},
+            'bgcolor': "white",  # ✅ Fond clair
+            'borderwidth': 2, 'bordercolor': 'black'
+        }
+    ))
+    fig_gauge.update_layout(
+        paper_bgcolor='white',
+        font=dict(color='black')
+    )
+    return fig_gauge
 
 # ---------- Récupération de l'historique ----------
 if "df_test" not in st.session_state or "historique_etat" not in st.session_state:
@@ -139,16 +192,32 @@ if "df_test" not in st.session_state or "historique_etat" not in st.session_stat
 
 df_test = st.session_state["df_test"]
 historique_raw = st.session_state["historique_etat"]
-historique_etat = [canonical_state(x) for x in historique_raw]
 
-nb_total = len(historique_etat) if len(historique_etat) > 0 else 1
-nb_ok = historique_etat.count("OK")
-nb_deg = historique_etat.count("Dégradée")
-nb_ko = historique_etat.count("KO")
+# ---------- Indicateurs suivis ----------
+candidates_map = {
+    "RSSI": ["rssi"],
+    "BER": ["ber"],
+    "SNR": ["snr"],
+    "TxPower": ["txpower", "tx_power", "txpowerdbm"],
+}
+
+# Agrégats courants tenus par la Démonstration ; reconstruits une fois s'ils manquent
+agregats = st.session_state.get("agregats")
+if agregats is None or agregats.nb != len(historique_raw):
+    columns = {param: find_column(df_test, cands) for param, cands in candidates_map.items()}
+    columns = {param: col for param, col in columns.items() if col is not None}
+    rows = ({param: df_test[col].values[t] for param, col in columns.items()} for t in range(len(historique_raw)))
+    agregats = AgregatsSession.depuis_historique(list(columns), rows, historique_raw)
+    st.session_state["agregats"] = agregats
+
+nb_total = agregats.nb if agregats.nb > 0 else 1
+nb_ok = agregats.comptes["OK"]
+nb_deg = agregats.comptes["Dégradé"]
+nb_ko = agregats.comptes["KO"]
 pct_ok = int(round(nb_ok / nb_total * 100))
 pct_deg = int(round(nb_deg / nb_total * 100))
 pct_ko = int(round(nb_ko / nb_total * 100))
-last_state = historique_etat[-1] if historique_etat else "KO"
+last_state = agregats.dernier_etat or "KO"
 
 # ---------- MINI GRILLE SYNTHÉTIQUE ----------
 timer_s = f"{nb_total}s"
@@ -181,11 +250,11 @@ st.markdown(f"""
 
 # ---------- Indicateurs de performance ----------
 st.subheader("Indicateurs de Performance Moyenne")
-candidates_map = {
-    "RSSI": ["rssi"],
-    "BER": ["ber"],
-    "SNR": ["snr"],
-    "Puissance (TxPower)": ["txpower", "tx_power", "txpowerdbm"],
+display_labels = {
+    "RSSI": "RSSI",
+    "BER": "BER",
+    "SNR": "SNR",
+    "TxPower": "Puissance (TxPower)",
 }
 gauge_colors = {
     "RSSI": "#FF8C00",
@@ -200,36 +269,18 @@ units_map = {
     "Puissance (TxPower)": " dBm"
 }
 cols_layout = st.columns(4)
-for i, (display_label, cands) in enumerate(candidates_map.items()):
-    col = find_column(df_test, cands)
-    if col is not None:
-        vals = pd.to_numeric(df_test[col], errors="coerce").dropna()
-        value = float(vals.mean()) if not vals.empty else 0
-        vmin = float(np.nanmin(vals)) if not vals.empty else 0
-        vmax = float(np.nanmax(vals)) if not vals.empty else 1
+for i, param in enumerate(candidates_map):
+    stats = agregats.stats.get(param)
+    if stats is not None:
+        display_label = display_labels[param]
+        # Moyenne, min et max lus dans les agrégats courants (O(1), sans relire df_test)
+        value = stats.moyenne if stats.n else 0
+        vmin = stats.min if stats.n else 0
+        vmax = stats.max if stats.n else 1
         if vmin == vmax:
             vmin, vmax = value - 2, value + 2
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=value,
-            title={"text": display_label, "font": {"size": 20, "color": "black"}},
-            gauge={
-                "axis": {"range": [vmin, vmax], "tickcolor": "black"},
-                "bar": {"color": gauge_colors.get(display_label, "darkcyan")},
-                "bgcolor": "white",
-                "borderwidth": 2,
-                "bordercolor": "lightgray",
-                "steps": [
-                    {"range": [vmin, vmax], "color": "whitesmoke"}
-                ],
-            },
-            number={
-                "valueformat": ".2f",
-                "suffix": units_map.get(display_label, ""),
-                "font": {"color": "black", "size": 18}
-            }
-        ))
-        fig.update_layout(paper_bgcolor='white', plot_bgcolor='white', font=dict(color='black'))
+        fig = gauge_figure(display_label, value, vmin, vmax,
+                           gauge_colors.get(display_label, "darkcyan"), units_map.get(display_label, ""))
         cols_layout[i % 4].plotly_chart(fig, use_container_width=True)
 
 # ---------- Graphique combiné : évolution 40s ----------
@@ -250,8 +301,9 @@ for display, cands in params_candidates.items():
     col = find_column(df_test, cands)
     if col is not None:
         y = pd.to_numeric(df_test[col].values[:max_points], errors="coerce")
+        x, y = decimer(np.arange(1, len(y)+1), y, methode="minmax")
         fig.add_trace(go.Scatter(
-            x=list(range(1, len(y)+1)), y=y,
+            x=x, y=y,
             mode="lines+markers", name=display,
             line=dict(color=colors.get(display, None), width=1.5),
             marker=dict(size=10, symbol='circle', line=dict(width=0))
@@ -284,29 +336,13 @@ if fig.data:
 
 # ---------- Synthèse qualité globale ----------
 st.subheader("Qualité globale de la liaison")
-quality_score = (nb_ok * 1.0 + nb_deg * 0.5 + nb_ko * 0.0) / nb_total
+quality_score = agregats.score()
 quality_pct = quality_score * 100
 
 col_left, col_right = st.columns([3, 1])
 with col_left:
-    fig_gauge = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=quality_pct,
-        number={'suffix': " %", 'font': {'color': 'black', 'size': 24}},
-        title={'text': "Qualité Globale", 'font': {'color': 'black', 'size': 20}},
-        gauge={
-            'axis': {'range': [0, 100], 'tickcolor': 'black'},
-            'bar': {'color': "blue"},
-            'bgcolor': "white",  # ✅ Fond clair
-            'borderwidth': 2, 'bordercolor': 'black'
-        }
-    ))
-    fig_gauge.update_layout(
-        paper_bgcolor='white',
-        font=dict(color='black')
-    )
-    st.plotly_chart(fig_gauge, use_container_width=True)
-    st.write(f"Détail pondéré : OK={nb_ok}, Dégradée={nb_deg}, KO={nb_ko}, total={nb_total}")
+    st.plotly_chart(quality_gauge_figure(quality_pct), use_container_width=True)
+    st.write(f"Détail pondéré : OK={nb_ok}, Dégradé={nb_deg}, KO={nb_ko}, total={nb_total}")
 
 with col_right:
     if quality_pct >= 75 and pct_ko < 10:
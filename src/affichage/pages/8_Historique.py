@@ -1,6 +1,15 @@
 # src/affichage/pages/8_Historique.py
+import os
+import sys
+import time
+import numpy as np
 import streamlit as st
 import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.stockage import CHEMIN_HISTORIQUE, StockageMesures
+
 page = st.sidebar.radio("Navigation", ["Affichage dataset", "Apprentissage", "Démonstration", "Bilan", "Autres pages", "Historique"])
 st.markdown("""
 <style>
@@ -71,45 +80,61 @@ st.title("Historique des Démonstrations FH")
 # -------------------------------
 # Initialisation historique
 # -------------------------------
-if "historique_sessions" not in st.session_state:
-    st.session_state["historique_sessions"] = []
+@st.cache_resource
+def ouvrir_stockage() -> StockageMesures:
+    """Historique sur disque partagé par toutes les sessions Streamlit du processus."""
+    return StockageMesures(CHEMIN_HISTORIQUE)
+
+
+stockage = ouvrir_stockage()
+
+# Sessions enregistrées depuis ce navigateur : les seules que "Vider" supprime
+if "sessions_creees" not in st.session_state:
+    st.session_state["sessions_creees"] = []
 
 # Récupération de la session courante depuis démonstration/bilan
 if "df_test" in st.session_state and "historique_etat" in st.session_state:
     if st.button("Sauvegarder cette démonstration dans l'historique"):
-        new_entry = {
-            "data": st.session_state["df_test"].copy(),
-            "etat": st.session_state["historique_etat"].copy(),
-            "file": st.session_state.get("uploaded_file_name", "session"),
-        }
-        st.session_state["historique_sessions"].append(new_entry)
+        df_demo = st.session_state["df_test"]
+        etats_demo = st.session_state["historique_etat"]
+        n = len(etats_demo)
+        debut = time.time()
+
+        def valeurs(col):
+            return df_demo[col].values[:n] if col in df_demo.columns else np.full(n, np.nan)
+
+        # Une mesure par seconde de démonstration, écrites en une transaction
+        session_id = stockage.creer_session(st.session_state.get("uploaded_file_name", "session"), debut)
+        stockage.ajouter_lot(["demo"] * n, valeurs("RSSI"), valeurs("SNR"), valeurs("BER"),
+                             valeurs("Disponibilite"), etats_demo,
+                             timestamp=debut + np.arange(n), session=session_id)
+        stockage.terminer_session(session_id, debut + n)
+        st.session_state["sessions_creees"].append(session_id)
         st.success("Session sauvegardée avec succès")
 
 # -------------------------------
 # Affichage historique
 # -------------------------------
-if len(st.session_state["historique_sessions"]) == 0:
+# Comptes par état et score de chaque session, en une requête
+sessions = stockage.resume_sessions()
+sessions = sessions[sessions["nb"] > 0].reset_index(drop=True)
+if len(sessions) == 0:
     st.info("Aucune session enregistrée. Lancez une démonstration pour remplir l’historique.")
     st.stop()
 
 st.subheader("Résumé des Sessions")
 summary_rows = []
 
-for idx, entry in enumerate(st.session_state["historique_sessions"]):
-    etats = entry["etat"]
-    nb_total = len(etats)
-    nb_ok = etats.count("OK")
-    nb_deg = etats.count("Dégradée")
-    nb_ko = etats.count("KO")
-    quality = (nb_ok*1.0 + nb_deg*0.5) / nb_total * 100
+for idx, session in enumerate(sessions.itertuples()):
+    nb_total = session.nb
     summary_rows.append({
         "Session": idx+1,
-        "Fichier": entry.get("file", f"session_{idx+1}"),
+        "Fichier": session.nom or f"session_{idx+1}",
         "Durée (s)": nb_total,
-        "%OK": f"{nb_ok/nb_total*100:.1f}",
-        "%Dégradée": f"{nb_deg/nb_total*100:.1f}",
-        "%KO": f"{nb_ko/nb_total*100:.1f}",
-        "Qualité Globale": f"{quality:.1f}"
+        "%OK": f"{session.nb_ok/nb_total*100:.1f}",
+        "%Dégradé": f"{session.nb_degrade/nb_total*100:.1f}",
+        "%KO": f"{session.nb_ko/nb_total*100:.1f}",
+        "Qualité Globale": f"{session.score*100:.1f}"
     })
 
 df_summary = pd.DataFrame(summary_rows)
@@ -121,32 +146,31 @@ st.dataframe(df_summary, use_container_width=True)
 st.subheader("Détails d’une Session")
 session_choice = st.selectbox(
     "Choisir une session à analyser :",
-    options=list(range(1, len(st.session_state["historique_sessions"])+1)),
+    options=list(range(1, len(sessions)+1)),
     format_func=lambda x: f"Session {x}"
 )
 
-entry = st.session_state["historique_sessions"][session_choice-1]
-historique_etat = entry["etat"]
+session = sessions.iloc[session_choice-1]
 
 # -------------------------------
 # Statistiques (à la place du graphique)
 # -------------------------------
 st.markdown("### Statistiques de la session sélectionnée")
 
-nb_total = len(historique_etat)
-nb_ok = historique_etat.count("OK")
-nb_deg = historique_etat.count("Dégradée")
-nb_ko = historique_etat.count("KO")
+nb_total = int(session["nb"])
+nb_ok = int(session["nb_ok"])
+nb_deg = int(session["nb_degrade"])
+nb_ko = int(session["nb_ko"])
 
 col1, col2, col3 = st.columns(3)
 col1.metric("OK", f"{nb_ok} ({nb_ok/nb_total*100:.1f}%)")
-col2.metric("Dégradée", f"{nb_deg} ({nb_deg/nb_total*100:.1f}%)")
+col2.metric("Dégradé", f"{nb_deg} ({nb_deg/nb_total*100:.1f}%)")
 col3.metric("KO", f"{nb_ko} ({nb_ko/nb_total*100:.1f}%)")
 
 # Tableau détaillé
 st.markdown("### Tableau récapitulatif")
 stats_df = pd.DataFrame({
-    "État": ["OK", "Dégradée", "KO"],
+    "État": ["OK", "Dégradé", "KO"],
     "Durée (s)": [nb_ok, nb_deg, nb_ko],
     "Pourcentage (%)": [f"{nb_ok/nb_total*100:.1f}", f"{nb_deg/nb_total*100:.1f}", f"{nb_ko/nb_total*100:.1f}"]
 })
@@ -156,8 +180,10 @@ st.table(stats_df)
 # Reset bouton
 # -------------------------------
 st.markdown("---")
-if st.button("Vider l’historique complet"):
-    st.session_state["historique_sessions"] = []
-    st.warning("Historique effacé.")
+if st.button("Vider mes sessions de l’historique"):
+    # Le stockage est partagé par tous les utilisateurs : seules les sessions créées ici sont supprimées
+    stockage.supprimer_sessions(st.session_state["sessions_creees"])
+    st.session_state["sessions_creees"] = []
+    st.warning("Sessions de cette session de navigation effacées.")
 if st.button("Next"):
     st.switch_page("pages/9_Simulation_Manuelle.py")
\ No newline at end of file
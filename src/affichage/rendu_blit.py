@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant la classe RenduBlit pour le tracé incrémental des courbes matplotlib.
+"""
+
+import numpy as np
+from typing import List, Sequence, Tuple
+
+
+def _limites(vmin: float, vmax: float, marge: float) -> Tuple[float, float]:
+    """Élargit [vmin, vmax] d'une marge relative (1 unité si l'intervalle est nul)."""
+    etendue = (vmax - vmin) or max(abs(vmax), 1.0)
+    return vmin - etendue * marge, vmax + etendue * marge
+
+
+class RenduBlit:
+    """
+    Redessine uniquement les courbes d'une figure, par blitting.
+
+    Le fond (axes, graduations, titres) est rendu une fois puis mis en cache ;
+    chaque mise à jour restaure ce fond et ne redessine que les lignes. La
+    figure n'est entièrement redessinée que lorsque les données sortent des
+    limites d'un axe (ou quand le canvas est redimensionné).
+    """
+
+    def __init__(self, canvas, lignes: List, marge_x: float = 0.5, marge_y: float = 0.1):
+        """
+        Initialise le rendu.
+
+        Args:
+            canvas: Le canvas matplotlib (ex. FigureCanvasTkAgg)
+            lignes: Les Line2D à animer, une par axe
+            marge_x: La marge ajoutée à droite quand l'axe des temps est dépassé
+            marge_y: La marge relative ajoutée quand un axe vertical est dépassé
+        """
+        self.canvas = canvas
+        self.lignes = lignes
+        self.marge_x = marge_x
+        self.marge_y = marge_y
+        self.fond = None
+        self.nb_redessins_complets = 0
+        for ligne in lignes:
+            # Exclues du rendu complet : seules draw_artist() les dessine
+            ligne.set_animated(True)
+        self._connexion = canvas.mpl_connect("draw_event", self._sur_dessin)
+
+    def _sur_dessin(self, event) -> None:
+        """Après chaque rendu complet : capture le nouveau fond et y dessine les lignes."""
+        self.fond = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._dessiner_lignes()
+
+    def _dessiner_lignes(self) -> None:
+        for ligne in self.lignes:
+            ligne.axes.draw_artist(ligne)
+
+    def _ajuster_axes(self, series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> bool:
+        """
+        Élargit les axes dont les données sortent des limites.
+
+        Returns:
+            True si au moins un axe a changé (rendu complet nécessaire)
+        """
+        change = False
+        for ligne, (x, y) in zip(self.lignes, series):
+            if len(x) == 0:
+                continue
+            ax = ligne.axes
+            xmin, xmax = float(x.min()), float(x.max())
+            x0, x1 = ax.get_xlim()
+            if xmin < x0 or xmax > x1:
+                ax.set_xlim(xmin, xmax + max(xmax - xmin, 1.0) * self.marge_x)
+                change = True
+            finies = y[np.isfinite(y)]
+            if len(finies) == 0:
+                continue
+            ymin, ymax = float(finies.min()), float(finies.max())
+            y0, y1 = ax.get_ylim()
+            if ymin < y0 or ymax > y1:
+                ax.set_ylim(*_limites(ymin, ymax, self.marge_y))
+                change = True
+        return change
+
+    def mettre_a_jour(self, series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> None:
+        """
+        Met à jour les courbes.
+
+        Args:
+            series: Les couples (abscisses, ordonnées) de chaque courbe, dans l'ordre de self.lignes
+        """
+        series = [(np.asarray(x), np.asarray(y)) for x, y in series]
+        for ligne, (x, y) in zip(self.lignes, series):
+            ligne.set_data(x, y)
+
+        if self._ajuster_axes(series) or self.fond is None:
+            # Rendu complet : draw_event recapture le fond et dessine les lignes
+            self.nb_redessins_complets += 1
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.fond)
+            self._dessiner_lignes()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def deconnecter(self) -> None:
+        """Arrête de suivre les rendus complets du canvas."""
+        self.canvas.mpl_disconnect(self._connexion)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fabrique commune des quatre algorithmes de classification proposés par l'application.
+
+Utilisée par la page Apprentissage, la comparaison parallèle et la recherche
+d'hyperparamètres : un même nom et les mêmes paramètres donnent partout le
+même estimateur. sklearn n'est importé qu'à la création d'un modèle, pour
+que la liste des algorithmes reste disponible sans lui (ex. options de main.py).
+"""
+
+from typing import Any, Dict, Optional
+
+# Noms affichés, dans l'ordre de la page Apprentissage
+ALGORITHMES = ("Random Forest", "KNN", "SVM", "Régression Logistique")
+
+
+def creer_modele(algo: str, params: Optional[Dict[str, Any]] = None, probabilites: bool = True,
+                 normaliser: bool = False):
+    """
+    Construit un estimateur non entraîné.
+
+    Args:
+        algo: Le nom de l'algorithme (un de ALGORITHMES)
+        params: Les hyperparamètres, passés tels quels au constructeur sklearn
+            (valeurs par défaut de sklearn pour les autres)
+        probabilites: True pour un SVM capable de predict_proba ; False évite
+            la calibration interne quand seul predict() sert
+        normaliser: True pour placer un StandardScaler devant les algorithmes
+            sensibles à l'échelle (KNN, SVM, Régression Logistique), si les
+            données ne sont pas déjà normalisées
+
+    Returns:
+        L'estimateur sklearn (un Pipeline si normaliser est True et l'algorithme n'est pas une forêt)
+
+    Raises:
+        ValueError: Si l'algorithme est inconnu
+    """
+    params = dict(params or {})
+    if algo == "Random Forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42, **params)
+
+    if algo == "KNN":
+        from sklearn.neighbors import KNeighborsClassifier
+        modele = KNeighborsClassifier(**params)
+    elif algo == "SVM":
+        from sklearn.svm import SVC
+        if probabilites:
+            params.setdefault("probability", True)
+        modele = SVC(random_state=42, **params)
+    elif algo == "Régression Logistique":
+        from sklearn.linear_model import LogisticRegression
+        params.setdefault("max_iter", 2000)
+        modele = LogisticRegression(random_state=42, **params)
+    else:
+        raise ValueError(f"Algorithme inconnu : {algo}")
+
+    if normaliser:
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), modele)
+    return modele
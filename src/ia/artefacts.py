@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sauvegarde et chargement des artefacts de modèles (modèles, scaler, colonnes)
+sous une forme ouvrable en mémoire mappée.
+"""
+
+import os
+import joblib
+from typing import Any, List, Optional
+from src.ia.foret_compilee import ForetCompilee
+
+# Dossier de la forêt compilée associée à un artefact : "<chemin>.compile"
+SUFFIXE_COMPILE = ".compile"
+
+
+def sauvegarder_artefact(objet: Any, chemin: str, features: Optional[List[str]] = None) -> None:
+    """
+    Sauvegarde un artefact avec joblib, sans compression.
+
+    Les tableaux NumPy sont alors stockés bruts dans le fichier et peuvent être
+    mappés en mémoire au chargement. Une forêt aléatoire est en plus exportée en
+    tableaux plats (ForetCompilee), car sklearn recopie les nœuds de ses arbres
+    dans son propre tas au dépicklage.
+
+    Args:
+        objet: L'objet à sauvegarder (modèle, scaler, liste de colonnes...)
+        chemin: Le fichier de destination
+        features: L'ordre des caractéristiques pour la forêt compilée
+            (par défaut, celui vu à l'entraînement)
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+    # Fichier temporaire renommé : les lecteurs (et leurs mmap) ne voient jamais d'écriture partielle
+    joblib.dump(objet, chemin + ".tmp")
+    os.replace(chemin + ".tmp", chemin)
+    if isinstance(objet, (RandomForestClassifier, ExtraTreesClassifier)):
+        features = features or list(getattr(objet, "feature_names_in_", range(objet.n_features_in_)))
+        ForetCompilee.depuis_sklearn(objet, features).sauvegarder(chemin + SUFFIXE_COMPILE)
+
+
+def compile_a_jour(chemin: str) -> bool:
+    """
+    Indique si la forêt compilée d'un artefact existe et n'est pas plus ancienne que lui.
+
+    Args:
+        chemin: Le fichier de l'artefact (il peut ne pas exister)
+
+    Returns:
+        True si "<chemin>.compile" est à utiliser à la place du fichier
+    """
+    meta = os.path.join(chemin + SUFFIXE_COMPILE, "meta.json")
+    return os.path.exists(meta) and (not os.path.exists(chemin) or os.path.getmtime(meta) >= os.path.getmtime(chemin))
+
+
+def charger_artefact(chemin: str, mmap_mode: Optional[str] = "r") -> Any:
+    """
+    Charge un artefact en mémoire mappée.
+
+    Si une forêt compilée à jour accompagne le fichier, elle est chargée à sa
+    place : ses tableaux sont partagés via le cache de pages entre tous les
+    processus qui ouvrent le même modèle.
+
+    Args:
+        chemin: Le fichier de l'artefact
+        mmap_mode: Mode de mmap des tableaux ("r" par défaut, None pour tout lire)
+
+    Returns:
+        L'objet chargé (ou la ForetCompilee équivalente)
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+    """
+    if compile_a_jour(chemin):
+        return ForetCompilee.charger(chemin + SUFFIXE_COMPILE, mmap_mode=mmap_mode)
+    return joblib.load(chemin, mmap_mode=mmap_mode)
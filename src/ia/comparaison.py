@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Comparaison de plusieurs algorithmes entraînés en parallèle sur les mêmes données normalisées.
+
+Les matrices sont écrites une seule fois sur disque (joblib, sans compression)
+puis ouvertes en mémoire mappée par chaque processus : elles ne sont ni
+copiées ni sérialisées par candidat. Chaque candidat tourne dans un processus
+neuf, qui l'entraîne, l'évalue, sauvegarde le modèle et ne renvoie que ses
+mesures ; le pic de mémoire du processus est donc celui du candidat.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+
+from src.ia.algorithmes import creer_modele
+from src.ia.artefacts import sauvegarder_artefact
+
+try:
+    import resource
+except ImportError:  # Windows : pic mesuré par tracemalloc
+    resource = None
+
+
+def _pic_memoire() -> int:
+    """Pic de mémoire résidente du processus, en octets (ru_maxrss : Ko sous Linux, octets sous macOS)."""
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic if sys.platform == "darwin" else pic * 1024
+
+
+def algorithmes_par_defaut() -> Dict[str, Any]:
+    """
+    Renvoie les quatre algorithmes comparés par la page Apprentissage.
+
+    Returns:
+        Un dict nom -> estimateur sklearn non entraîné
+    """
+    return {
+        "Random Forest": creer_modele("Random Forest"),
+        "KNN": creer_modele("KNN"),
+        "SVM": creer_modele("SVM"),
+        "LogReg": creer_modele("Régression Logistique"),
+    }
+
+
+def _entrainer_candidat(tache) -> Dict[str, Any]:
+    """
+    Entraîne et évalue un candidat (exécuté dans un processus du pool).
+
+    Args:
+        tache: Tuple (nom, estimateur, fichier des données, dossier des modèles, colonnes)
+
+    Returns:
+        Les mesures du candidat (voir comparer_algorithmes)
+    """
+    nom, estimateur, chemin_donnees, dossier_modeles, colonnes = tache
+    donnees = joblib.load(chemin_donnees, mmap_mode="r")
+
+    if resource is None:
+        tracemalloc.start()
+        base = 0
+    else:
+        base = _pic_memoire()
+    debut = time.perf_counter()
+    estimateur.fit(donnees["X_train"], donnees["y_train"])
+    duree_entrainement = time.perf_counter() - debut
+    y_pred = estimateur.predict(donnees["X_test"])
+    duree = time.perf_counter() - debut
+    if resource is None:
+        pic = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        pic = _pic_memoire()
+
+    chemin = None
+    if dossier_modeles is not None:
+        chemin = os.path.join(dossier_modeles, f"model_{nom.replace(' ', '_')}.joblib")
+        sauvegarder_artefact(estimateur, chemin, features=colonnes)
+
+    return {
+        "nom": nom,
+        "precision": accuracy_score(donnees["y_test"], y_pred),
+        "f1_macro": f1_score(donnees["y_test"], y_pred, average="macro"),
+        "duree_entrainement": duree_entrainement,
+        "duree": duree,
+        "memoire_pic": pic,
+        "memoire_ajoutee": max(pic - base, 0),
+        "chemin": chemin,
+    }
+
+
+def comparer_algorithmes(X_train, y_train, X_test, y_test, candidats: Optional[Dict[str, Any]] = None,
+                         workers: Optional[int] = None, dossier_modeles: Optional[str] = None,
+                         colonnes: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Entraîne les candidats en parallèle et produit chaque résultat dès qu'il est prêt.
+
+    La comparaison dure le temps du candidat le plus lent, et non la somme
+    des temps d'entraînement.
+
+    Args:
+        X_train, X_test: Les caractéristiques normalisées (DataFrame ou tableau)
+        y_train, y_test: Les étiquettes
+        candidats: Un dict nom -> estimateur (algorithmes_par_defaut() si None)
+        workers: Le nombre de processus (un par candidat, dans la limite des cœurs, si None)
+        dossier_modeles: Le dossier où sauvegarder chaque modèle entraîné (aucune sauvegarde si None)
+        colonnes: Les noms des caractéristiques, pour les artefacts sauvegardés
+
+    Returns:
+        Un itérateur de dicts, dans l'ordre de fin d'entraînement : nom, precision,
+        f1_macro, duree_entrainement et duree (s, entraînement + prédiction),
+        memoire_pic (pic de mémoire résidente du processus, en octets),
+        memoire_ajoutee (part de ce pic due à l'entraînement) et chemin
+    """
+    candidats = candidats if candidats is not None else algorithmes_par_defaut()
+    workers = workers or min(len(candidats), os.cpu_count() or 1)
+    if dossier_modeles is not None:
+        os.makedirs(dossier_modeles, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="fh_comparaison_") as dossier:
+        chemin_donnees = os.path.join(dossier, "donnees.joblib")
+        # Tableaux contigus non compressés : mappables tels quels par chaque processus
+        joblib.dump({
+            "X_train": np.ascontiguousarray(X_train, dtype=np.float64),
+            "y_train": np.asarray(y_train, dtype=str),
+            "X_test": np.ascontiguousarray(X_test, dtype=np.float64),
+            "y_test": np.asarray(y_test, dtype=str),
+        }, chemin_donnees)
+
+        taches = [(nom, estimateur, chemin_donnees, dossier_modeles, colonnes)
+                  for nom, estimateur in candidats.items()]
+        # Un processus neuf par candidat : pics de mémoire indépendants
+        with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+            futures = [pool.submit(_entrainer_candidat, tache) for tache in taches]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Consommateur interrompu : les candidats pas encore démarrés sont abandonnés
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Courbes d'apprentissage : précision et temps d'entraînement selon la taille du jeu d'entraînement.
+
+Sert à savoir combien d'échantillons simulés un réentraînement demande
+réellement : au-delà de taille_suffisante(), la précision de validation
+ne progresse plus.
+"""
+
+import inspect
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, learning_curve, train_test_split
+
+# Tailles d'entraînement évaluées, en fraction du jeu d'entraînement de chaque pli
+TAILLES_PAR_DEFAUT = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0)
+
+
+def sans_calibration(estimateur):
+    """
+    Clone un estimateur en désactivant la calibration des probabilités (SVC(probability=True)).
+
+    Quand seul predict() sert, la calibration de Platt ne fait qu'ajouter une
+    validation croisée interne à chaque ajustement. Le paramètre reprend la
+    valeur par défaut de son constructeur, y compris dans un Pipeline.
+
+    Args:
+        estimateur: L'estimateur sklearn (non modifié)
+
+    Returns:
+        Le clone, sans calibration
+    """
+    estimateur = clone(estimateur)
+    params = estimateur.get_params()
+    for cle, valeur in params.items():
+        prefixe, _, nom = cle.rpartition("__")
+        if nom == "probability" and valeur is True:
+            proprietaire = params[prefixe] if prefixe else estimateur
+            defaut = inspect.signature(type(proprietaire)).parameters["probability"].default
+            estimateur.set_params(**{cle: defaut})
+    return estimateur
+
+
+def calculer_courbe(estimateur, X, y, tailles: Sequence[float] = TAILLES_PAR_DEFAUT, cv: int = 5,
+                    n_jobs: int = -1, max_echantillons: Optional[int] = None,
+                    random_state: int = 42) -> Dict[str, Any]:
+    """
+    Calcule la courbe d'apprentissage d'un estimateur par validation croisée stratifiée.
+
+    Chaque (taille, pli) est un entraînement indépendant : ils sont répartis
+    sur n_jobs cœurs. Seule la précision est mesurée : la calibration des
+    probabilités est désactivée (sans_calibration).
+
+    Args:
+        estimateur: L'estimateur sklearn (non modifié, cloné sans calibration)
+        X: Les caractéristiques (normalisées)
+        y: Les étiquettes
+        tailles: Les tailles d'entraînement, en fractions (ou en nombres d'échantillons si entiers)
+        cv: Le nombre de plis
+        n_jobs: Le nombre de cœurs utilisés (-1 pour tous)
+        max_echantillons: Sous-échantillon stratifié au-delà de ce nombre de lignes (aucun si None)
+        random_state: La graine des plis et du sous-échantillon
+
+    Returns:
+        Un dict de tableaux : tailles (nombres d'échantillons), score_train et score_val
+        (moyenne et écart type de la précision sur les plis, suffixes _moyen / _std),
+        duree_fit_moyenne, duree_fit_std et duree_score_moyenne (secondes), et n_total
+    """
+    y = np.asarray(y)
+    if max_echantillons is not None and len(y) > max_echantillons:
+        X, _, y, _ = train_test_split(X, y, train_size=max_echantillons, stratify=y, random_state=random_state)
+
+    plis = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    tailles, score_train, score_val, duree_fit, duree_score = learning_curve(
+        sans_calibration(estimateur), X, y, train_sizes=np.asarray(tailles), cv=plis, scoring="accuracy",
+        n_jobs=n_jobs, return_times=True
+    )
+    return {
+        "tailles": tailles,
+        "score_train_moyen": score_train.mean(axis=1),
+        "score_train_std": score_train.std(axis=1),
+        "score_val_moyen": score_val.mean(axis=1),
+        "score_val_std": score_val.std(axis=1),
+        "duree_fit_moyenne": duree_fit.mean(axis=1),
+        "duree_fit_std": duree_fit.std(axis=1),
+        "duree_score_moyenne": duree_score.mean(axis=1),
+        "n_total": len(y),
+    }
+
+
+def taille_suffisante(courbe: Dict[str, Any], tolerance: float = 0.01) -> int:
+    """
+    Renvoie la plus petite taille d'entraînement qui atteint presque la meilleure précision.
+
+    Args:
+        courbe: Le résultat de calculer_courbe()
+        tolerance: L'écart de précision de validation accepté avec le meilleur score
+
+    Returns:
+        Le nombre d'échantillons d'entraînement
+    """
+    scores = courbe["score_val_moyen"]
+    atteint = np.flatnonzero(scores >= scores.max() - tolerance)
+    return int(courbe["tailles"][atteint[0]])
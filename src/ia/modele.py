@@ -7,11 +7,21 @@ Module contenant la classe ModeleIA pour la classification de l'état des liaiso
 
 import pandas as pd
 import numpy as np
-import pickle
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
-from typing import Dict, List, Tuple, Any
+import os
+import joblib
+from typing import Dict, List, Tuple, Any, Iterable, Iterator
+from src.ia.artefacts import SUFFIXE_COMPILE, compile_a_jour
+from src.ia.foret_compilee import ForetCompilee
+
+# Colonnes du dataset généré (DatasetGenerator) et leur nom côté modèle
+COLONNES_DATASET = {
+    "RSSI_dBm": "rssi",
+    "SNR_dB": "snr",
+    "BER": "ber",
+    "Availability_percent": "disponibilite",
+    "Status": "etat",
+    "Etat": "etat",
+}
 
 
 class ModeleIA:
@@ -22,10 +32,14 @@ class ModeleIA:
 
     def __init__(self):
         """Initialise le modèle d'IA."""
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        # Forêt aléatoire créée au premier entraînement : sklearn n'est importé
+        # que pour entraîner, évaluer ou charger un modèle sklearn, jamais pour
+        # prédire avec une forêt compilée
+        self.model = None
         self.trained = False
         self.features = ["rssi", "snr", "ber", "disponibilite"]
         self.target = "etat"
+        self.compilee = None
 
     def entrainer(self, X: pd.DataFrame, y: pd.Series) -> None:
         """
@@ -35,8 +49,12 @@ class ModeleIA:
             X: Les caractéristiques d'entraînement
             y: Les étiquettes d'entraînement
         """
+        if self.model is None:
+            from sklearn.ensemble import RandomForestClassifier
+            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.model.fit(X, y)
         self.trained = True
+        self.compilee = None
 
     def predire(self, X: pd.DataFrame) -> np.ndarray:
         """
@@ -55,6 +73,125 @@ class ModeleIA:
             raise ValueError("Le modèle n'a pas encore été entraîné")
         return self.model.predict(X)
 
+    def _matrice(self, X) -> np.ndarray:
+        """
+        Convertit un DataFrame ou un tableau en matrice float32 contiguë (dtype interne des arbres).
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features].to_numpy(dtype=np.float32)
+        return np.ascontiguousarray(np.atleast_2d(X), dtype=np.float32)
+
+    def _probabilites(self, X: np.ndarray) -> np.ndarray:
+        """
+        Calcule les probabilités d'un bloc déjà converti.
+        """
+        if hasattr(self.model, "feature_names_in_"):
+            # Évite l'avertissement sklearn sur les noms de colonnes, sans copie
+            X = pd.DataFrame(X, columns=self.model.feature_names_in_, copy=False)
+        return self.model.predict_proba(X)
+
+    def predire_lot(self, X, taille_bloc: int = 200_000, n_jobs: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prédit l'état d'un grand nombre de liaisons en un appel.
+
+        Les lignes sont traitées par blocs de taille fixe ; les arbres de la forêt
+        sont répartis sur n_jobs cœurs. L'étiquette est l'argmax des probabilités,
+        comme RandomForestClassifier.predict.
+
+        Args:
+            X: DataFrame (colonnes self.features) ou tableau (n, 4) dans l'ordre de self.features
+            taille_bloc: Le nombre de lignes évaluées à la fois
+            n_jobs: Le nombre de cœurs utilisés (-1 pour tous)
+
+        Returns:
+            Les étiquettes prédites et la matrice des probabilités (n, nb_classes)
+
+        Raises:
+            ValueError: Si le modèle n'a pas encore été entraîné
+        """
+        if not self.trained:
+            raise ValueError("Le modèle n'a pas encore été entraîné")
+        X = self._matrice(X)
+        resultats = list(self.predire_stream(
+            (X[debut:debut + taille_bloc] for debut in range(0, len(X), taille_bloc)), n_jobs=n_jobs
+        ))
+        if not resultats:
+            return np.empty(0, dtype=object), np.empty((0, len(self.model.classes_)))
+        etiquettes, probas = zip(*resultats)
+        return np.concatenate(etiquettes), np.concatenate(probas)
+
+    def predire_stream(self, blocs: Iterable, n_jobs: int = -1) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Prédit l'état bloc par bloc, pour des données qui ne tiennent pas en mémoire.
+
+        Le nombre de cœurs passe par joblib.parallel_config, le temps de chaque
+        bloc : l'estimateur, partagé entre les threads Streamlit via le
+        registre, n'est jamais modifié (il doit garder n_jobs=None, la valeur
+        sklearn par défaut, pour suivre cette configuration).
+
+        Args:
+            blocs: Un itérable de DataFrames ou de tableaux (n, 4)
+            n_jobs: Le nombre de cœurs utilisés (-1 pour tous)
+
+        Returns:
+            Un itérateur de couples (étiquettes, probabilités), un par bloc
+
+        Raises:
+            ValueError: Si le modèle n'a pas encore été entraîné
+        """
+        if not self.trained:
+            raise ValueError("Le modèle n'a pas encore été entraîné")
+
+        for bloc in blocs:
+            with joblib.parallel_config(n_jobs=n_jobs):
+                probas = self._probabilites(self._matrice(bloc))
+            yield self.model.classes_.take(probas.argmax(axis=1)), probas
+
+    def predire_rapide(self, rssi: float, snr: float, ber: float, disponibilite: float) -> str:
+        """
+        Prédit l'état d'une seule mesure avec la forêt compilée.
+
+        Même étiquette que predire(), sans DataFrame ni validation sklearn :
+        destiné aux boucles de supervision en temps réel, qui appellent
+        preparer_rapide() avant leur première mesure. Le coût croît avec la
+        taille de la forêt : voir ForetCompilee.predire_un.
+
+        Args:
+            rssi: Le RSSI en dBm
+            snr: Le SNR en dB
+            ber: Le taux d'erreur binaire
+            disponibilite: La disponibilité en %
+
+        Returns:
+            L'état prédit
+
+        Raises:
+            ValueError: Si le modèle n'a pas encore été entraîné
+        """
+        if self.compilee is None:
+            self.preparer_rapide()
+            if self.compilee is None:
+                # Modèle hors forêt : chemin sklearn classique
+                return self.model.predict(self._matrice([rssi, snr, ber, disponibilite]))[0]
+        return self.compilee.predire_un(rssi, snr, ber, disponibilite)
+
+    def preparer_rapide(self) -> None:
+        """
+        Compile la forêt et construit l'évaluateur de predire_rapide().
+
+        Sans effet pour un modèle hors forêt, qui garde le chemin sklearn.
+
+        Raises:
+            ValueError: Si le modèle n'a pas encore été entraîné
+        """
+        if not self.trained:
+            raise ValueError("Le modèle n'a pas encore été entraîné")
+        if self.compilee is None:
+            if not hasattr(self.model, "estimators_"):
+                return
+            self.compilee = ForetCompilee.depuis_sklearn(self.model, self.features)
+        self.compilee.preparer()
+
     def evaluer(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
         """
         Évalue les performances du modèle.
@@ -71,9 +208,32 @@ class ModeleIA:
         """
         if not self.trained:
             raise ValueError("Le modèle n'a pas encore été entraîné")
+        from sklearn.metrics import classification_report
+
         predictions = self.model.predict(X)
         return classification_report(y, predictions, output_dict=True)
 
+    def preparer_dataset(self, dataset: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Extrait les caractéristiques et les étiquettes d'un dataset.
+
+        Les noms de colonnes du générateur (RSSI_dBm, Status...) sont ramenés
+        à ceux du modèle (rssi, etat...).
+
+        Args:
+            dataset: Le dataset (colonnes du modèle ou du générateur)
+
+        Returns:
+            Les caractéristiques (colonnes self.features) et les étiquettes
+        """
+        renommage = {}
+        for col, nom in COLONNES_DATASET.items():
+            if col in dataset.columns and nom not in dataset.columns and nom not in renommage.values():
+                renommage[col] = nom
+        if renommage:
+            dataset = dataset.rename(columns=renommage)
+        return dataset[self.features], dataset[self.target].astype(str)
+
     def entrainer_et_evaluer(self, dataset: pd.DataFrame) -> Dict[str, Any]:
         """
         Entraîne et évalue le modèle sur le dataset fourni.
@@ -84,9 +244,10 @@ class ModeleIA:
         Returns:
             Un rapport de classification
         """
+        from sklearn.model_selection import train_test_split
+
         # Préparation des données
-        X = dataset[self.features]
-        y = dataset[self.target]
+        X, y = self.preparer_dataset(dataset)
 
         # Division train/test
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -114,6 +275,13 @@ class ModeleIA:
         """
         Sauvegarde le modèle entraîné dans un fichier.
 
+        Le fichier est écrit par joblib sans compression. Pour une forêt, seul
+        l'export de exporter_compile() est réellement partagé en mémoire
+        mappée : au dépicklage, sklearn recopie les nœuds des arbres dans la
+        mémoire privée du processus. L'écriture passe par un fichier
+        temporaire renommé, pour que les lecteurs ne voient jamais un fichier
+        à moitié écrit.
+
         Args:
             chemin_fichier: Le chemin du fichier où sauvegarder le modèle
 
@@ -123,19 +291,64 @@ class ModeleIA:
         if not self.trained:
             raise ValueError("Le modèle n'a pas encore été entraîné")
 
-        with open(chemin_fichier, 'wb') as f:
-            pickle.dump(self.model, f)
+        temporaire = chemin_fichier + ".tmp"
+        joblib.dump(self.model, temporaire)
+        os.replace(temporaire, chemin_fichier)
 
-    def charger(self, chemin_fichier: str) -> None:
+    def exporter_compile(self, dossier: str) -> None:
+        """
+        Exporte la forêt entraînée en tableaux plats (.npy), sans objet sklearn.
+
+        Args:
+            dossier: Le dossier où écrire l'export
+
+        Raises:
+            ValueError: Si le modèle n'a pas encore été entraîné
+        """
+        if not self.trained:
+            raise ValueError("Le modèle n'a pas encore été entraîné")
+        if self.compilee is None:
+            self.compilee = ForetCompilee.depuis_sklearn(self.model, self.features)
+        self.compilee.sauvegarder(dossier)
+
+    def charger_compile(self, dossier: str, mmap_mode: str = "r") -> None:
+        """
+        Charge une forêt exportée par exporter_compile(), en mémoire mappée.
+
+        predire, predire_lot et predire_rapide fonctionnent ensuite sans sklearn.
+
+        Args:
+            dossier: Le dossier de l'export
+            mmap_mode: Mode de mmap des tableaux (None pour tout lire en mémoire)
+
+        Raises:
+            FileNotFoundError: Si le dossier ne contient pas d'export
+        """
+        self.compilee = ForetCompilee.charger(dossier, mmap_mode=mmap_mode)
+        self.model = self.compilee
+        self.trained = True
+
+    def charger(self, chemin_fichier: str, mmap_mode: str = "r") -> None:
         """
         Charge un modèle entraîné depuis un fichier.
 
+        Si la forêt compilée "<chemin>.compile" existe et est à jour, elle est
+        chargée à la place (charger_compile) : ses tableaux sont mappés en
+        mémoire et partagés par tous les processus qui ouvrent le modèle.
+        Sinon le fichier joblib est lu ; pour une forêt sklearn, mmap_mode ne
+        partage alors rien, les nœuds étant recopiés au dépicklage. Accepte
+        aussi les anciens fichiers écrits par pickle.
+
         Args:
             chemin_fichier: Le chemin du fichier contenant le modèle
+            mmap_mode: Mode de mmap des tableaux (None pour tout lire en mémoire)
 
         Raises:
-            FileNotFoundError: Si le fichier n'existe pas
+            FileNotFoundError: Si ni le fichier ni sa forêt compilée n'existent
         """
-        with open(chemin_fichier, 'rb') as f:
-            self.model = pickle.load(f)
-        self.trained = True
\ No newline at end of file
+        if compile_a_jour(chemin_fichier):
+            self.charger_compile(chemin_fichier + SUFFIXE_COMPILE, mmap_mode=mmap_mode)
+            return
+        self.model = joblib.load(chemin_fichier, mmap_mode=mmap_mode)
+        self.trained = True
+        self.compilee = None
\ No newline at end of file
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Préparation d'un dataset pour l'entraînement : nettoyage, encodage, séparation et normalisation.
+
+Le résultat ne dépend que du contenu du dataset ; empreinte() en donne une
+clé stable, qui sert aux pages Streamlit à mettre en cache les étapes
+coûteuses (lecture, prétraitement, entraînement, figures).
+"""
+
+import hashlib
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+
+def empreinte(donnees) -> str:
+    """
+    Calcule l'empreinte du contenu d'un dataset.
+
+    Args:
+        donnees: Des octets (ou un buffer, ex. fichier importé .getbuffer()) ou un DataFrame
+
+    Returns:
+        Une empreinte hexadécimale (BLAKE2b, 128 bits)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(donnees, pd.DataFrame):
+        h.update(repr([(str(col), str(dtype)) for col, dtype in donnees.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(donnees, index=True).to_numpy().tobytes())
+    else:
+        h.update(memoryview(donnees))
+    return h.hexdigest()
+
+
+def preparer_donnees(df: pd.DataFrame, cible: str = "Etat", test_size: float = 0.2,
+                     random_state: int = 42) -> Dict[str, Any]:
+    """
+    Nettoie, encode, sépare (stratifié) et normalise un dataset.
+
+    Args:
+        df: Le dataset, avec la colonne cible
+        cible: La colonne à prédire
+        test_size: La part du jeu de test
+        random_state: La graine de la séparation
+
+    Returns:
+        Un dict avec X_train, X_test, y_train, y_test (non normalisés),
+        X_train_scaled, X_test_scaled, le scaler ajusté et les colonnes
+    """
+    df = df.drop_duplicates()
+
+    X = df.drop(columns=[cible])
+    y = df[cible].astype(str)
+    cat_cols = X.select_dtypes(include=["object", "category"]).columns.tolist()
+    if cat_cols:
+        # Catégories observées seulement : un Parquet typé déclare tout le référentiel
+        for col in X.select_dtypes(include=["category"]).columns:
+            X[col] = X[col].cat.remove_unused_categories()
+        X = pd.get_dummies(X, columns=cat_cols, drop_first=True)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=random_state
+    )
+    scaler = StandardScaler()
+    X_train_scaled = pd.DataFrame(scaler.fit_transform(X_train), columns=X_train.columns, index=X_train.index)
+    X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns, index=X_test.index)
+
+    return {
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_train": y_train,
+        "y_test": y_test,
+        "X_train_scaled": X_train_scaled,
+        "X_test_scaled": X_test_scaled,
+        "scaler": scaler,
+        "colonnes": list(X_train.columns),
+    }
+
+
+def vers_csv(X: pd.DataFrame, y: pd.Series) -> bytes:
+    """
+    Exporte un jeu (caractéristiques et cible alignées) en CSV.
+
+    Args:
+        X: Les caractéristiques
+        y: La cible, de même index que X
+
+    Returns:
+        Le contenu du fichier CSV
+    """
+    return X.assign(**{y.name or "Etat": np.asarray(y)}).to_csv(index=False).encode("utf-8")
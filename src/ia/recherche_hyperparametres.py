@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Recherche d'hyperparamètres par élimination successive (successive halving), dans un budget de temps CPU.
+
+Des configurations tirées au hasard sont évaluées par validation croisée
+sur un petit échantillon ; seul le meilleur tiers passe au tour suivant,
+sur trois fois plus de données. Chaque (configuration, taille, pli) est un
+entraînement indépendant, réparti sur un pool de processus.
+
+Les résultats de chaque pli sont mis en cache sur disque (joblib.Memory) :
+une recherche interrompue, relancée sur le même dataset, reprend sans
+refaire les plis déjà calculés. Les plis repris du cache ne consomment
+pas de budget.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform, randint
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+
+from src.ia.algorithmes import creer_modele
+from src.ia.artefacts import SUFFIXE_COMPILE
+from src.ia.modele import ModeleIA
+from src.ia.preparation import empreinte
+
+DOSSIER_CACHE = ".cache_recherche"
+
+# Les quatre algorithmes de la page Apprentissage et leur espace de recherche
+ESPACES_RECHERCHE = {
+    "Random Forest": {
+        "n_estimators": randint(10, 301),
+        "max_depth": [None, 8, 12, 16, 24],
+        "min_samples_leaf": randint(1, 11),
+        "max_features": ["sqrt", "log2", None],
+    },
+    "KNN": {
+        "n_neighbors": randint(1, 31),
+        "weights": ["uniform", "distance"],
+        "p": [1, 2],
+    },
+    "SVM": {
+        "kernel": ["rbf", "linear", "poly"],
+        "C": loguniform(1e-2, 1e2),
+        "gamma": ["scale", "auto"],
+    },
+    "Régression Logistique": {
+        "C": loguniform(1e-3, 1e2),
+    },
+}
+
+# Le modèle exporté calibre ses probabilités (SVC(probability=True)) : validation
+# croisée interne à 5 plis, donc environ 5 entraînements de plus que les plis évalués
+SURCOUT_CALIBRATION = {"SVM": 5.0}
+
+# Croissance minimale supposée du coût avec la taille (SVM à noyau : entre linéaire et
+# quadratique ; les autres : linéaire). Sur de petits échantillons, les frais fixes
+# masquent la vraie croissance : l'exposant mesuré n'est jamais pris plus bas.
+EXPOSANT_COUT = {"SVM": 1.5}
+
+
+def _empreinte_donnees(X: np.ndarray, y: np.ndarray) -> str:
+    """
+    Identifie le jeu (X, y) pour le cache des plis.
+
+    La forme et le type de X sont inclus, et les étiquettes sont hachées une à
+    une (pas de concaténation ambiguë : ["OK", "KO"] ≠ ["OKK", "O"]).
+    """
+    X = np.ascontiguousarray(X)
+    entete = np.frombuffer(repr((X.shape, X.dtype.str, len(y))).encode(), np.uint8)
+    etiquettes = pd.util.hash_array(np.asarray(y, dtype=object)).view(np.uint8)
+    return empreinte(np.concatenate([entete, X.reshape(-1).view(np.uint8), etiquettes]))
+
+
+def _evaluer_pli(empreinte_donnees: str, algo: str, params: Dict[str, Any], ressource: int,
+                 pli: int, cv: int, graine: int, chemin_donnees: str) -> Dict[str, float]:
+    """
+    Entraîne une configuration sur un pli d'un échantillon de `ressource` lignes.
+
+    Le résultat ne dépend que des arguments hors chemin_donnees (le contenu
+    est identifié par empreinte_donnees) : c'est la clé du cache disque.
+
+    Returns:
+        Un dict : score (précision sur le pli de validation), cpu (secondes, pli
+        complet) et cpu_fit (secondes, entraînement seul)
+    """
+    # Construit avant la mesure : l'import de sklearn par un processus neuf n'est pas du calcul
+    estimateur = creer_modele(algo, params, probabilites=False, normaliser=True)
+    debut = time.process_time()
+    donnees = joblib.load(chemin_donnees, mmap_mode="r")
+    X, y = donnees["X"], donnees["y"]
+    if ressource < len(y):
+        indices, _ = train_test_split(np.arange(len(y)), train_size=ressource, stratify=y, random_state=graine)
+        X, y = X[np.sort(indices)], y[np.sort(indices)]
+    plis = StratifiedKFold(n_splits=cv, shuffle=True, random_state=graine)
+    entrainement, validation = list(plis.split(X, y))[pli]
+
+    debut_fit = time.process_time()
+    estimateur.fit(X[entrainement], y[entrainement])
+    cpu_fit = time.process_time() - debut_fit
+    score = float(np.mean(estimateur.predict(X[validation]) == y[validation]))
+    return {"score": score, "cpu": time.process_time() - debut, "cpu_fit": cpu_fit}
+
+
+def _evaluateur(dossier_cache: str):
+    """Renvoie _evaluer_pli mis en cache dans dossier_cache."""
+    return joblib.Memory(dossier_cache, verbose=0).cache(_evaluer_pli, ignore=["chemin_donnees"])
+
+
+def _tache_pli(tache) -> Tuple[int, int, Dict[str, float], bool]:
+    """
+    Exécute un pli via le cache disque (exécuté dans un processus du pool).
+
+    Args:
+        tache: Tuple (dossier du cache, indice du candidat, arguments de _evaluer_pli)
+
+    Returns:
+        (indice du candidat, pli, résultat, True si repris du cache)
+    """
+    dossier_cache, indice, arguments = tache
+    evaluer = _evaluateur(dossier_cache)
+    deja_calcule = evaluer.check_call_in_cache(**arguments)
+    return indice, arguments["pli"], evaluer(**arguments), deja_calcule
+
+
+def _extrapoler(mesures: Dict[int, List[float]], taille: float, exposant: float = 1.0) -> float:
+    """
+    Extrapole un temps CPU mesuré à une autre taille d'échantillon, selon une loi de puissance.
+
+    L'exposant vient des deux plus grandes tailles mesurées, borné entre
+    `exposant` et 2 (quadratique, comme un SVM à noyau) ; avec une seule
+    taille mesurée, il vaut `exposant`.
+
+    Args:
+        mesures: Taille -> temps CPU mesurés (secondes)
+        taille: La taille visée
+        exposant: L'exposant minimal (1 : linéaire, comme une forêt)
+
+    Returns:
+        Le temps CPU estimé, en secondes
+    """
+    tailles = sorted(mesures)
+    grande = tailles[-1]
+    cout = float(np.mean(mesures[grande]))
+    if len(tailles) > 1:
+        petite = tailles[-2]
+        cout_petite = float(np.mean(mesures[petite]))
+        if cout > 0 and cout_petite > 0:
+            exposant = float(np.clip(np.log(cout / cout_petite) / np.log(grande / petite), exposant, 2.0))
+    return cout * (taille / grande) ** exposant
+
+
+def _executer(pool: ProcessPoolExecutor, taches: List, cpu_disponible: float) -> Tuple[List, float, bool]:
+    """
+    Exécute des plis sur le pool, en abandonnant ceux non démarrés dès que cpu_disponible est dépassé.
+
+    Les plis déjà en cours au moment de l'abandon vont à leur terme : leur
+    temps CPU est compté avec les autres.
+
+    Args:
+        pool: Le pool de processus
+        taches: Les tâches de _tache_pli
+        cpu_disponible: Le temps CPU, en secondes, au-delà duquel abandonner
+
+    Returns:
+        (liste des (indice, pli, résultat, repris du cache), CPU consommé, True si abandon)
+    """
+    futures = [pool.submit(_tache_pli, tache) for tache in taches]
+    resultats = []
+    cpu = 0.0
+    abandon = False
+    for future in as_completed(futures):
+        if future.cancelled():
+            continue
+        indice, pli, resultat, deja_calcule = future.result()
+        resultats.append((indice, pli, resultat, deja_calcule))
+        if not deja_calcule:
+            cpu += resultat["cpu"]
+        if cpu > cpu_disponible and not abandon:
+            abandon = True
+            for autre in futures:
+                autre.cancel()
+    return resultats, cpu, abandon
+
+
+def rechercher(X, y, algorithmes: Optional[Sequence[str]] = None, budget_cpu: float = 600.0,
+               n_candidats: int = 24, facteur: int = 3, ressource_min: Optional[int] = None,
+               cv: int = 3, workers: Optional[int] = None, dossier_cache: str = DOSSIER_CACHE,
+               graine: int = 42, verbeux: bool = True) -> Dict[str, Any]:
+    """
+    Cherche la meilleure configuration par élimination successive.
+
+    Tour k : les candidats restants sont évalués sur ressource_min * facteur**k
+    lignes ; le meilleur 1/facteur passe au tour suivant. Le budget couvre
+    tous les plis calculés (les plis repris du cache ne coûtent rien) et
+    l'entraînement final d'exporter_meilleur() :
+
+    - un pli de calibrage par algorithme, sur l'échantillon du premier tour,
+      mesure le coût de chacun ; chaque tour complète ces mesures ;
+    - un tour n'est lancé que si son coût estimé (extrapolé aux tailles
+      suivantes par _extrapoler) et celui de l'entraînement final tiennent
+      dans le budget restant ; au premier tour, seuls les candidats qui y
+      tiennent sont gardés, dans un ordre qui alterne les algorithmes ;
+    - si le budget est dépassé en cours de tour, les plis non démarrés sont
+      abandonnés ; les plis en cours se terminent et sont comptés. Le
+      dépassement est donc borné par la durée des plis en cours.
+
+    Le gagnant est le meilleur candidat du dernier tour terminé dont
+    l'entraînement final tient dans le reste du budget (à défaut, d'un tour
+    précédent, ou le moins coûteux à entraîner). Si le budget ne permet pas
+    un tour complet, les candidats sont jugés sur leur premier pli.
+
+    Args:
+        X: Les caractéristiques (non normalisées : les pipelines s'en chargent)
+        y: Les étiquettes
+        algorithmes: Les algorithmes en lice (tous ceux de ESPACES_RECHERCHE si None)
+        budget_cpu: Le budget de temps CPU, en secondes, cumulé sur tous les processus
+        n_candidats: Le nombre de configurations tirées, réparties entre les algorithmes
+        facteur: Le facteur d'élimination et de croissance de l'échantillon
+        ressource_min: La taille d'échantillon du premier tour (déduite de n_candidats si None)
+        cv: Le nombre de plis
+        workers: Le nombre de processus (tous les cœurs si None)
+        dossier_cache: Le dossier du cache des plis
+        graine: La graine du tirage des configurations, des échantillons et des plis
+        verbeux: True pour afficher l'avancement
+
+    Returns:
+        Un dict : meilleur (algo, params, score, ressource), tours (liste de
+        résultats par tour), cpu_utilise (secondes, plis calculés ; exporter_meilleur()
+        y ajoute l'entraînement final), cpu_entrainement_final (estimation),
+        plis_calcules, plis_en_cache et budget_epuise
+
+    Raises:
+        RuntimeError: Si aucun pli n'a pu être évalué
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=str)
+    algorithmes = list(algorithmes or ESPACES_RECHERCHE)
+    workers = workers or os.cpu_count() or 1
+    n = len(y)
+    ressource_min = ressource_min or max(cv * 30, n // facteur ** int(np.ceil(np.log(n_candidats) / np.log(facteur))))
+    ressource_min = min(ressource_min, n)
+
+    # Configurations tirées une fois pour toutes (même graine : mêmes candidats à la reprise),
+    # rangées en alternant les algorithmes
+    groupes = []
+    for k, algo in enumerate(algorithmes):
+        nombre = n_candidats // len(algorithmes) + (k < n_candidats % len(algorithmes))
+        groupes.append([(algo, {cle: (valeur.item() if isinstance(valeur, np.generic) else valeur)
+                                for cle, valeur in params.items()})
+                        for params in ParameterSampler(ESPACES_RECHERCHE[algo], n_iter=nombre,
+                                                       random_state=graine + k)])
+    candidats = [candidat for rang in zip_longest(*groupes) for candidat in rang if candidat is not None]
+
+    empreinte_donnees = _empreinte_donnees(X, y)
+    os.makedirs(dossier_cache, exist_ok=True)
+    evaluer = _evaluateur(dossier_cache)
+    cpu_utilise = 0.0
+    plis_calcules = plis_en_cache = 0
+    tours: List[Dict[str, Any]] = []
+    budget_epuise = False
+    # Temps CPU mesurés par candidat (indice) et par algorithme (nom), puis par taille
+    # d'échantillon : plis complets, et entraînements seuls
+    couts_pli: Dict[Any, Dict[int, List[float]]] = {}
+    couts_fit: Dict[Any, Dict[int, List[float]]] = {}
+    # Plis déjà évalués : (indice, ressource, pli) -> score
+    scores_connus: Dict[Tuple[int, int, int], float] = {}
+
+    with tempfile.TemporaryDirectory(prefix="fh_recherche_") as dossier:
+        chemin_donnees = os.path.join(dossier, "donnees.joblib")
+        joblib.dump({"X": X, "y": y}, chemin_donnees)
+
+        def arguments(indice: int, ressource: int, pli: int) -> Dict[str, Any]:
+            return {"empreinte_donnees": empreinte_donnees, "algo": candidats[indice][0],
+                    "params": candidats[indice][1], "ressource": ressource, "pli": pli, "cv": cv,
+                    "graine": graine, "chemin_donnees": chemin_donnees}
+
+        def cout_pli(indice: int, ressource: int, pli: int) -> float:
+            if (indice, ressource, pli) in scores_connus or evaluer.check_call_in_cache(**arguments(indice, ressource, pli)):
+                return 0.0
+            return estimer(couts_pli, indice, ressource)
+
+        def estimer(couts, indice: int, ressource: float) -> float:
+            # Mesures du candidat lui-même, à défaut celles de son algorithme
+            algo = candidats[indice][0]
+            return _extrapoler(couts.get(indice, couts[algo]), ressource, EXPOSANT_COUT.get(algo, 1.0))
+
+        def cout_final(indices) -> float:
+            # Réserve pour l'entraînement final : le moins coûteux des candidats, le choix du gagnant
+            # garantissant ensuite qu'il tient ; un pli de taille r s'entraîne sur (cv - 1) / cv * r lignes
+            return min(estimer(couts_fit, i, n * cv / (cv - 1)) * SURCOUT_CALIBRATION.get(candidats[i][0], 1.0)
+                       for i in indices)
+
+        def enregistrer(resultats, ressource, cpu_tour):
+            nonlocal plis_calcules, plis_en_cache, cpu_utilise
+            cpu_utilise += cpu_tour
+            for indice, pli, resultat, deja_calcule in resultats:
+                scores_connus[(indice, ressource, pli)] = resultat["score"]
+                if deja_calcule:
+                    plis_en_cache += 1
+                else:
+                    plis_calcules += 1
+                # Un pli repris du cache garde le temps CPU de son calcul : il renseigne aussi les coûts
+                for cle in (indice, candidats[indice][0]):
+                    couts_pli.setdefault(cle, {}).setdefault(ressource, []).append(resultat["cpu"])
+                    couts_fit.setdefault(cle, {}).setdefault(ressource, []).append(resultat["cpu_fit"])
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Calibrage : premier pli du premier candidat de chaque algorithme (repris par le premier tour)
+            premiers = [candidats.index(groupe[0]) for groupe in groupes if groupe]
+            resultats, cpu_tour, _ = _executer(pool, [(dossier_cache, i, arguments(i, ressource_min, 0))
+                                                      for i in premiers], budget_cpu)
+            enregistrer(resultats, ressource_min, cpu_tour)
+
+            # Algorithme dont le calibrage a été abandonné (budget dépassé) : coût inconnu, hors course
+            restants = [i for i, (algo, _) in enumerate(candidats) if algo in couts_pli]
+            ressource = ressource_min
+            while restants:
+                couts = [sum(cout_pli(i, ressource, pli) for pli in range(cv)) for i in restants]
+                disponible = budget_cpu - cpu_utilise
+                if sum(couts) + cout_final(restants) > disponible:
+                    if tours:
+                        budget_epuise = True
+                        break
+                    # Premier tour : les candidats dont les plis et l'entraînement final tiennent encore
+                    gardes, cumul = [], 0.0
+                    for i, cout in zip(restants, couts):
+                        if cumul + cout + cout_final(gardes + [i]) <= disponible:
+                            gardes.append(i)
+                            cumul += cout
+                    budget_epuise = True
+                    if not gardes:
+                        break
+                    restants = gardes
+
+                taches = [(dossier_cache, i, arguments(i, ressource, pli)) for i in restants for pli in range(cv)
+                          if (i, ressource, pli) not in scores_connus]
+                resultats, cpu_tour, abandon = _executer(pool, taches, budget_cpu - cpu_utilise - cout_final(restants))
+                enregistrer(resultats, ressource, cpu_tour)
+                budget_epuise = budget_epuise or abandon
+
+                complets = {i: float(np.mean([scores_connus[(i, ressource, pli)] for pli in range(cv)]))
+                            for i in restants if all((i, ressource, pli) in scores_connus for pli in range(cv))}
+                # Tour interrompu : le gagnant vient du dernier tour complet (ou des candidats complets du premier)
+                if complets and (len(complets) == len(restants) or not tours):
+                    tours.append({"ressource": ressource, "scores": complets})
+                if verbeux:
+                    meilleur = max(complets.values()) if complets else float("nan")
+                    print(f"Tour {len(tours)} : {len(complets)}/{len(restants)} candidats sur {ressource} lignes, "
+                          f"meilleure précision {meilleur:.4f}, CPU {cpu_utilise:.1f}/{budget_cpu:.1f} s")
+                if abandon or ressource >= n or len(complets) <= 1:
+                    break
+
+                classes = sorted(complets, key=complets.get, reverse=True)
+                restants = classes[:max(1, len(classes) // facteur)]
+                ressource = min(ressource * facteur, n)
+
+    if not tours:
+        # Budget trop court pour un tour complet : meilleur premier pli sur l'échantillon du premier tour
+        calibrage = {i: score for (i, ressource, pli), score in scores_connus.items()
+                     if ressource == ressource_min and pli == 0}
+        if not calibrage:
+            raise RuntimeError("Aucun pli n'a pu être évalué dans le budget CPU")
+        tours.append({"ressource": ressource_min, "scores": calibrage})
+
+    # Gagnant : le meilleur candidat du tour le plus avancé dont l'entraînement final tient dans le reste du budget
+    reste = budget_cpu - cpu_utilise
+    for tour in reversed(tours):
+        abordables = [i for i in tour["scores"] if cout_final([i]) <= reste]
+        if abordables:
+            break
+    else:
+        tour = tours[-1]
+        abordables = [min(tour["scores"], key=lambda i: cout_final([i]))]
+    indice = max(abordables, key=tour["scores"].get)
+    if tour is not tours[-1] or indice != max(tour["scores"], key=tour["scores"].get):
+        budget_epuise = True
+    algo, params = candidats[indice]
+    return {
+        "meilleur": {"algo": algo, "params": params, "score": tour["scores"][indice],
+                     "ressource": tour["ressource"]},
+        "tours": [{"ressource": tour["ressource"],
+                   "scores": {f"{candidats[i][0]} {candidats[i][1]}": s for i, s in tour["scores"].items()}}
+                  for tour in tours],
+        "cpu_utilise": cpu_utilise,
+        "cpu_entrainement_final": cout_final([indice]),
+        "plis_calcules": plis_calcules,
+        "plis_en_cache": plis_en_cache,
+        "budget_epuise": budget_epuise,
+    }
+
+
+def exporter_meilleur(resultat: Dict[str, Any], X, y, chemin: str = "modele.pkl") -> ModeleIA:
+    """
+    Réentraîne la meilleure configuration sur toutes les données et l'exporte comme modèle de l'application.
+
+    Le temps CPU de cet entraînement est ajouté à resultat["cpu_utilise"]
+    (et remplace l'estimation de resultat["cpu_entrainement_final"]). Une
+    forêt est aussi exportée compilée ; pour un autre algorithme, l'ancienne
+    forêt compilée est supprimée, sans quoi elle masquerait le nouveau modèle
+    au chargement.
+
+    Args:
+        resultat: Le résultat de rechercher() (mis à jour)
+        X: Les caractéristiques (colonnes ModeleIA.features)
+        y: Les étiquettes
+        chemin: Le fichier du modèle
+
+    Returns:
+        Le ModeleIA entraîné
+    """
+    meilleur = resultat["meilleur"]
+    modele = ModeleIA()
+    modele.model = creer_modele(meilleur["algo"], meilleur["params"], probabilites=True, normaliser=True)
+    debut = time.process_time()
+    modele.entrainer(X, y)
+    resultat["cpu_entrainement_final"] = time.process_time() - debut
+    resultat["cpu_utilise"] += resultat["cpu_entrainement_final"]
+
+    modele.sauvegarder(chemin)
+    if meilleur["algo"] == "Random Forest":
+        modele.exporter_compile(chemin + SUFFIXE_COMPILE)
+    else:
+        shutil.rmtree(chemin + SUFFIXE_COMPILE, ignore_errors=True)
+    return modele
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant le registre des modèles chargés, partagé par tout le processus.
+
+Chaque fichier n'est lu et désérialisé qu'une fois par version : les appels
+suivants renvoient l'objet en cache tant que le fichier (et sa forêt compilée)
+n'a pas changé sur le disque.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from src.ia.artefacts import SUFFIXE_COMPILE, charger_artefact
+from src.ia.modele import ModeleIA
+
+
+def charger_modele_ia(chemin: str) -> ModeleIA:
+    """
+    Charge un ModeleIA, depuis sa forêt compilée si elle est à jour.
+
+    Args:
+        chemin: Le fichier du modèle (ex. modele.pkl)
+
+    Returns:
+        Le modèle prêt à prédire
+
+    Raises:
+        FileNotFoundError: Si ni le fichier ni sa forêt compilée n'existent
+    """
+    modele = ModeleIA()
+    modele.charger(chemin)
+    return modele
+
+
+def _signature(chemin: str) -> Tuple:
+    """
+    Identifie la version sur disque d'un artefact : (mtime, taille) du fichier
+    et du meta.json de sa forêt compilée.
+    """
+    signature = []
+    for fichier in (chemin, os.path.join(chemin + SUFFIXE_COMPILE, "meta.json")):
+        try:
+            stat = os.stat(fichier)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    if signature == [None, None]:
+        raise FileNotFoundError(chemin)
+    return tuple(signature)
+
+
+class RegistreModeles:
+    """
+    Cache LRU des modèles chargés, indexé par chemin et version du fichier.
+    """
+
+    def __init__(self, capacite: int = 8):
+        """
+        Initialise le registre.
+
+        Args:
+            capacite: Le nombre maximal d'artefacts gardés en mémoire
+        """
+        self.capacite = capacite
+        self._cache = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def obtenir(self, chemin: str, chargeur: Callable[[str], Any] = charger_artefact) -> Any:
+        """
+        Renvoie l'artefact en cache, ou le (re)charge si le fichier a changé.
+
+        Le rechargement se fait hors verrou ; le nouvel objet remplace l'ancien
+        d'un seul coup, les appelants en cours gardent l'ancienne version.
+
+        Args:
+            chemin: Le fichier de l'artefact
+            chargeur: La fonction de chargement (charger_artefact par défaut)
+
+        Returns:
+            L'objet chargé
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+        """
+        cle = (os.path.abspath(chemin), chargeur)
+        signature = _signature(chemin)
+        with self._verrou:
+            entree = self._cache.get(cle)
+            if entree is not None and entree[0] == signature:
+                self._cache.move_to_end(cle)
+                return entree[1]
+
+        objet = chargeur(chemin)
+
+        with self._verrou:
+            self._cache[cle] = (signature, objet)
+            self._cache.move_to_end(cle)
+            while len(self._cache) > self.capacite:
+                self._cache.popitem(last=False)
+        return objet
+
+    def invalider(self, chemin: Optional[str] = None) -> None:
+        """
+        Retire un artefact du cache (ou tous si chemin est None).
+
+        Args:
+            chemin: Le fichier à oublier
+        """
+        with self._verrou:
+            if chemin is None:
+                self._cache.clear()
+                return
+            chemin = os.path.abspath(chemin)
+            for cle in [cle for cle in self._cache if cle[0] == chemin]:
+                del self._cache[cle]
+
+
+# Registre unique du processus (partagé entre les reruns Streamlit)
+registre = RegistreModeles()
+
+
+def obtenir_modele(chemin: str = "modele.pkl") -> ModeleIA:
+    """Renvoie le ModeleIA du fichier via le registre du processus."""
+    return registre.obtenir(chemin, charger_modele_ia)
+
+
+def obtenir_artefact(chemin: str) -> Any:
+    """Renvoie un artefact joblib (modèle, scaler, colonnes) via le registre du processus."""
+    return registre.obtenir(chemin, charger_artefact)
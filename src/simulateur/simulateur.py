@@ -1,16 +1,37 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import copy
 import numpy as np
 import pandas as pd
 
+
+def sequence_graine(seed=None) -> np.random.SeedSequence:
+    """
+    Convertit une graine (None, entier, SeedSequence ou Generator) en SeedSequence.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq
+    return np.random.SeedSequence(seed)
+
+
 class SimulateurFaisceauHertzien:
     """
     Simulateur de liaison FH selon distance, météo, urbain/rural,
     modulation, puissance et antenne, prêt pour dataset IA.
     """
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        """
+        Initialise le simulateur.
+
+        Args:
+            seed: Graine (entier ou SeedSequence) ou numpy.random.Generator.
+                None pour une graine tirée de l'entropie du système.
+        """
+        self.rng = np.random.default_rng(seed)
         self.conditions = [
             "Normal_Rural", "Normal_Urbain", "Pluie_Rural", "Pluie_Urbain",
             "Brouillard_Rural", "Brouillard_Urbain", "Cyclone", "Orage",
@@ -23,74 +44,74 @@ class SimulateurFaisceauHertzien:
 
     def simulate_fh(self) -> dict:
         # Choix aléatoire condition et distance
-        cond = np.random.choice(self.conditions)
-        distance = np.random.uniform(0.5,50)  # km
+        cond = self.rng.choice(self.conditions)
+        distance = self.rng.uniform(0.5,50)  # km
 
         # Fréquence
         if distance <= 5:
-            freq = np.random.choice(self.frequencies + self.eband)
+            freq = self.rng.choice(self.frequencies + self.eband)
         else:
-            freq = np.random.choice(self.frequencies)
+            freq = self.rng.choice(self.frequencies)
 
         # Bandwidth
-        bw = np.random.choice(self.bandwidths)
+        bw = self.rng.choice(self.bandwidths)
 
         # Tx Power et Gain selon distance
         if distance <= 5:
-            tx_power = np.random.uniform(17,20)
-            gain = np.random.uniform(20,25)
+            tx_power = self.rng.uniform(17,20)
+            gain = self.rng.uniform(20,25)
         elif distance <= 20:
-            tx_power = np.random.uniform(20,24)
-            gain = np.random.uniform(25,30)
+            tx_power = self.rng.uniform(20,24)
+            gain = self.rng.uniform(25,30)
         else:
-            tx_power = np.random.uniform(24,27)
-            gain = np.random.uniform(30,40)
+            tx_power = self.rng.uniform(24,27)
+            gain = self.rng.uniform(30,40)
 
         # RSSI de base
-        rssi = tx_power + gain - distance*2 - np.random.uniform(0,2)
+        rssi = tx_power + gain - distance*2 - self.rng.uniform(0,2)
 
         # Ajustements selon conditions
         if "Urbain" in cond:
-            rssi -= np.random.uniform(5,10)  # pénalité RSSI urbain
+            rssi -= self.rng.uniform(5,10)  # pénalité RSSI urbain
         if "Pluie" in cond or "Brouillard" in cond:
-            rssi -= np.random.uniform(2,5)
+            rssi -= self.rng.uniform(2,5)
         if "Foret" in cond or "Montagneux" in cond:
-            rssi -= np.random.uniform(3,7)
+            rssi -= self.rng.uniform(3,7)
         if "Cyclone" in cond or "Orage" in cond:
-            rssi -= np.random.uniform(10,15)
+            rssi -= self.rng.uniform(10,15)
         if "Vent_fort" in cond:
-            rssi -= np.random.uniform(0,3)
+            rssi -= self.rng.uniform(0,3)
 
         # SNR corrélé au RSSI, avec bruit aléatoire
-        snr = max(0, rssi + np.random.uniform(0,10))
+        snr = max(0, rssi + self.rng.uniform(0,10))
 
         # BER corrélé au SNR et conditions
         if snr >= 20:
-            ber = np.random.uniform(0,1e-6)
+            ber = self.rng.uniform(0,1e-6)
         elif snr >= 10:
-            ber = np.random.uniform(1e-6,1e-3)
+            ber = self.rng.uniform(1e-6,1e-3)
         else:
-            ber = np.random.uniform(1e-3,1e-1)
+            ber = self.rng.uniform(1e-3,1e-1)
 
         # Renforcer BER si conditions difficiles + distance longue
         if ("Pluie" in cond or "Brouillard" in cond or "Urbain" in cond or "Foret" in cond or "Montagneux" in cond) and distance > 20:
-            ber *= np.random.uniform(1.5,3)
+            ber *= self.rng.uniform(1.5,3)
 
         # Disponibilité selon scénario combiné
         if "Cyclone" in cond or "Orage" in cond:
-            availability = np.random.uniform(90,98)
+            availability = self.rng.uniform(90,98)
         elif distance <= 5 and "Rural" in cond:
-            availability = np.random.uniform(99.95,100)
+            availability = self.rng.uniform(99.95,100)
         elif "Pluie" in cond or "Brouillard" in cond or "Urbain" in cond:
-            availability = np.random.uniform(99,99.95)
+            availability = self.rng.uniform(99,99.95)
         else:
-            availability = np.random.uniform(99.5,99.99)
+            availability = self.rng.uniform(99.5,99.99)
 
         # Modulation adaptée
         if distance > 20 or "Pluie" in cond or "Brouillard" in cond or "Urbain" in cond:
-            mod = np.random.choice(["BPSK","QPSK","8PSK","16-QAM"])
+            mod = self.rng.choice(["BPSK","QPSK","8PSK","16-QAM"])
         else:
-            mod = np.random.choice(self.modulations)
+            mod = self.rng.choice(self.modulations)
 
         # Classification liaison
         if rssi > -70 and snr >= 20 and ber <= 1e-6:
@@ -115,21 +136,158 @@ class SimulateurFaisceauHertzien:
             "Status": status
         }
 
-    def generer_donnees(self, condition: str = None) -> pd.DataFrame:
+    def simulate_batch(self, n: int, condition=None, as_frame: bool = True):
         """
-        Génère un DataFrame pour l'affichage CLI.
+        Simule n liaisons d'un coup, avec des tirages vectorisés.
+
+        Même loi que simulate_fh(), mais chaque étape est un tirage NumPy sur
+        tout le lot et les ajustements par condition sont des masques booléens.
+
+        Args:
+            n: Le nombre de liaisons à simuler
+            condition: None pour tirer la condition au hasard, un nom de
+                condition, ou une séquence de n conditions (une par liaison)
+            as_frame: True pour un DataFrame, False pour un dict de tableaux
+
+        Returns:
+            Les échantillons, avec les mêmes colonnes que simulate_fh()
+        """
+        n = int(n)
+        # Drapeaux calculés une fois par condition distincte, puis diffusés
+        if condition is None:
+            uniques = np.asarray(self.conditions)
+            codes = self.rng.integers(len(uniques), size=n)
+        elif isinstance(condition, str):
+            uniques = np.asarray([condition])
+            codes = np.zeros(n, dtype=np.intp)
+        else:
+            uniques, codes = np.unique(np.asarray(condition, dtype=str), return_inverse=True)
+        cond = uniques[codes]
+
+        def drapeau(*motifs):
+            return np.array([any(m in c for m in motifs) for c in uniques], dtype=bool)[codes]
+
+        urbain = drapeau("Urbain")
+        rural = drapeau("Rural")
+        pluie_brouillard = drapeau("Pluie", "Brouillard")
+        foret_montagne = drapeau("Foret", "Montagneux")
+        cyclone_orage = drapeau("Cyclone", "Orage")
+        vent_fort = drapeau("Vent_fort")
+
+        # Choix distance
+        distance = self.rng.uniform(0.5, 50, n)  # km
+        courte = distance <= 5
+        moyenne = distance <= 20
+
+        # Fréquence (E-band autorisée en courte distance)
+        toutes_freqs = np.asarray(self.frequencies + self.eband)
+        nb_freqs = np.where(courte, len(toutes_freqs), len(self.frequencies))
+        freq = toutes_freqs[(self.rng.random(n) * nb_freqs).astype(np.intp)]
+
+        # Bandwidth
+        bw = np.asarray(self.bandwidths)[self.rng.integers(len(self.bandwidths), size=n)]
+
+        # Tx Power et Gain selon distance
+        tx_power = self.rng.uniform(np.select([courte, moyenne], [17, 20], 24),
+                                     np.select([courte, moyenne], [20, 24], 27))
+        gain = self.rng.uniform(np.select([courte, moyenne], [20, 25], 30),
+                                 np.select([courte, moyenne], [25, 30], 40))
+
+        # RSSI de base
+        rssi = tx_power + gain - distance * 2 - self.rng.uniform(0, 2, n)
+
+        # Ajustements selon conditions
+        rssi -= np.where(urbain, self.rng.uniform(5, 10, n), 0)
+        rssi -= np.where(pluie_brouillard, self.rng.uniform(2, 5, n), 0)
+        rssi -= np.where(foret_montagne, self.rng.uniform(3, 7, n), 0)
+        rssi -= np.where(cyclone_orage, self.rng.uniform(10, 15, n), 0)
+        rssi -= np.where(vent_fort, self.rng.uniform(0, 3, n), 0)
+
+        # SNR corrélé au RSSI, avec bruit aléatoire
+        snr = np.maximum(0, rssi + self.rng.uniform(0, 10, n))
+
+        # BER corrélé au SNR
+        snr_haut = snr >= 20
+        snr_moyen = snr >= 10
+        ber = self.rng.uniform(np.select([snr_haut, snr_moyen], [0, 1e-6], 1e-3),
+                                np.select([snr_haut, snr_moyen], [1e-6, 1e-3], 1e-1))
+
+        # Renforcer BER si conditions difficiles + distance longue
+        difficile = pluie_brouillard | urbain | foret_montagne
+        ber *= np.where(difficile & (distance > 20), self.rng.uniform(1.5, 3, n), 1)
+
+        # Disponibilité selon scénario combiné
+        cas_dispo = [cyclone_orage, courte & rural, pluie_brouillard | urbain]
+        availability = self.rng.uniform(np.select(cas_dispo, [90, 99.95, 99], 99.5),
+                                         np.select(cas_dispo, [98, 100, 99.95], 99.99))
+
+        # Modulation adaptée (les 4 premières sont les plus robustes)
+        restreinte = (distance > 20) | pluie_brouillard | urbain
+        nb_mods = np.where(restreinte, 4, len(self.modulations))
+        mod = np.asarray(self.modulations)[(self.rng.random(n) * nb_mods).astype(np.intp)]
+
+        # Classification liaison
+        status = np.select(
+            [(rssi > -70) & (snr >= 20) & (ber <= 1e-6),
+             (rssi > -85) & (snr >= 10) & (ber <= 1e-3)],
+            ["OK", "Dégradé"], "KO"
+        )
+
+        colonnes = {
+            "Condition": cond,
+            "Distance_km": np.round(distance, 2),
+            "Frequency_GHz": freq,
+            "Bandwidth_MHz": bw,
+            "Modulation": mod,
+            "TxPower_dBm": np.round(tx_power, 2),
+            "Gain_dBi": np.round(gain, 2),
+            "RSSI_dBm": np.round(rssi, 2),
+            "SNR_dB": np.round(snr, 2),
+            "BER": ber,
+            "Availability_percent": np.round(availability, 2),
+            "Status": status
+        }
+        return pd.DataFrame(colonnes) if as_frame else colonnes
+
+    def generer_mesure(self, condition: str = None) -> dict:
+        """
+        Génère une mesure pour l'affichage en temps réel, sans construire de DataFrame.
         """
         sample = self.simulate_fh()
         if condition:
             sample["Condition"] = condition
-        df = pd.DataFrame([{
+        return {
             "rssi": sample["RSSI_dBm"],
             "snr": sample["SNR_dB"],
             "ber": sample["BER"],
             "disponibilite": sample["Availability_percent"],
             "condition": sample["Condition"]
-        }])
-        return df
+        }
+
+    def generer_donnees(self, condition: str = None) -> pd.DataFrame:
+        """
+        Génère un DataFrame pour l'affichage CLI.
+        """
+        return pd.DataFrame([self.generer_mesure(condition)])
+
+    def spawn(self, n: int, seed=None) -> list:
+        """
+        Crée n simulateurs aux flux aléatoires indépendants (SeedSequence.spawn).
+
+        Args:
+            n: Le nombre de simulateurs à créer
+            seed: Graine racine ; None pour dériver du flux de ce simulateur
+
+        Returns:
+            La liste des simulateurs enfants, même configuration que celui-ci
+        """
+        racine = sequence_graine(self.rng if seed is None else seed)
+        enfants = []
+        for graine in racine.spawn(n):
+            enfant = copy.copy(self)
+            enfant.rng = np.random.default_rng(graine)
+            enfants.append(enfant)
+        return enfants
 
     def get_conditions_disponibles(self):
         return self.conditions
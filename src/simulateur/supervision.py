@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant la classe MoteurSupervision pour suivre un parc de liaisons FH.
+"""
+
+import time
+import threading
+import numpy as np
+from typing import Callable, Optional, Sequence, Union
+from src.simulateur.simulateur import SimulateurFaisceauHertzien
+from src.ia.modele import ModeleIA
+from src.utils.detection_anomalies import PARAMETRES_SURVEILLES, DetecteurAnomalies
+
+
+class MoteurSupervision:
+    """
+    Supervise N liaisons simultanément.
+
+    L'état du parc est stocké en colonnes (un tableau NumPy par grandeur,
+    indexé par liaison). À chaque tick, toutes les liaisons sont simulées
+    d'un coup par simulate_batch() et classées par un seul appel à
+    ModeleIA.predire_lot() ; un détecteur d'anomalies vectorisé suit en
+    parallèle chaque paramètre de chaque liaison. Les abonnés reçoivent
+    ensuite le parc entier.
+    """
+
+    def __init__(self, simulateur: SimulateurFaisceauHertzien, modele: ModeleIA,
+                 conditions: Union[str, Sequence[str]], n_jobs: int = 1,
+                 noms: Optional[Sequence[str]] = None, detection: str = "ewma", seuil: float = 3.0):
+        """
+        Initialise le moteur.
+
+        Args:
+            simulateur: Une instance de SimulateurFaisceauHertzien
+            modele: Une instance de ModeleIA entraînée
+            conditions: Une condition par liaison (la longueur fixe la taille du parc)
+            n_jobs: Le nombre de cœurs pour la classification
+            noms: L'identifiant de chaque liaison (FH-0, FH-1... par défaut)
+            detection: L'estimateur du détecteur d'anomalies ("ewma" ou "fenetre")
+            seuil: L'écart au centre, en nombre de dispersions, qui signale une anomalie
+        """
+        self.simulateur = simulateur
+        self.modele = modele
+        self.n_jobs = n_jobs
+        self.conditions = np.array(conditions, dtype=object)
+        n = len(self.conditions)
+        self.noms = list(noms) if noms is not None else [f"FH-{i}" for i in range(n)]
+
+        # État du parc : une colonne par grandeur, une ligne par liaison
+        self.rssi = np.full(n, np.nan)
+        self.snr = np.full(n, np.nan)
+        self.ber = np.full(n, np.nan)
+        self.disponibilite = np.full(n, np.nan)
+        self.etat = np.full(n, None, dtype=object)
+        self.confiance = np.zeros(n)
+        self.changements = np.zeros(0, dtype=np.intp)
+        # Anomalies par liaison et par paramètre (colonnes : rssi, snr, ber, disponibilite)
+        self.detecteur = DetecteurAnomalies(detection, (n, len(PARAMETRES_SURVEILLES)), seuil,
+                                            sens=list(PARAMETRES_SURVEILLES.values()))
+        self.anomalies = np.zeros((n, len(PARAMETRES_SURVEILLES)), dtype=bool)
+        self.tick = 0
+        self.horodatage = None
+        self.duree_tick = 0.0
+
+        self._abonnes = []
+        self._verrou = threading.Lock()
+        self.running = False
+
+    @property
+    def nb_liaisons(self) -> int:
+        """Le nombre de liaisons supervisées."""
+        return len(self.conditions)
+
+    def abonner(self, callback: Callable[["MoteurSupervision"], None]) -> None:
+        """
+        Enregistre une fonction appelée après chaque tick.
+
+        Le moteur lui est passé tel quel : les colonnes d'état sont lues sans
+        copie, self.changements donne les liaisons dont l'état vient de changer.
+
+        Args:
+            callback: La fonction à appeler
+        """
+        with self._verrou:
+            self._abonnes.append(callback)
+
+    def desabonner(self, callback: Callable[["MoteurSupervision"], None]) -> None:
+        """
+        Retire une fonction enregistrée par abonner().
+
+        Args:
+            callback: La fonction à retirer
+        """
+        with self._verrou:
+            self._abonnes.remove(callback)
+
+    def changer_condition(self, condition: str, liaisons=None) -> None:
+        """
+        Change la condition de certaines liaisons.
+
+        Args:
+            condition: La nouvelle condition
+            liaisons: Les indices (ou un masque booléen) des liaisons, toutes si None
+        """
+        with self._verrou:
+            if liaisons is None:
+                self.conditions[:] = condition
+            else:
+                self.conditions[liaisons] = condition
+
+    def avancer(self) -> None:
+        """
+        Fait avancer tout le parc d'un tick : simulation, classification, publication.
+        """
+        debut = time.perf_counter()
+        with self._verrou:
+            mesures = self.simulateur.simulate_batch(self.nb_liaisons, self.conditions, as_frame=False)
+            self.rssi[:] = mesures["RSSI_dBm"]
+            self.snr[:] = mesures["SNR_dB"]
+            self.ber[:] = mesures["BER"]
+            self.disponibilite[:] = mesures["Availability_percent"]
+
+            X = np.column_stack([self.rssi, self.snr, self.ber, self.disponibilite])
+            etats, probas = self.modele.predire_lot(X, n_jobs=self.n_jobs)
+
+            self.changements = np.flatnonzero(etats != self.etat)
+            self.etat[:] = etats
+            self.confiance[:] = probas.max(axis=1)
+            self.anomalies[:] = self.detecteur.evaluer(X)
+            self.tick += 1
+            self.horodatage = time.time()
+            abonnes = list(self._abonnes)
+        self.duree_tick = time.perf_counter() - debut
+
+        for callback in abonnes:
+            callback(self)
+
+    def repartition(self) -> dict:
+        """
+        Compte les liaisons par état.
+
+        Returns:
+            Un dict état -> nombre de liaisons
+        """
+        etats, comptes = np.unique(self.etat[self.etat != None].astype(str), return_counts=True)  # noqa: E711
+        return dict(zip(etats.tolist(), comptes.tolist()))
+
+    def liaisons(self, etat: str) -> np.ndarray:
+        """
+        Renvoie les indices des liaisons dans un état donné.
+
+        Args:
+            etat: L'état recherché (ex. "KO")
+        """
+        return np.flatnonzero(self.etat == etat)
+
+    def liaisons_en_anomalie(self) -> np.ndarray:
+        """
+        Renvoie les indices des liaisons dont au moins un paramètre est en anomalie.
+        """
+        return np.flatnonzero(self.anomalies.any(axis=1))
+
+    def executer(self, frequence: float = 1.0, nb_ticks: Optional[int] = None) -> None:
+        """
+        Fait tourner le moteur à cadence fixe jusqu'à arreter() (ou nb_ticks).
+
+        Les échéances sont calculées depuis le départ, pas depuis la fin du tick
+        précédent : la durée du traitement ne décale pas la cadence. Un tick en
+        retard de plus d'une période est sauté plutôt que rattrapé en rafale.
+
+        Args:
+            frequence: Le nombre de ticks par seconde
+            nb_ticks: Le nombre de ticks à exécuter (illimité si None)
+        """
+        periode = 1.0 / frequence
+        self.running = True
+        echeance = time.monotonic()
+        restant = nb_ticks
+        try:
+            while self.running and (restant is None or restant > 0):
+                self.avancer()
+                if restant is not None:
+                    restant -= 1
+                echeance += periode
+                attente = echeance - time.monotonic()
+                if attente > 0:
+                    time.sleep(attente)
+                else:
+                    echeance += (-attente // periode) * periode
+        finally:
+            self.running = False
+
+    def arreter(self) -> None:
+        """Demande l'arrêt de executer() à la fin du tick en cours."""
+        self.running = False
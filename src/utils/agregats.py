@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Agrégats courants d'une session de supervision, mis à jour en O(1) par mesure.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Sequence
+from src.utils.etats import ETATS, etat_canonique, score_qualite
+
+
+class StatistiquesCourantes:
+    """
+    Moyenne, variance (algorithme de Welford), minimum et maximum d'une grandeur,
+    sans conserver les valeurs.
+    """
+
+    __slots__ = ("n", "moyenne", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.moyenne = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def ajouter(self, valeur: float) -> None:
+        """
+        Ajoute une valeur (les valeurs absentes ou NaN sont ignorées).
+
+        Args:
+            valeur: La nouvelle valeur
+        """
+        if valeur is None:
+            return
+        valeur = float(valeur)
+        if math.isnan(valeur):
+            return
+        self.n += 1
+        delta = valeur - self.moyenne
+        self.moyenne += delta / self.n
+        self.m2 += delta * (valeur - self.moyenne)
+        if valeur < self.min:
+            self.min = valeur
+        if valeur > self.max:
+            self.max = valeur
+
+    @property
+    def variance(self) -> float:
+        """Variance de l'échantillon (n - 1), NaN avant deux valeurs."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def ecart_type(self) -> float:
+        """Écart type de l'échantillon, NaN avant deux valeurs."""
+        return math.sqrt(self.variance) if self.n > 1 else math.nan
+
+
+class AgregatsSession:
+    """
+    Résumé d'une session : statistiques courantes par paramètre et comptes par état.
+
+    Le coût d'une mise à jour et d'une lecture ne dépend pas de la durée
+    de la session ; version change à chaque mesure et peut servir de clé de cache.
+    """
+
+    def __init__(self, parametres: Sequence[str]):
+        """
+        Initialise des agrégats vides.
+
+        Args:
+            parametres: Les grandeurs suivies (ex. ["RSSI", "SNR", "BER", "TxPower"])
+        """
+        self.parametres = list(parametres)
+        self.stats = {nom: StatistiquesCourantes() for nom in self.parametres}
+        self.comptes = dict.fromkeys(ETATS, 0)
+        self.dernier_etat = None
+        self.nb = 0
+        self.version = 0
+
+    def ajouter(self, mesures: Dict[str, float], etat: Optional[str] = None) -> None:
+        """
+        Ajoute une mesure.
+
+        Args:
+            mesures: La valeur de chaque paramètre suivi (les absents sont ignorés)
+            etat: L'état associé (ramené à l'étiquette canonique)
+        """
+        for nom, stats in self.stats.items():
+            stats.ajouter(mesures.get(nom))
+        if etat is not None:
+            self.dernier_etat = etat_canonique(etat)
+            self.comptes[self.dernier_etat] += 1
+            self.nb += 1
+        self.version += 1
+
+    @classmethod
+    def depuis_historique(cls, parametres: Sequence[str], lignes: Iterable[Dict[str, float]],
+                          etats: Iterable[str]) -> "AgregatsSession":
+        """
+        Construit les agrégats d'une session déjà enregistrée.
+
+        Args:
+            parametres: Les grandeurs suivies
+            lignes: Les mesures, dans l'ordre
+            etats: Les états associés, dans le même ordre
+        """
+        agregats = cls(parametres)
+        for mesures, etat in zip(lignes, etats):
+            agregats.ajouter(mesures, etat)
+        return agregats
+
+    def pourcentages(self) -> Dict[str, int]:
+        """Pourcentage (entier) de chaque état, 0 si aucune mesure."""
+        return {etat: int(100 * nb / self.nb) if self.nb else 0 for etat, nb in self.comptes.items()}
+
+    def score(self) -> float:
+        """Score de qualité pondéré (entre 0 et 1)."""
+        return score_qualite(self.comptes["OK"], self.comptes["Dégradé"], self.comptes["KO"])
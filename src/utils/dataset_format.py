@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Format binaire canonique des datasets FH.
+
+Parquet (ou Feather) typé : catégories encodées en dictionnaire (int8),
+métriques en float32, entiers courts en int16, statistiques min/max par
+row group. Un dataset de 10M de lignes se relit en mémoire mappée, sans
+re-parser de texte.
+"""
+
+import os
+import pandas as pd
+
+VERSION_FORMAT = "1"
+
+# Catégories figées : mêmes codes dans tous les blocs et tous les fichiers
+CATEGORIES = {
+    "Condition": [
+        "Normal_Rural", "Normal_Urbain", "Pluie_Rural", "Pluie_Urbain",
+        "Brouillard_Rural", "Brouillard_Urbain", "Cyclone", "Orage",
+        "Foret_dense", "Vent_fort", "Montagneux"
+    ],
+    "Modulation": ["BPSK", "QPSK", "8PSK", "16-QAM", "32-QAM", "64-QAM", "256-QAM"],
+    "Status": ["OK", "Dégradé", "KO"],
+    "Etat": ["OK", "Dégradé", "KO"],
+}
+
+COLONNES_FLOAT32 = [
+    "Distance_km", "TxPower_dBm", "Gain_dBi", "RSSI_dBm", "SNR_dB", "BER", "Availability_percent"
+]
+
+COLONNES_INT16 = ["Frequency_GHz", "Bandwidth_MHz"]
+
+
+def format_depuis_nom(source) -> str:
+    """Déduit le format d'un chemin ou d'un fichier importé à partir de son extension."""
+    nom = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    extension = os.path.splitext(str(nom))[1].lower()
+    return {".parquet": "parquet", ".pq": "parquet",
+            ".feather": "feather", ".arrow": "feather"}.get(extension, "csv")
+
+
+def typer_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applique les types canoniques aux colonnes connues du dataset.
+
+    Args:
+        df: Le dataset brut (issu du simulateur ou d'un CSV)
+
+    Returns:
+        Un DataFrame aux colonnes catégorielles, float32 et int16
+
+    Raises:
+        ValueError: Si une colonne catégorielle contient une valeur absente de CATEGORIES
+    """
+    df = df.copy()
+    for col, categories in CATEGORIES.items():
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            valeurs = df[col].where(df[col].isna(), df[col].astype(str))
+            # Dictionnaire figé : une valeur en plus changerait le schéma d'un bloc à l'autre
+            inconnues = sorted(set(valeurs.dropna().unique()) - set(categories))
+            if inconnues:
+                raise ValueError(f"Valeurs inconnues pour la colonne {col} : {', '.join(inconnues)} "
+                                 f"(attendues : {', '.join(categories)})")
+            df[col] = pd.Categorical(valeurs, categories=categories)
+    for col in COLONNES_FLOAT32:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    for col in COLONNES_INT16:
+        if col in df.columns:
+            df[col] = df[col].astype("int16")
+    return df
+
+
+def vers_table(df: pd.DataFrame):
+    """
+    Convertit un DataFrame en table Arrow au schéma canonique.
+
+    Args:
+        df: Le dataset à convertir
+
+    Returns:
+        Une pyarrow.Table avec la version du format dans ses métadonnées
+
+    Raises:
+        ValueError: Si une colonne catégorielle contient une valeur absente de CATEGORIES
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(typer_dataframe(df), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"fh_check.format"] = VERSION_FORMAT.encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def ecrire_blocs(blocs, chemin, format=None) -> int:
+    """
+    Écrit des blocs successifs au format canonique (un row group par bloc).
+
+    Args:
+        blocs: Un itérable de DataFrames de même structure
+        chemin: Le fichier de sortie
+        format: "parquet" ou "feather" ; déduit de l'extension si None
+
+    Returns:
+        Le nombre de lignes écrites
+
+    Raises:
+        ValueError: Si le format est inconnu ou si un bloc contient une
+            catégorie absente de CATEGORIES
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    format = format or format_depuis_nom(chemin)
+    writer = None
+    schema = None
+    n_lignes = 0
+    try:
+        for lot in blocs:
+            table = vers_table(lot)
+            if writer is None:
+                schema = table.schema
+                if format == "parquet":
+                    writer = pq.ParquetWriter(chemin, schema, compression="zstd", write_statistics=True)
+                elif format == "feather":
+                    writer = pa.ipc.new_file(chemin, schema)
+                else:
+                    raise ValueError(f"Format binaire inconnu : {format}")
+            writer.write_table(table.cast(schema))
+            n_lignes += len(lot)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_lignes
+
+
+def lire_dataset(source, colonnes=None, filtres=None, format=None) -> pd.DataFrame:
+    """
+    Charge un dataset FH, quel que soit son format.
+
+    Parquet et Feather sont rendus avec les types canoniques. Un CSV est
+    rendu tel que pandas le lit (catégories observées, float64) : le forcer
+    aux catégories figées ferait apparaître des colonnes vides après
+    pd.get_dummies, et le float32 un bruit d'arrondi dans les exports.
+
+    Args:
+        source: Un chemin ou un fichier ouvert (ex. fichier importé Streamlit)
+        colonnes: Les colonnes à charger (toutes si None)
+        filtres: Filtres pyarrow, ex. [("Condition", "=", "Cyclone")] ;
+            les row groups exclus par leurs statistiques ne sont pas lus
+        format: "parquet", "feather" ou "csv" ; déduit du nom si None
+
+    Returns:
+        Le dataset (typé pour Parquet et Feather)
+    """
+    format = format or format_depuis_nom(source)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(source, columns=colonnes, filters=filtres, memory_map=True)
+        return table.to_pandas()
+    if format == "feather":
+        import pyarrow.feather as feather
+        df = feather.read_table(source, columns=colonnes, memory_map=True).to_pandas()
+        return typer_dataframe(df)
+    return pd.read_csv(source, usecols=colonnes)
+
+
+def convertir_csv(chemin_csv, chemin_sortie, taille_bloc: int = 500_000) -> int:
+    """
+    Convertit un CSV existant (ex. dataset_FH.csv) au format canonique, par blocs.
+
+    Args:
+        chemin_csv: Le CSV source
+        chemin_sortie: Le fichier .parquet ou .feather à produire
+        taille_bloc: Le nombre de lignes lues et écrites à la fois
+
+    Returns:
+        Le nombre de lignes converties
+
+    Raises:
+        ValueError: Si le CSV contient une catégorie absente de CATEGORIES
+    """
+    return ecrire_blocs(pd.read_csv(chemin_csv, chunksize=taille_bloc), chemin_sortie)
+
+
+def statistiques_row_groups(chemin) -> pd.DataFrame:
+    """
+    Liste les statistiques min/max de chaque colonne pour chaque row group.
+
+    Args:
+        chemin: Le fichier Parquet
+
+    Returns:
+        Un DataFrame (row_group, colonne, min, max, nb_lignes)
+    """
+    import pyarrow.parquet as pq
+
+    meta = pq.ParquetFile(chemin).metadata
+    lignes = []
+    for i in range(meta.num_row_groups):
+        groupe = meta.row_group(i)
+        for j in range(groupe.num_columns):
+            colonne = groupe.column(j)
+            stats = colonne.statistics
+            lignes.append({
+                "row_group": i,
+                "colonne": colonne.path_in_schema,
+                "min": stats.min if stats is not None and stats.has_min_max else None,
+                "max": stats.max if stats is not None and stats.has_min_max else None,
+                "nb_lignes": groupe.num_rows,
+            })
+    return pd.DataFrame(lignes)
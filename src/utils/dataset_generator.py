@@ -3,6 +3,8 @@
 
 import pandas as pd
 from tqdm import tqdm  # pip install tqdm pour barre de progression
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import os
 import sys
 
@@ -10,6 +12,33 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
+from src.utils.dataset_format import ecrire_blocs, format_depuis_nom
+
+
+def _simuler_bloc(tache) -> pd.DataFrame:
+    """
+    Simule un bloc du dataset (exécuté dans un processus du pool).
+
+    Args:
+        tache: Tuple (simulateur, condition, nombre d'échantillons)
+
+    Returns:
+        Le bloc d'échantillons, condition forcée
+    """
+    simulateur, cond, n = tache
+    lot = simulateur.simulate_batch(n)
+    lot["Condition"] = cond  # Forcer la condition
+    return lot
+
+
+def _ecrire_csv(blocs, chemin) -> int:
+    """Écrit des blocs successifs dans un seul CSV, en-tête au premier bloc."""
+    n_lignes = 0
+    with open(chemin, "w", newline="") as f:
+        for lot in blocs:
+            lot.to_csv(f, header=n_lignes == 0, index=False)
+            n_lignes += len(lot)
+    return n_lignes
 
 
 class DatasetGenerator:
@@ -17,26 +46,106 @@ class DatasetGenerator:
     Génère un dataset complet à partir du simulateur FH
     """
 
-    def __init__(self, simulateur: SimulateurFaisceauHertzien):
+    def __init__(self, simulateur: SimulateurFaisceauHertzien, taille_bloc: int = 100_000):
         self.simulateur = simulateur
+        self.taille_bloc = taille_bloc
 
-    def generer_dataset(self, n_samples_per_condition=1000, save_path="dataset_FH.csv"):
+    def _taches(self, n_samples_per_condition, seed=None) -> list:
         """
-        Génère un dataset pour toutes les conditions disponibles.
+        Découpe la génération en blocs de taille fixe, un flux aléatoire par bloc.
+
+        Le découpage ne dépend pas du nombre de workers : avec une même graine,
+        le dataset est identique bit à bit quel que soit le parallélisme.
+        """
+        conditions = self.simulateur.get_conditions_disponibles()
+        taches = []
+        for cond, sim_condition in zip(conditions, self.simulateur.spawn(len(conditions), seed=seed)):
+            tailles = [self.taille_bloc] * (n_samples_per_condition // self.taille_bloc)
+            if n_samples_per_condition % self.taille_bloc:
+                tailles.append(n_samples_per_condition % self.taille_bloc)
+            for sim_bloc, n in zip(sim_condition.spawn(len(tailles)), tailles):
+                taches.append((sim_bloc, cond, n))
+        return taches
+
+    def _iterer_blocs(self, n_samples_per_condition, seed=None, workers=1):
+        """
+        Produit les blocs du dataset dans l'ordre, en parallèle si workers > 1.
+
+        Au plus 2 blocs par worker sont en cours à un instant donné : la mémoire
+        reste bornée même si le consommateur (écriture disque) est plus lent.
+        """
+        taches = self._taches(n_samples_per_condition, seed)
+        if workers <= 1:
+            yield from map(_simuler_bloc, tqdm(taches))
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            en_cours = deque()
+            for tache in tqdm(taches):
+                en_cours.append(pool.submit(_simuler_bloc, tache))
+                if len(en_cours) >= 2 * workers:
+                    yield en_cours.popleft().result()
+            while en_cours:
+                yield en_cours.popleft().result()
+
+    def generer_flux(self, n_samples_per_condition=1000, seed=None, workers=1):
+        """
+        Génère le dataset sous forme de flux de blocs de taille fixe.
+
+        Args:
+            n_samples_per_condition: Le nombre d'échantillons par condition
+            seed: Graine pour une génération reproductible
+            workers: Le nombre de processus de génération
+
+        Returns:
+            Un itérateur de DataFrames d'au plus taille_bloc lignes
+        """
+        return self._iterer_blocs(n_samples_per_condition, seed, workers)
+
+    def ecrire_dataset(self, chemin, n_samples_per_condition=1000, seed=None, workers=1, format=None) -> int:
+        """
+        Génère le dataset et l'écrit bloc par bloc, sans jamais le garder en mémoire.
+
+        Args:
+            chemin: Le fichier de sortie
+            n_samples_per_condition: Le nombre d'échantillons par condition
+            seed: Graine pour une génération reproductible
+            workers: Le nombre de processus de génération
+            format: "parquet", "feather" ou "csv" ; déduit de l'extension si None
+
+        Returns:
+            Le nombre de lignes écrites
+        """
+        format = format or format_depuis_nom(chemin)
+
+        blocs = self.generer_flux(n_samples_per_condition, seed, workers)
+        if format == "csv":
+            n_lignes = _ecrire_csv(blocs, chemin)
+        elif format in ("parquet", "feather"):
+            n_lignes = ecrire_blocs(blocs, chemin, format)
+        else:
+            raise ValueError(f"Format de dataset inconnu : {format}")
+
+        print(f"Dataset généré avec succès : {chemin} ({n_lignes} lignes)")
+        return n_lignes
+
+    def generer_dataset(self, n_samples_per_condition=1000, save_path="dataset_FH.csv", seed=None, workers=1):
         """
-        all_data = []
+        Génère un dataset pour toutes les conditions disponibles.
 
+        Chaque condition, puis chaque bloc, reçoit son propre flux aléatoire
+        (SeedSequence.spawn) : avec une même graine, le dataset produit est
+        identique bit à bit. Avec workers > 1, les blocs sont répartis sur un
+        pool de processus puis fusionnés dans l'ordre.
+        """
         conditions = self.simulateur.get_conditions_disponibles()
         print(f"Génération du dataset FH pour {len(conditions)} conditions...")
 
-        for cond in conditions:
-            print(f"Simuler condition : {cond}")
-            for _ in tqdm(range(n_samples_per_condition)):
-                sample = self.simulateur.simulate_fh()
-                sample["Condition"] = cond  # Forcer la condition
-                all_data.append(sample)
-
-        df = pd.DataFrame(all_data)
+        all_data = list(self._iterer_blocs(n_samples_per_condition, seed, workers))
+        if all_data:
+            df = pd.concat(all_data, ignore_index=True)
+        else:
+            # Aucun bloc (0 échantillon) : DataFrame vide, mais avec les colonnes attendues
+            df = self.simulateur.simulate_batch(0)
 
         # Sauvegarde CSV
         df.to_csv(save_path, index=False)
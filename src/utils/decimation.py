@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Réduction du nombre de points des séries temporelles avant affichage.
+
+Deux méthodes, vectorisées avec NumPy :
+- "lttb" (Largest-Triangle-Three-Buckets) : garde la forme visuelle de la courbe ;
+- "minmax" : garde le minimum et le maximum de chaque intervalle, donc tous les pics.
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Nombre de points par défaut : lisible à l'écran, rapide à transmettre au navigateur
+NB_POINTS_AFFICHAGE = 1500
+
+
+def _bornes(n: int, nb_intervalles: int) -> np.ndarray:
+    """Découpe [0, n) en nb_intervalles intervalles contigus de tailles quasi égales."""
+    return np.linspace(0, n, nb_intervalles + 1).astype(np.intp)
+
+
+def indices_minmax(y, nb_points: int) -> np.ndarray:
+    """
+    Sélectionne le minimum et le maximum de chaque intervalle.
+
+    Args:
+        y: Les valeurs de la série
+        nb_points: Le nombre de points visé (deux par intervalle)
+
+    Returns:
+        Les indices retenus, croissants (premier et dernier point inclus)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= nb_points:
+        return np.arange(n)
+    taille = -(-n // max(nb_points // 2, 1))
+    nb_intervalles = -(-n // taille)
+    # Dernier intervalle complété par des NaN, ignorés par la sélection
+    rempli = np.full(nb_intervalles * taille, np.nan)
+    rempli[:n] = y
+    blocs = rempli.reshape(nb_intervalles, taille)
+    valide = ~np.isnan(blocs)
+    debut = np.arange(nb_intervalles) * taille
+    i_min = debut + np.where(valide, blocs, np.inf).argmin(axis=1)
+    i_max = debut + np.where(valide, blocs, -np.inf).argmax(axis=1)
+    indices = np.concatenate([[0], i_min, i_max, [n - 1]])
+    return np.unique(indices[indices < n])
+
+
+def indices_lttb(x, y, nb_points: int) -> np.ndarray:
+    """
+    Sélectionne les points par Largest-Triangle-Three-Buckets.
+
+    Dans chaque intervalle, le point retenu est celui qui forme le plus grand
+    triangle avec le point retenu précédent et la moyenne de l'intervalle
+    suivant. Le calcul des aires est vectorisé dans chaque intervalle.
+
+    Args:
+        x: Les abscisses (croissantes)
+        y: Les valeurs de la série
+        nb_points: Le nombre de points conservés (au moins 3)
+
+    Returns:
+        Les indices retenus, croissants (premier et dernier point inclus)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= nb_points or nb_points < 3:
+        return np.arange(n)
+
+    # Premier et dernier points fixes, n - 2 points répartis en nb_points - 2 intervalles
+    bornes = 1 + _bornes(n - 2, nb_points - 2)
+    sommes_x = np.add.reduceat(x[1:n - 1], bornes[:-1] - 1)
+    sommes_y = np.add.reduceat(y[1:n - 1], bornes[:-1] - 1)
+    tailles = np.diff(bornes)
+    # Moyenne de l'intervalle suivant (le dernier point pour le dernier intervalle)
+    moy_x = np.append(sommes_x[1:] / tailles[1:], x[-1])
+    moy_y = np.append(sommes_y[1:] / tailles[1:], y[-1])
+
+    indices = np.empty(nb_points, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    precedent = 0
+    for k in range(nb_points - 2):
+        debut, fin = bornes[k], bornes[k + 1]
+        ax, ay = x[precedent], y[precedent]
+        aires = np.abs((ax - moy_x[k]) * (y[debut:fin] - ay) - (ax - x[debut:fin]) * (moy_y[k] - ay))
+        # Un NaN ne doit pas être retenu s'il reste des valeurs dans l'intervalle
+        precedent = debut + int(np.nanargmax(aires)) if not np.isnan(aires).all() else debut
+        indices[k + 1] = precedent
+    return indices
+
+
+def decimer(x, y, nb_points: int = NB_POINTS_AFFICHAGE, methode: str = "lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Réduit une série à environ nb_points points pour l'affichage.
+
+    Les séries déjà assez courtes sont renvoyées telles quelles.
+
+    Args:
+        x: Les abscisses (croissantes)
+        y: Les valeurs de la série
+        nb_points: Le nombre de points visé
+        methode: "lttb" (forme de la courbe) ou "minmax" (tous les pics conservés)
+
+    Returns:
+        Les abscisses et les valeurs retenues
+
+    Raises:
+        ValueError: Si la méthode n'est pas reconnue
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if methode == "lttb":
+        indices = indices_lttb(x, y, nb_points)
+    elif methode == "minmax":
+        indices = indices_minmax(y, nb_points)
+    else:
+        raise ValueError(f"Méthode de décimation inconnue : {methode}")
+    return x[indices], y[indices]
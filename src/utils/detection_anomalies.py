@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Détection d'anomalies en flux : centre et dispersion glissants, mis à jour à chaque mesure.
+
+Trois estimateurs interchangeables :
+- "ewma" : moyenne et variance à pondération exponentielle, O(1) par mesure ;
+- "fenetre" : moyenne et variance des `taille` dernières mesures, O(1) par mesure ;
+- "robuste" : médiane et MAD des `taille` dernières mesures (deux tas), O(log taille).
+
+Chaque estimateur suit plusieurs séries à la fois (liaisons, paramètres, ou
+un tableau liaisons x paramètres) : une mesure est un tableau d'une valeur par série.
+"""
+
+import heapq
+import math
+from collections import Counter, deque
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+Forme = Union[int, Tuple[int, ...]]
+
+# Paramètres d'une liaison surveillés par défaut, et le sens d'une dégradation
+PARAMETRES_SURVEILLES = {"rssi": "bas", "snr": "bas", "ber": "haut", "disponibilite": "bas"}
+
+# Rapport entre l'écart type et la MAD pour une loi normale
+FACTEUR_MAD = 1.4826
+
+
+class StatistiquesEWMA:
+    """
+    Moyenne et variance à pondération exponentielle.
+
+    Les valeurs NaN sont ignorées (la série concernée n'est pas mise à jour).
+    """
+
+    def __init__(self, forme: Forme = 1, alpha: float = 0.1):
+        """
+        Initialise des statistiques vides.
+
+        Args:
+            forme: Le nombre de séries (ou la forme du tableau de séries)
+            alpha: Le poids de la nouvelle mesure (entre 0 et 1)
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha doit être compris entre 0 (exclu) et 1")
+        self.alpha = alpha
+        self.nb = np.zeros(forme, dtype=np.int64)
+        self.moyenne = np.zeros(forme)
+        self.variance = np.zeros(forme)
+
+    def ajouter(self, valeurs) -> None:
+        """
+        Ajoute une mesure par série.
+
+        Args:
+            valeurs: Un tableau de la forme des séries
+        """
+        x = np.asarray(valeurs, dtype=float)
+        valide = np.isfinite(x)
+        premiere = valide & (self.nb == 0)
+        suite = valide & (self.nb > 0)
+
+        delta = np.where(suite, x - self.moyenne, 0.0)
+        self.moyenne += self.alpha * delta
+        self.variance = np.where(suite, (1 - self.alpha) * (self.variance + self.alpha * delta ** 2), self.variance)
+        self.moyenne = np.where(premiere, x, self.moyenne)
+        self.nb += valide
+
+    @property
+    def centre(self) -> np.ndarray:
+        """La moyenne courante de chaque série."""
+        return self.moyenne
+
+    @property
+    def echelle(self) -> np.ndarray:
+        """L'écart type courant de chaque série."""
+        return np.sqrt(self.variance)
+
+
+class StatistiquesFenetre:
+    """
+    Moyenne et variance exactes des `taille` dernières mesures de chaque série.
+
+    Les mesures sont gardées dans un tampon circulaire ; à chaque ajout, la
+    plus ancienne sort des sommes (mise à jour de Welford dans les deux sens).
+    """
+
+    def __init__(self, forme: Forme = 1, taille: int = 30):
+        """
+        Initialise des statistiques vides.
+
+        Args:
+            forme: Le nombre de séries (ou la forme du tableau de séries)
+            taille: Le nombre de mesures de la fenêtre
+        """
+        if taille < 2:
+            raise ValueError("La fenêtre doit contenir au moins 2 mesures")
+        self.taille = taille
+        self.nb = np.zeros(forme, dtype=np.int64)
+        self.moyenne = np.zeros(forme)
+        self.m2 = np.zeros(forme)
+        self._valeurs = np.zeros((taille,) + self.nb.shape)
+        # Position d'écriture propre à chaque série (les NaN ne la font pas avancer)
+        self._position = np.zeros(forme, dtype=np.int64)
+        self._index = np.indices(self.nb.shape)
+
+    def ajouter(self, valeurs) -> None:
+        """
+        Ajoute une mesure par série.
+
+        Args:
+            valeurs: Un tableau de la forme des séries (NaN ignorés)
+        """
+        x = np.asarray(valeurs, dtype=float)
+        valide = np.isfinite(x)
+        plein = self.nb >= self.taille
+        ancienne = self._valeurs[(self._position,) + tuple(self._index)]
+        x = np.where(valide, x, 0.0)
+
+        # Fenêtre en cours de remplissage : ajout simple
+        croissant = valide & ~plein
+        nb = self.nb + croissant
+        delta = x - self.moyenne
+        moyenne = np.where(croissant, self.moyenne + delta / np.maximum(nb, 1), self.moyenne)
+        m2 = np.where(croissant, self.m2 + delta * (x - moyenne), self.m2)
+
+        # Fenêtre pleine : la nouvelle mesure remplace la plus ancienne
+        glissant = valide & plein
+        moyenne_g = self.moyenne + (x - ancienne) / self.taille
+        m2_g = self.m2 + (x - ancienne) * (x - moyenne_g + ancienne - self.moyenne)
+        self.moyenne = np.where(glissant, moyenne_g, moyenne)
+        self.m2 = np.maximum(np.where(glissant, m2_g, m2), 0.0)
+        self.nb = nb
+
+        ecriture = (self._position,) + tuple(self._index)
+        self._valeurs[ecriture] = np.where(valide, x, ancienne)
+        self._position = np.where(valide, (self._position + 1) % self.taille, self._position)
+
+    @property
+    def centre(self) -> np.ndarray:
+        """La moyenne de la fenêtre de chaque série."""
+        return self.moyenne
+
+    @property
+    def echelle(self) -> np.ndarray:
+        """L'écart type (n - 1) de la fenêtre de chaque série, 0 avant deux mesures."""
+        return np.sqrt(np.divide(self.m2, self.nb - 1, out=np.zeros_like(self.m2), where=self.nb > 1))
+
+
+class MedianeGlissante:
+    """
+    Médiane des `taille` dernières valeurs d'une série, par deux tas.
+
+    Le tas bas (max-tas, valeurs négées) garde la moitié inférieure, le tas
+    haut (min-tas) la moitié supérieure. Les valeurs sorties de la fenêtre
+    sont supprimées paresseusement, quand elles remontent au sommet d'un tas.
+    """
+
+    def __init__(self, taille: int):
+        """
+        Initialise une fenêtre vide.
+
+        Args:
+            taille: Le nombre de valeurs de la fenêtre
+        """
+        self.taille = taille
+        self._fenetre = deque()
+        self._bas = []
+        self._haut = []
+        self._a_supprimer = Counter()
+        # Nombre de valeurs encore dans la fenêtre, par tas
+        self._nb_bas = 0
+        self._nb_haut = 0
+
+    def __len__(self) -> int:
+        return len(self._fenetre)
+
+    def _nettoyer(self, tas: list, signe: int) -> None:
+        """Retire du sommet d'un tas les valeurs déjà sorties de la fenêtre."""
+        while tas and self._a_supprimer[signe * tas[0]]:
+            valeur = signe * heapq.heappop(tas)
+            self._a_supprimer[valeur] -= 1
+            if not self._a_supprimer[valeur]:
+                del self._a_supprimer[valeur]
+
+    def _equilibrer(self) -> None:
+        """Rétablit nb_bas == nb_haut ou nb_haut + 1."""
+        if self._nb_bas > self._nb_haut + 1:
+            heapq.heappush(self._haut, -heapq.heappop(self._bas))
+            self._nb_bas -= 1
+            self._nb_haut += 1
+            self._nettoyer(self._bas, -1)
+        elif self._nb_bas < self._nb_haut:
+            heapq.heappush(self._bas, -heapq.heappop(self._haut))
+            self._nb_bas += 1
+            self._nb_haut -= 1
+            self._nettoyer(self._haut, 1)
+
+    def ajouter(self, valeur: float) -> None:
+        """
+        Ajoute une valeur, en retirant la plus ancienne si la fenêtre est pleine.
+
+        Args:
+            valeur: La nouvelle valeur
+        """
+        if self._bas and valeur <= -self._bas[0]:
+            heapq.heappush(self._bas, -valeur)
+            self._nb_bas += 1
+        else:
+            heapq.heappush(self._haut, valeur)
+            self._nb_haut += 1
+        self._fenetre.append(valeur)
+
+        if len(self._fenetre) > self.taille:
+            sortante = self._fenetre.popleft()
+            self._a_supprimer[sortante] += 1
+            if sortante <= -self._bas[0]:
+                self._nb_bas -= 1
+                self._nettoyer(self._bas, -1)
+            else:
+                self._nb_haut -= 1
+                self._nettoyer(self._haut, 1)
+        self._equilibrer()
+
+    @property
+    def mediane(self) -> float:
+        """La médiane de la fenêtre (NaN si elle est vide)."""
+        if not self._fenetre:
+            return math.nan
+        if self._nb_bas > self._nb_haut:
+            return -self._bas[0]
+        return (-self._bas[0] + self._haut[0]) / 2
+
+
+class StatistiquesRobustes:
+    """
+    Médiane et MAD glissantes, insensibles aux valeurs aberrantes isolées.
+
+    La MAD est approchée : l'écart de chaque mesure est pris par rapport à
+    la médiane au moment de son arrivée, ce qui évite de reprendre toute la
+    fenêtre quand la médiane bouge. Les séries sont traitées une à une :
+    réservé à quelques séries (les paramètres d'une liaison), les
+    estimateurs "ewma" et "fenetre" étant vectorisés pour un parc entier.
+    """
+
+    def __init__(self, forme: Forme = 1, taille: int = 31):
+        """
+        Initialise des statistiques vides.
+
+        Args:
+            forme: Le nombre de séries (ou la forme du tableau de séries)
+            taille: Le nombre de mesures de la fenêtre
+        """
+        self.taille = taille
+        self.nb = np.zeros(forme, dtype=np.int64)
+        nb_series = self.nb.size
+        self._medianes = [MedianeGlissante(taille) for _ in range(nb_series)]
+        self._ecarts = [MedianeGlissante(taille) for _ in range(nb_series)]
+        self._centre = np.full(nb_series, np.nan)
+        self._mad = np.zeros(nb_series)
+
+    def ajouter(self, valeurs) -> None:
+        """
+        Ajoute une mesure par série.
+
+        Args:
+            valeurs: Un tableau de la forme des séries (NaN ignorés)
+        """
+        x = np.asarray(valeurs, dtype=float).ravel()
+        for i in np.flatnonzero(np.isfinite(x)):
+            valeur = float(x[i])
+            mediane = self._medianes[i]
+            mediane.ajouter(valeur)
+            self._centre[i] = mediane.mediane
+            ecarts = self._ecarts[i]
+            ecarts.ajouter(abs(valeur - self._centre[i]))
+            self._mad[i] = ecarts.mediane
+        self.nb += np.isfinite(x).reshape(self.nb.shape) & (self.nb < self.taille)
+
+    @property
+    def centre(self) -> np.ndarray:
+        """La médiane de la fenêtre de chaque série."""
+        return self._centre.reshape(self.nb.shape)
+
+    @property
+    def echelle(self) -> np.ndarray:
+        """La MAD ramenée à un écart type (x 1.4826) de chaque série."""
+        return (FACTEUR_MAD * self._mad).reshape(self.nb.shape)
+
+
+ESTIMATEURS = {
+    "ewma": StatistiquesEWMA,
+    "fenetre": StatistiquesFenetre,
+    "robuste": StatistiquesRobustes,
+}
+
+
+class DetecteurAnomalies:
+    """
+    Signale les mesures qui s'écartent de plus de `seuil` dispersions du centre courant.
+
+    Chaque mesure est comparée aux statistiques des mesures précédentes,
+    puis y est ajoutée : le coût par mesure ne dépend pas de la longueur
+    de l'historique.
+    """
+
+    def __init__(self, methode: str = "ewma", forme: Forme = 1, seuil: float = 3.0,
+                 sens: Union[str, Sequence[str]] = "deux", min_mesures: int = 5, **options):
+        """
+        Initialise le détecteur.
+
+        Args:
+            methode: L'estimateur ("ewma", "fenetre" ou "robuste")
+            forme: Le nombre de séries (ou la forme du tableau de séries)
+            seuil: L'écart au centre, en nombre de dispersions, au-delà duquel une mesure est anormale
+            sens: "bas", "haut" ou "deux", ou un sens par série (diffusé sur le dernier axe)
+            min_mesures: Le nombre de mesures d'une série avant de signaler des anomalies
+            options: Les paramètres de l'estimateur (alpha pour "ewma", taille sinon)
+
+        Raises:
+            ValueError: Si la méthode ou un sens est inconnu
+        """
+        if methode not in ESTIMATEURS:
+            raise ValueError(f"Méthode inconnue : {methode} (attendu : {', '.join(ESTIMATEURS)})")
+        sens = np.asarray(sens, dtype=object)
+        if not np.isin(sens, ["bas", "haut", "deux"]).all():
+            raise ValueError("Le sens doit être 'bas', 'haut' ou 'deux'")
+        self.methode = methode
+        self.statistiques = ESTIMATEURS[methode](forme, **options)
+        self.seuil = seuil
+        self.min_mesures = min_mesures
+        self._bas = sens != "haut"
+        self._haut = sens != "bas"
+        self.scores = np.zeros(self.statistiques.nb.shape)
+
+    def evaluer(self, valeurs) -> np.ndarray:
+        """
+        Évalue une mesure par série, puis l'ajoute aux statistiques.
+
+        Args:
+            valeurs: Un tableau de la forme des séries
+
+        Returns:
+            Un masque booléen des séries en anomalie (les écarts sont dans self.scores)
+        """
+        x = np.asarray(valeurs, dtype=float)
+        echelle = self.statistiques.echelle
+        ecart = x - self.statistiques.centre
+        # Dispersion nulle (série constante jusqu'ici) : tout écart est infini
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.scores = np.where(echelle > 0, ecart / np.where(echelle > 0, echelle, 1.0),
+                                   np.sign(ecart) * np.inf)
+        self.scores[ecart == 0] = 0.0
+        anomalies = (self.statistiques.nb >= self.min_mesures) & (
+            (self._bas & (self.scores < -self.seuil)) | (self._haut & (self.scores > self.seuil))
+        )
+        self.statistiques.ajouter(x)
+        return anomalies
+
+
+class SurveillanceMesures:
+    """
+    Détecteur d'anomalies d'une liaison, lisant directement les mesures du simulateur.
+    """
+
+    def __init__(self, parametres: Dict[str, str] = PARAMETRES_SURVEILLES,
+                 methode: str = "robuste", seuil: float = 3.0, **options):
+        """
+        Initialise la surveillance.
+
+        Args:
+            parametres: Les clés surveillées de la mesure, et le sens d'une dégradation
+            methode: L'estimateur ("ewma", "fenetre" ou "robuste")
+            seuil: L'écart au centre, en nombre de dispersions
+            options: Les autres paramètres de DetecteurAnomalies
+        """
+        self.parametres = list(parametres)
+        self.detecteur = DetecteurAnomalies(methode, len(self.parametres), seuil,
+                                            sens=list(parametres.values()), **options)
+
+    def evaluer(self, mesure: Dict[str, float]) -> Tuple[str, ...]:
+        """
+        Évalue une mesure.
+
+        Args:
+            mesure: La mesure (dict produit par generer_mesure)
+
+        Returns:
+            Les paramètres en anomalie (tuple vide si aucun)
+        """
+        valeurs = [mesure.get(nom, math.nan) for nom in self.parametres]
+        anomalies = self.detecteur.evaluer(valeurs)
+        return tuple(nom for nom, anomalie in zip(self.parametres, anomalies) if anomalie)
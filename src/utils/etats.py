@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+États des liaisons : étiquettes canoniques et score de qualité.
+
+Le modèle IA, le simulateur et les pages Streamlit n'écrivent pas les états
+de la même façon ("DEGRADE", "Dégradé", "Dégradée"...). Toutes les sources
+sont ramenées aux trois étiquettes de ETATS avant d'être comptées ou stockées.
+"""
+
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable
+
+ETATS = ["OK", "Dégradé", "KO"]
+
+# Pondération du score de qualité : OK compte pour 1, Dégradé pour 0.5, KO pour 0
+POIDS_QUALITE = {"OK": 1.0, "Dégradé": 0.5, "KO": 0.0}
+
+
+@lru_cache(maxsize=256)
+def etat_canonique(etat) -> str:
+    """
+    Ramène une étiquette d'état à "OK", "Dégradé" ou "KO".
+
+    Args:
+        etat: L'étiquette brute (casse, accents et suffixes indifférents)
+
+    Returns:
+        L'étiquette canonique (KO pour une valeur absente ou inconnue)
+    """
+    if etat is None:
+        return "KO"
+    texte = unicodedata.normalize("NFKD", str(etat).lower().strip())
+    texte = "".join(ch for ch in texte if not unicodedata.combining(ch))
+    if "ok" in texte:
+        return "OK"
+    if "deg" in texte:
+        return "Dégradé"
+    return "KO"
+
+
+def compter_etats(etats: Iterable) -> Dict[str, int]:
+    """
+    Compte les états, en une passe, après passage aux étiquettes canoniques.
+
+    Args:
+        etats: Les étiquettes brutes
+
+    Returns:
+        Un dict état -> nombre, avec les trois états de ETATS
+    """
+    comptes = Counter(etats)
+    resultat = dict.fromkeys(ETATS, 0)
+    for etat, nb in comptes.items():
+        resultat[etat_canonique(etat)] += nb
+    return resultat
+
+
+def score_qualite(nb_ok: int, nb_degrade: int, nb_ko: int) -> float:
+    """
+    Calcule le score de qualité pondéré (entre 0 et 1).
+
+    Args:
+        nb_ok: Le nombre de mesures OK
+        nb_degrade: Le nombre de mesures dégradées
+        nb_ko: Le nombre de mesures KO
+
+    Returns:
+        (OK * 1 + Dégradé * 0.5 + KO * 0) / total, 0 si aucune mesure
+    """
+    total = nb_ok + nb_degrade + nb_ko
+    if total == 0:
+        return 0.0
+    return (nb_ok * POIDS_QUALITE["OK"] + nb_degrade * POIDS_QUALITE["Dégradé"]
+            + nb_ko * POIDS_QUALITE["KO"]) / total
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant la classe StockageMesures, historique persistant des mesures et des états prédits.
+"""
+
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Union
+from src.utils.etats import etat_canonique, score_qualite
+
+CHEMIN_HISTORIQUE = "historique_fh.db"
+
+# Largeur (en secondes) des fenêtres pré-agrégées
+GRANULARITES = {"minute": 60, "heure": 3600, "jour": 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    nom TEXT,
+    debut REAL,
+    fin REAL
+);
+CREATE TABLE IF NOT EXISTS mesures (
+    ts REAL NOT NULL,
+    liaison TEXT NOT NULL,
+    session INTEGER REFERENCES sessions(id),
+    rssi REAL,
+    snr REAL,
+    ber REAL,
+    disponibilite REAL,
+    etat TEXT,
+    condition TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mesures_ts ON mesures(ts);
+CREATE INDEX IF NOT EXISTS idx_mesures_liaison_ts ON mesures(liaison, ts);
+CREATE INDEX IF NOT EXISTS idx_mesures_session_ts ON mesures(session, ts);
+CREATE TABLE IF NOT EXISTS agregats (
+    granularite INTEGER NOT NULL,
+    debut REAL NOT NULL,
+    liaison TEXT NOT NULL,
+    nb INTEGER NOT NULL,
+    nb_ok INTEGER NOT NULL,
+    nb_degrade INTEGER NOT NULL,
+    nb_ko INTEGER NOT NULL,
+    somme_rssi REAL, min_rssi REAL, max_rssi REAL, nb_rssi INTEGER NOT NULL,
+    somme_snr REAL, min_snr REAL, max_snr REAL, nb_snr INTEGER NOT NULL,
+    PRIMARY KEY (granularite, liaison, debut)
+);
+CREATE INDEX IF NOT EXISTS idx_agregats_debut ON agregats(granularite, debut);
+"""
+
+# Cumul des mesures d'id > ? dans les fenêtres de largeur ? (une requête par granularité)
+CUMUL_AGREGATS = """
+INSERT INTO agregats
+SELECT :g, CAST(ts / :g AS INTEGER) * :g AS fenetre, liaison, COUNT(*),
+       SUM(etat = 'OK'), SUM(etat = 'Dégradé'), SUM(etat = 'KO'),
+       SUM(rssi), MIN(rssi), MAX(rssi), COUNT(rssi),
+       SUM(snr), MIN(snr), MAX(snr), COUNT(snr)
+FROM mesures WHERE rowid > :depuis
+GROUP BY fenetre, liaison
+ON CONFLICT (granularite, liaison, debut) DO UPDATE SET
+    nb = nb + excluded.nb,
+    nb_ok = nb_ok + excluded.nb_ok,
+    nb_degrade = nb_degrade + excluded.nb_degrade,
+    nb_ko = nb_ko + excluded.nb_ko,
+    somme_rssi = COALESCE(somme_rssi, 0) + COALESCE(excluded.somme_rssi, 0),
+    min_rssi = MIN(COALESCE(min_rssi, excluded.min_rssi), COALESCE(excluded.min_rssi, min_rssi)),
+    max_rssi = MAX(COALESCE(max_rssi, excluded.max_rssi), COALESCE(excluded.max_rssi, max_rssi)),
+    nb_rssi = nb_rssi + excluded.nb_rssi,
+    somme_snr = COALESCE(somme_snr, 0) + COALESCE(excluded.somme_snr, 0),
+    min_snr = MIN(COALESCE(min_snr, excluded.min_snr), COALESCE(excluded.min_snr, min_snr)),
+    max_snr = MAX(COALESCE(max_snr, excluded.max_snr), COALESCE(excluded.max_snr, max_snr)),
+    nb_snr = nb_snr + excluded.nb_snr
+"""
+
+COLONNES = ["ts", "liaison", "session", "rssi", "snr", "ber", "disponibilite", "etat", "condition"]
+
+
+class StockageMesures:
+    """
+    Historique des mesures sur disque (SQLite en mode WAL), en ajout seul.
+
+    Les mesures sont accumulées en mémoire et écrites par lots, en une
+    transaction, dès que le lot est plein ou que le délai maximal est
+    dépassé. Les lectures par plage de temps, liaison ou session passent
+    par les index.
+
+    Chaque lot met aussi à jour, dans la même transaction, des agrégats
+    par minute, heure et jour (comptes par état, somme/min/max du RSSI et
+    du SNR) : les tableaux de bord interrogent ces fenêtres au lieu de
+    relire toutes les mesures.
+    """
+
+    def __init__(self, chemin: str = CHEMIN_HISTORIQUE, taille_lot: int = 1000, delai_max: float = 2.0):
+        """
+        Ouvre (ou crée) l'historique.
+
+        Args:
+            chemin: Le fichier SQLite
+            taille_lot: Le nombre de mesures écrites par transaction
+            delai_max: Le délai maximal (en secondes) avant l'écriture d'un lot incomplet
+        """
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self.delai_max = delai_max
+        # Une connexion partagée entre threads, protégée par le verrou
+        self.connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+        self._verrou = threading.Lock()
+        self._lot = []
+        self._derniere_ecriture = time.monotonic()
+        # Historique créé avant les agrégats : ils sont calculés une fois
+        with self._verrou:
+            vide = self.connexion.execute("SELECT 1 FROM agregats LIMIT 1").fetchone() is None
+            if vide and self.connexion.execute("SELECT 1 FROM mesures LIMIT 1").fetchone():
+                self._reconstruire_agregats()
+
+    def __enter__(self) -> "StockageMesures":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def creer_session(self, nom: str, debut: Optional[float] = None) -> int:
+        """
+        Crée une session (ex. une démonstration) à laquelle rattacher des mesures.
+
+        Args:
+            nom: Le nom affiché de la session
+            debut: L'horodatage de début (maintenant si None)
+
+        Returns:
+            L'identifiant de la session
+        """
+        with self._verrou, self.connexion:
+            curseur = self.connexion.execute(
+                "INSERT INTO sessions (nom, debut) VALUES (?, ?)", (nom, time.time() if debut is None else debut)
+            )
+            return curseur.lastrowid
+
+    def ajouter(self, liaison: str, rssi: float, snr: float, ber: float, disponibilite: float,
+                etat: str, timestamp: Optional[float] = None, condition: Optional[str] = None,
+                session: Optional[int] = None) -> None:
+        """
+        Ajoute une mesure au lot en cours.
+
+        Args:
+            liaison: L'identifiant de la liaison
+            rssi: Le RSSI en dBm
+            snr: Le SNR en dB
+            ber: Le taux d'erreur binaire
+            disponibilite: La disponibilité en %
+            etat: L'état prédit
+            timestamp: L'horodatage (time.time()), maintenant si None
+            condition: La condition de simulation
+            session: La session de rattachement
+        """
+        ligne = (time.time() if timestamp is None else float(timestamp), liaison, session,
+                 float(rssi), float(snr), float(ber), float(disponibilite), etat_canonique(etat), condition)
+        with self._verrou:
+            self._lot.append(ligne)
+            if len(self._lot) >= self.taille_lot or time.monotonic() - self._derniere_ecriture >= self.delai_max:
+                self._ecrire()
+
+    def ajouter_lot(self, liaison: Sequence[str], rssi, snr, ber, disponibilite, etat,
+                    timestamp=None, condition=None, session: Optional[int] = None) -> None:
+        """
+        Ajoute les mesures de plusieurs liaisons (tableaux de même longueur) et les écrit.
+
+        Args:
+            liaison: Les identifiants des liaisons
+            rssi, snr, ber, disponibilite, etat: Une valeur par liaison
+            timestamp: Un horodatage commun ou un par liaison (maintenant si None)
+            condition: Une condition commune ou une par liaison
+            session: La session de rattachement
+        """
+        n = len(liaison)
+        colonnes = [
+            np.broadcast_to(time.time() if timestamp is None else timestamp, n).astype(float).tolist(),
+            np.asarray(liaison).tolist(),
+            [session] * n,
+            np.asarray(rssi, dtype=float).tolist(),
+            np.asarray(snr, dtype=float).tolist(),
+            np.asarray(ber, dtype=float).tolist(),
+            np.asarray(disponibilite, dtype=float).tolist(),
+            [etat_canonique(e) for e in np.asarray(etat, dtype=object).tolist()],
+            np.broadcast_to(np.asarray(condition, dtype=object), n).tolist(),
+        ]
+        with self._verrou:
+            self._lot.extend(zip(*colonnes))
+            self._ecrire()
+
+    def enregistrer_parc(self, moteur) -> None:
+        """
+        Abonné pour MoteurSupervision : enregistre l'état de toutes les liaisons après un tick.
+
+        Args:
+            moteur: Le MoteurSupervision qui vient d'avancer
+        """
+        self.ajouter_lot(moteur.noms, moteur.rssi, moteur.snr, moteur.ber, moteur.disponibilite,
+                         moteur.etat, timestamp=moteur.horodatage, condition=moteur.conditions)
+
+    def _ecrire(self) -> None:
+        """Écrit le lot en cours et cumule ses agrégats, en une transaction (appelé sous verrou)."""
+        if self._lot:
+            with self.connexion:
+                depuis = self.connexion.execute("SELECT COALESCE(MAX(rowid), 0) FROM mesures").fetchone()[0]
+                self.connexion.executemany(
+                    f"INSERT INTO mesures ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})",
+                    self._lot
+                )
+                self._cumuler(depuis)
+            self._lot = []
+        self._derniere_ecriture = time.monotonic()
+
+    def _cumuler(self, depuis: int) -> None:
+        """Ajoute aux agrégats les mesures d'id supérieur à depuis (appelé sous verrou)."""
+        for largeur in GRANULARITES.values():
+            self.connexion.execute(CUMUL_AGREGATS, {"g": largeur, "depuis": depuis})
+
+    def _reconstruire_agregats(self) -> None:
+        """Recalcule tous les agrégats depuis les mesures (appelé sous verrou)."""
+        with self.connexion:
+            self.connexion.execute("DELETE FROM agregats")
+            self._cumuler(0)
+
+    def ecrire(self) -> None:
+        """Écrit immédiatement les mesures en attente."""
+        with self._verrou:
+            self._ecrire()
+
+    def terminer_session(self, session: int, fin: Optional[float] = None) -> None:
+        """
+        Enregistre la fin d'une session.
+
+        Args:
+            session: L'identifiant de la session
+            fin: L'horodatage de fin (maintenant si None)
+        """
+        with self._verrou:
+            self._ecrire()
+            with self.connexion:
+                self.connexion.execute("UPDATE sessions SET fin = ? WHERE id = ?",
+                                       (time.time() if fin is None else fin, session))
+
+    def lire(self, debut: Optional[float] = None, fin: Optional[float] = None,
+             liaison: Optional[str] = None, session: Optional[int] = None) -> pd.DataFrame:
+        """
+        Lit les mesures d'une plage de temps, triées par horodatage.
+
+        Args:
+            debut: L'horodatage minimal (inclus)
+            fin: L'horodatage maximal (exclu)
+            liaison: Ne garder qu'une liaison
+            session: Ne garder qu'une session
+
+        Returns:
+            Un DataFrame avec les colonnes de COLONNES
+        """
+        conditions, parametres = [], []
+        for colonne, operateur, valeur in [("ts", ">=", debut), ("ts", "<", fin),
+                                           ("liaison", "=", liaison), ("session", "=", session)]:
+            if valeur is not None:
+                conditions.append(f"{colonne} {operateur} ?")
+                parametres.append(valeur)
+        requete = f"SELECT {', '.join(COLONNES)} FROM mesures"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " ORDER BY ts"
+        with self._verrou:
+            self._ecrire()
+            return pd.read_sql_query(requete, self.connexion, params=parametres)
+
+    def sessions(self) -> pd.DataFrame:
+        """
+        Liste les sessions enregistrées.
+
+        Returns:
+            Un DataFrame (id, nom, debut, fin, nb_mesures)
+        """
+        with self._verrou:
+            self._ecrire()
+            return pd.read_sql_query(
+                "SELECT s.id, s.nom, s.debut, s.fin, "
+                "(SELECT COUNT(*) FROM mesures m WHERE m.session = s.id) AS nb_mesures "
+                "FROM sessions s ORDER BY s.id", self.connexion
+            )
+
+    def agreger(self, granularite: Union[str, int] = "minute", debut: Optional[float] = None,
+                fin: Optional[float] = None, liaison: Optional[str] = None) -> pd.DataFrame:
+        """
+        Renvoie les fenêtres pré-agrégées d'une plage de temps.
+
+        Les fenêtres sont alignées sur leur largeur : une fenêtre est incluse
+        si son début est dans [debut, fin).
+
+        Args:
+            granularite: "minute", "heure", "jour" (ou leur largeur en secondes)
+            debut: L'horodatage minimal
+            fin: L'horodatage maximal (exclu)
+            liaison: Une seule liaison (toutes les liaisons cumulées si None)
+
+        Returns:
+            Un DataFrame par fenêtre : debut, nb, nb_ok, nb_degrade, nb_ko,
+            rssi_moy/min/max, snr_moy/min/max et score (qualité pondérée, 0 à 1)
+
+        Raises:
+            ValueError: Si la granularité n'est pas pré-agrégée
+        """
+        df = self._lire_agregats(granularite, debut, fin, liaison, par_fenetre=True)
+        df["score"] = [score_qualite(*comptes) for comptes in
+                       zip(df["nb_ok"], df["nb_degrade"], df["nb_ko"])]
+        return df
+
+    def resume(self, debut: Optional[float] = None, fin: Optional[float] = None,
+               liaison: Optional[str] = None, granularite: Union[str, int] = "minute") -> Dict[str, float]:
+        """
+        Résume une plage de temps à partir des fenêtres pré-agrégées.
+
+        Args:
+            debut: L'horodatage minimal (arrondi à la fenêtre)
+            fin: L'horodatage maximal (exclu, arrondi à la fenêtre)
+            liaison: Une seule liaison (toutes si None)
+            granularite: La finesse des fenêtres lues (plus large = plus rapide)
+
+        Returns:
+            Un dict : nb, nb_ok, nb_degrade, nb_ko, rssi_moy/min/max, snr_moy/min/max, score
+        """
+        ligne = self._lire_agregats(granularite, debut, fin, liaison, par_fenetre=False).iloc[0]
+        resume = {col: int(ligne[col] or 0) for col in ["nb", "nb_ok", "nb_degrade", "nb_ko"]}
+        resume.update({col: float(ligne[col]) if ligne[col] is not None else np.nan
+                       for col in ["rssi_moy", "rssi_min", "rssi_max", "snr_moy", "snr_min", "snr_max"]})
+        resume["score"] = score_qualite(resume["nb_ok"], resume["nb_degrade"], resume["nb_ko"])
+        return resume
+
+    def _lire_agregats(self, granularite: Union[str, int], debut: Optional[float], fin: Optional[float],
+                       liaison: Optional[str], par_fenetre: bool) -> pd.DataFrame:
+        """Cumule les agrégats d'une plage, par fenêtre ou en une seule ligne."""
+        largeur = GRANULARITES.get(granularite, granularite)
+        if largeur not in GRANULARITES.values():
+            raise ValueError(f"Granularité non agrégée : {granularite}")
+        conditions, parametres = ["granularite = ?"], [largeur]
+        for colonne, operateur, valeur in [("debut", ">=", debut), ("debut", "<", fin), ("liaison", "=", liaison)]:
+            if valeur is not None:
+                conditions.append(f"{colonne} {operateur} ?")
+                parametres.append(valeur)
+        requete = (
+            "SELECT " + ("debut, " if par_fenetre else "")
+            + "SUM(nb) AS nb, SUM(nb_ok) AS nb_ok, SUM(nb_degrade) AS nb_degrade, "
+            "SUM(nb_ko) AS nb_ko, SUM(somme_rssi) / SUM(nb_rssi) AS rssi_moy, MIN(min_rssi) AS rssi_min, "
+            "MAX(max_rssi) AS rssi_max, SUM(somme_snr) / SUM(nb_snr) AS snr_moy, MIN(min_snr) AS snr_min, "
+            "MAX(max_snr) AS snr_max FROM agregats WHERE " + " AND ".join(conditions)
+            + (" GROUP BY debut ORDER BY debut" if par_fenetre else "")
+        )
+        with self._verrou:
+            self._ecrire()
+            return pd.read_sql_query(requete, self.connexion, params=parametres)
+
+    def resume_sessions(self) -> pd.DataFrame:
+        """
+        Résume chaque session : comptes par état et score, en une requête.
+
+        Returns:
+            Un DataFrame (id, nom, debut, fin, nb, nb_ok, nb_degrade, nb_ko, score)
+        """
+        with self._verrou:
+            self._ecrire()
+            df = pd.read_sql_query(
+                "SELECT s.id, s.nom, s.debut, s.fin, COUNT(m.ts) AS nb, "
+                "COALESCE(SUM(m.etat = 'OK'), 0) AS nb_ok, COALESCE(SUM(m.etat = 'Dégradé'), 0) AS nb_degrade, "
+                "COALESCE(SUM(m.etat = 'KO'), 0) AS nb_ko "
+                "FROM sessions s LEFT JOIN mesures m ON m.session = s.id GROUP BY s.id ORDER BY s.id",
+                self.connexion
+            )
+        df["score"] = [score_qualite(*comptes) for comptes in
+                       zip(df["nb_ok"], df["nb_degrade"], df["nb_ko"])]
+        return df
+
+    def supprimer_sessions(self, ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Supprime des sessions et leurs mesures, puis reconstruit les agrégats.
+
+        Args:
+            ids: Les identifiants des sessions à supprimer (toutes si None)
+        """
+        if ids is not None:
+            ids = [int(i) for i in ids]
+            if not ids:
+                return
+        with self._verrou:
+            self._ecrire()
+            with self.connexion:
+                if ids is None:
+                    self.connexion.execute("DELETE FROM mesures WHERE session IS NOT NULL")
+                    self.connexion.execute("DELETE FROM sessions")
+                else:
+                    marques = ", ".join("?" * len(ids))
+                    self.connexion.execute(f"DELETE FROM mesures WHERE session IN ({marques})", ids)
+                    self.connexion.execute(f"DELETE FROM sessions WHERE id IN ({marques})", ids)
+            self._reconstruire_agregats()
+
+    def fermer(self) -> None:
+        """Écrit les mesures en attente et ferme le fichier."""
+        with self._verrou:
+            self._ecrire()
+            self.connexion.close()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module contenant la classe TamponCirculaire pour l'historique des mesures en temps réel.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+
+class TamponCirculaire:
+    """
+    Historique de capacité fixe, stocké en colonnes NumPy préallouées.
+
+    Chaque valeur est écrite deux fois (en i et en i + capacite) : les n
+    dernières valeurs forment toujours une tranche contiguë, donc une fenêtre
+    est une simple vue, sans copie ni concaténation. L'ajout est en O(1) et
+    la mémoire ne dépend pas de la durée de fonctionnement.
+    """
+
+    def __init__(self, capacite: int, colonnes: Dict[str, Any]):
+        """
+        Initialise le tampon.
+
+        Args:
+            capacite: Le nombre maximal de points conservés
+            colonnes: Le dtype de chaque colonne, ex. {"rssi": float, "etat": object}
+        """
+        self.capacite = capacite
+        self.colonnes = list(colonnes)
+        self._donnees = {nom: np.empty(2 * capacite, dtype=dtype) for nom, dtype in colonnes.items()}
+        self._position = 0
+        self._taille = 0
+
+    def __len__(self) -> int:
+        return self._taille
+
+    def ajouter(self, **valeurs) -> None:
+        """
+        Ajoute un point, en écrasant le plus ancien si le tampon est plein.
+
+        Args:
+            valeurs: Une valeur par colonne
+        """
+        i = self._position
+        for nom, valeur in valeurs.items():
+            colonne = self._donnees[nom]
+            colonne[i] = valeur
+            colonne[i + self.capacite] = valeur
+        self._position = (i + 1) % self.capacite
+        if self._taille < self.capacite:
+            self._taille += 1
+
+    def colonne(self, nom: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Renvoie les n derniers points d'une colonne, du plus ancien au plus récent.
+
+        Args:
+            nom: La colonne
+            n: Le nombre de points (tous si None)
+
+        Returns:
+            Une vue en lecture seule sur le tampon
+        """
+        n = self._taille if n is None else min(n, self._taille)
+        fin = self._position + self.capacite
+        vue = self._donnees[nom][fin - n:fin]
+        vue.flags.writeable = False
+        return vue
+
+    def fenetre(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Renvoie les n derniers points de toutes les colonnes.
+
+        Args:
+            n: Le nombre de points (tous si None)
+
+        Returns:
+            Un dict colonne -> vue en lecture seule
+        """
+        return {nom: self.colonne(nom, n) for nom in self.colonnes}
+
+    def dernier(self) -> Dict[str, Any]:
+        """
+        Renvoie le point le plus récent.
+
+        Raises:
+            IndexError: Si le tampon est vide
+        """
+        if self._taille == 0:
+            raise IndexError("Le tampon est vide")
+        i = self._position - 1 + self.capacite
+        return {nom: self._donnees[nom][i] for nom in self.colonnes}
+
+    def vider(self) -> None:
+        """Oublie tous les points, sans réallouer."""
+        self._position = 0
+        self._taille = 0
+
+    def vers_dataframe(self, n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Copie les n derniers points dans un DataFrame (pour l'export, pas pour chaque tick).
+
+        Args:
+            n: Le nombre de points (tous si None)
+        """
+        return pd.DataFrame({nom: np.array(vue) for nom, vue in self.fenetre(n).items()})
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la forêt compilée : mêmes prédictions que la forêt sklearn d'origine.
+"""
+
+import os
+import sys
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ia import foret_compilee
+from src.ia.artefacts import SUFFIXE_COMPILE, charger_artefact, compile_a_jour, sauvegarder_artefact
+from src.ia.foret_compilee import PROFONDEUR_MAX_CODE, ForetCompilee
+from src.ia.modele import ModeleIA
+
+FEATURES = ["rssi", "snr", "ber", "disponibilite"]
+
+
+def _foret(n: int = 3000, n_arbres: int = 20):
+    """Forêt entraînée sur un jeu bruité à trois classes, et des lignes à prédire."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n, 4)) * [10.0, 5.0, 1e-4, 2.0] + [-60.0, 20.0, 1e-4, 99.0]
+    score = (X[:, 0] + 60) / 10 + (X[:, 1] - 20) / 5 + rng.normal(size=n)
+    y = np.where(score > 0.7, "OK", np.where(score > -0.7, "Dégradé", "KO"))
+    foret = RandomForestClassifier(n_estimators=n_arbres, random_state=42).fit(X, y)
+    return foret, rng.normal(size=(2000, 4)) * [10.0, 5.0, 1e-4, 2.0] + [-60.0, 20.0, 1e-4, 99.0]
+
+
+def _verifier(foret, compilee: ForetCompilee, X: np.ndarray) -> None:
+    """Compare predict, predict_proba et predire_un à la forêt sklearn."""
+    attendu = foret.predict(X)
+    np.testing.assert_array_equal(compilee.predict(X), attendu)
+    np.testing.assert_allclose(compilee.predict_proba(X), foret.predict_proba(X), rtol=0, atol=1e-12)
+    assert [compilee.predire_un(*ligne) for ligne in X[:300]] == attendu[:300].tolist()
+
+
+def test_code_genere_identique_a_sklearn():
+    """Forêt de taille courante : évaluateur en code généré."""
+    foret, X = _foret()
+    compilee = ForetCompilee.depuis_sklearn(foret, FEATURES)
+    compilee.preparer()
+    assert compilee._evaluateur.__code__.co_filename == "<foret_compilee>"
+    _verifier(foret, compilee, X)
+
+
+def test_parcours_de_listes_si_trop_de_noeuds(monkeypatch):
+    """Au-delà de NOEUDS_MAX_CODE nœuds, l'évaluateur de repli donne les mêmes étiquettes."""
+    monkeypatch.setattr(foret_compilee, "NOEUDS_MAX_CODE", 100)
+    foret, X = _foret()
+    compilee = ForetCompilee.depuis_sklearn(foret, FEATURES)
+    compilee.preparer()
+    assert compilee._evaluateur.__code__.co_filename != "<foret_compilee>"
+    _verifier(foret, compilee, X)
+
+
+def test_parcours_de_listes_si_arbres_trop_profonds():
+    """Arbres plus profonds que PROFONDEUR_MAX_CODE : repli sur le parcours de listes."""
+    # Étiquettes alternées sur une seule caractéristique : un nœud par seuil, arbre en peigne
+    x = np.arange(200, dtype=float)
+    X = np.column_stack([x, np.zeros_like(x), np.zeros_like(x), np.zeros_like(x)])
+    y = np.where(x % 2 == 0, "OK", "KO")
+    foret = RandomForestClassifier(n_estimators=3, bootstrap=False, random_state=0).fit(X, y)
+    compilee = ForetCompilee.depuis_sklearn(foret, FEATURES)
+    assert compilee.profondeur > PROFONDEUR_MAX_CODE
+    X_test = X + np.array([0.4, 0.0, 0.0, 0.0])
+    _verifier(foret, compilee, np.vstack([X, X_test]))
+
+
+def test_ordre_des_features_remappe():
+    """Une forêt entraînée sur un DataFrame est compilée dans l'ordre de colonnes demandé."""
+    import pandas as pd
+
+    foret, X = _foret(n_arbres=5)
+    df = pd.DataFrame(X[:, ::-1], columns=FEATURES[::-1])
+    foret_df = RandomForestClassifier(n_estimators=5, random_state=42).fit(df, foret.predict(X))
+    compilee = ForetCompilee.depuis_sklearn(foret_df, FEATURES)
+    np.testing.assert_array_equal(compilee.predire(X), foret_df.predict(df))
+    assert [compilee.predire_un(*ligne) for ligne in X[:100]] == foret_df.predict(df.iloc[:100]).tolist()
+
+
+def test_sauvegarde_puis_chargement_en_memoire_mappee(tmp_path):
+    """Une forêt écrite sur disque et rouverte en mmap prédit comme la forêt sklearn."""
+    foret, X = _foret()
+    dossier = str(tmp_path / "modele.pkl.compile")
+    ForetCompilee.depuis_sklearn(foret, FEATURES).sauvegarder(dossier)
+
+    chargee = ForetCompilee.charger(dossier)
+    assert isinstance(chargee.seuil, np.memmap)
+    assert chargee.features == FEATURES
+    _verifier(foret, chargee, X)
+
+
+def test_export_perime_ignore(tmp_path):
+    """Un fichier réécrit après son export compilé est relu à la place de l'export périmé."""
+    foret, X = _foret()
+    chemin = str(tmp_path / "modele.pkl")
+    sauvegarder_artefact(foret, chemin, FEATURES)
+    assert compile_a_jour(chemin)
+    assert isinstance(charger_artefact(chemin), ForetCompilee)
+
+    # Nouveau modèle écrit sans export, plus récent que meta.json
+    nouvelle = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, foret.predict(X)[::-1])
+    joblib.dump(nouvelle, chemin)
+    mtime = os.path.getmtime(os.path.join(chemin + SUFFIXE_COMPILE, "meta.json"))
+    os.utime(chemin, (mtime + 10, mtime + 10))
+    assert not compile_a_jour(chemin)
+    assert isinstance(charger_artefact(chemin), RandomForestClassifier)
+
+    modele = ModeleIA()
+    modele.charger(chemin)
+    assert modele.compilee is None
+    np.testing.assert_array_equal(modele.predire(X), nouvelle.predict(X))
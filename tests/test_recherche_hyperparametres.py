@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la recherche d'hyperparamètres sous budget CPU.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ia.recherche_hyperparametres import _empreinte_donnees, rechercher
+
+
+def _donnees(n: int = 3000):
+    """Jeu synthétique à trois classes, quatre caractéristiques."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n, 4))
+    score = X[:, 0] + 0.5 * X[:, 1] + 0.3 * rng.normal(size=n)
+    y = np.where(score > 0.5, "OK", np.where(score > -0.5, "Dégradé", "KO"))
+    return X, y
+
+
+def test_empreinte_distingue_les_etiquettes_et_la_forme():
+    """Des étiquettes ou une forme différentes ne partagent jamais les plis en cache."""
+    X = np.zeros((2, 2))
+    assert _empreinte_donnees(X, np.array(["OK", "KO"])) != _empreinte_donnees(X, np.array(["OKK", "O"]))
+    assert _empreinte_donnees(X, ["OK", "KO"]) != _empreinte_donnees(X.reshape(4, 1)[:2], ["OK", "KO"])
+    assert _empreinte_donnees(X, ["OK", "KO"]) == _empreinte_donnees(X.copy(), np.array(["OK", "KO"]))
+
+
+def test_budget_minuscule_renvoie_le_meilleur_resultat(tmp_path):
+    """Budget dépassé dès le calibrage : les plis abandonnés ne font pas échouer la recherche."""
+    X, y = _donnees()
+    resultat = rechercher(X, y, budget_cpu=1e-6, n_candidats=8, workers=2,
+                          dossier_cache=str(tmp_path), verbeux=False)
+    assert resultat["budget_epuise"]
+    assert resultat["meilleur"]["algo"] in ("Random Forest", "KNN", "SVM", "Régression Logistique")
+    assert resultat["plis_calcules"] >= 1
+
+
+def test_budget_court_svm_knn(tmp_path):
+    """Budget court : la recherche s'arrête sans erreur et compte le temps CPU réellement consommé."""
+    X, y = _donnees(20_000)
+    resultat = rechercher(X, y, algorithmes=["SVM", "KNN"], budget_cpu=0.5, workers=2,
+                          dossier_cache=str(tmp_path), verbeux=False)
+    assert resultat["meilleur"]["algo"] in ("SVM", "KNN")
+    assert resultat["cpu_utilise"] > 0
+
+
+def test_reprise_depuis_le_cache(tmp_path):
+    """Relancée à l'identique, la recherche reprend tous ses plis du cache sans consommer de budget."""
+    X, y = _donnees(1000)
+    options = dict(algorithmes=["KNN", "Régression Logistique"], budget_cpu=60, n_candidats=4, workers=2,
+                   dossier_cache=str(tmp_path), verbeux=False)
+    premier = rechercher(X, y, **options)
+    second = rechercher(X, y, **options)
+    assert second["meilleur"] == premier["meilleur"]
+    assert second["plis_calcules"] == 0
+    assert second["cpu_utilise"] == 0
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des agrégats incrémentaux de l'historique, comparés à un groupby pandas.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.stockage import StockageMesures
+
+
+def _lot(rng, n: int, debut: float) -> pd.DataFrame:
+    """Mesures de trois liaisons sur quelques minutes, avec des RSSI manquants."""
+    df = pd.DataFrame({
+        "ts": debut + np.sort(rng.uniform(0, 300, n)),
+        "liaison": rng.choice(["L1", "L2", "L3"], n),
+        "rssi": rng.normal(-60, 8, n),
+        "snr": rng.normal(20, 4, n),
+        "etat": rng.choice(["OK", "Dégradé", "KO"], n),
+    })
+    df.loc[rng.random(n) < 0.1, "rssi"] = np.nan
+    return df
+
+
+def _ecrire(stockage: StockageMesures, df: pd.DataFrame) -> None:
+    stockage.ajouter_lot(df["liaison"], df["rssi"], df["snr"], np.zeros(len(df)), np.full(len(df), 99.9),
+                         df["etat"], timestamp=df["ts"])
+
+
+def _attendu(df: pd.DataFrame, largeur: int) -> pd.DataFrame:
+    """Les agrégats recalculés avec pandas, une ligne par fenêtre."""
+    groupes = df.assign(debut=(df["ts"] // largeur) * largeur).groupby("debut")
+    return pd.DataFrame({
+        "nb": groupes.size(),
+        "nb_ok": groupes["etat"].apply(lambda e: (e == "OK").sum()),
+        "nb_degrade": groupes["etat"].apply(lambda e: (e == "Dégradé").sum()),
+        "nb_ko": groupes["etat"].apply(lambda e: (e == "KO").sum()),
+        "rssi_moy": groupes["rssi"].mean(), "rssi_min": groupes["rssi"].min(), "rssi_max": groupes["rssi"].max(),
+        "snr_moy": groupes["snr"].mean(), "snr_min": groupes["snr"].min(), "snr_max": groupes["snr"].max(),
+    }).reset_index()
+
+
+def _comparer(obtenu: pd.DataFrame, attendu: pd.DataFrame) -> None:
+    obtenu = obtenu[attendu.columns].reset_index(drop=True)
+    pd.testing.assert_frame_equal(obtenu, attendu, check_dtype=False, rtol=1e-9)
+
+
+def test_agregats_incrementaux_egaux_au_groupby(tmp_path):
+    """Deux lots qui se chevauchent sur les mêmes minutes : les cumuls égalent un recalcul complet."""
+    rng = np.random.default_rng(0)
+    debut = 1_700_000_010.0
+    premier, second = _lot(rng, 400, debut), _lot(rng, 300, debut + 150)
+    chemin = str(tmp_path / "historique.db")
+
+    with StockageMesures(chemin) as stockage:
+        _ecrire(stockage, premier)
+        _ecrire(stockage, second)
+        tout = pd.concat([premier, second], ignore_index=True)
+
+        _comparer(stockage.agreger("minute"), _attendu(tout, 60))
+        _comparer(stockage.agreger("heure", liaison="L2"), _attendu(tout[tout["liaison"] == "L2"], 3600))
+        fenetre = stockage.agreger("minute", debut=debut + 120, fin=debut + 300)
+        dans_plage = tout[(tout["ts"] // 60 * 60 >= debut + 120) & (tout["ts"] // 60 * 60 < debut + 300)]
+        _comparer(fenetre, _attendu(dans_plage, 60))
+
+        resume = stockage.resume(granularite="jour")
+        assert resume["nb"] == len(tout)
+        assert resume["nb_ko"] == (tout["etat"] == "KO").sum()
+        assert np.isclose(resume["rssi_moy"], tout["rssi"].mean())
+
+    # Agrégats persistés : relus tels quels à la réouverture
+    with StockageMesures(chemin) as stockage:
+        _comparer(stockage.agreger("minute"), _attendu(tout, 60))
+
+
+def test_historique_vide(tmp_path):
+    """Sans mesure : aucune fenêtre, et un résumé à zéro."""
+    with StockageMesures(str(tmp_path / "historique.db")) as stockage:
+        assert stockage.agreger("minute").empty
+        assert stockage.resume()["nb"] == 0
+        assert stockage.resume_sessions().empty
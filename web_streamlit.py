@@ -14,8 +14,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from src.simulateur.simulateur import SimulateurFaisceauHertzien
 from src.ia.modele import ModeleIA
+from src.ia.artefacts import SUFFIXE_COMPILE
+from src.ia.registre import obtenir_modele
 from src.affichage.cli import AffichageCLI
 from src.utils.dataset_generator import DatasetGenerator
+from src.utils.decimation import decimer
 
 def main():
     """Fonction principale pour l'application Streamlit."""
@@ -66,6 +69,7 @@ def main():
                     # Entraîner le modèle
                     modele.entrainer_et_evaluer(dataset)
                     modele.sauvegarder("modele.pkl")
+                    modele.exporter_compile("modele.pkl" + SUFFIXE_COMPILE)
                     st.success("Modèle entraîné et sauvegardé avec succès")
                     
                     # Afficher les métriques
@@ -123,10 +127,9 @@ def main():
             elapsed_time = (current_time - st.session_state.start_time).total_seconds()
             new_data["elapsed_time"] = elapsed_time
             
-            # Charger le modèle s'il n'est pas déjà chargé
+            # Modèle partagé par le registre : relu uniquement si le fichier a changé
             try:
-                if not hasattr(modele, 'modele_entraine') or not modele.modele_entraine:
-                    modele.charger("modele.pkl")
+                modele = obtenir_modele("modele.pkl")
             except FileNotFoundError:
                 st.warning("Aucun modèle entraîné trouvé. Veuillez d'abord entraîner un modèle.")
                 st.session_state.running = False
@@ -161,25 +164,25 @@ def main():
             # Créer des graphiques
             fig, axes = plt.subplots(2, 2, figsize=(10, 8))
             
-            axes[0, 0].plot(elapsed_time, st.session_state.data_history["rssi"], 'b-')
+            axes[0, 0].plot(*decimer(elapsed_time, st.session_state.data_history["rssi"]), 'b-')
             axes[0, 0].set_title("RSSI (dBm)")
             axes[0, 0].set_xlabel("Temps (s)")
             axes[0, 0].set_ylabel("RSSI (dBm)")
             axes[0, 0].grid(True)
             
-            axes[0, 1].plot(elapsed_time, st.session_state.data_history["snr"], 'g-')
+            axes[0, 1].plot(*decimer(elapsed_time, st.session_state.data_history["snr"]), 'g-')
             axes[0, 1].set_title("SNR (dB)")
             axes[0, 1].set_xlabel("Temps (s)")
             axes[0, 1].set_ylabel("SNR (dB)")
             axes[0, 1].grid(True)
             
-            axes[1, 0].plot(elapsed_time, st.session_state.data_history["ber"], 'r-')
+            axes[1, 0].plot(*decimer(elapsed_time, st.session_state.data_history["ber"]), 'r-')
             axes[1, 0].set_title("BER")
             axes[1, 0].set_xlabel("Temps (s)")
             axes[1, 0].set_ylabel("BER")
             axes[1, 0].grid(True)
             
-            axes[1, 1].plot(elapsed_time, st.session_state.data_history["disponibilite"], 'y-')
+            axes[1, 1].plot(*decimer(elapsed_time, st.session_state.data_history["disponibilite"]), 'y-')
             axes[1, 1].set_title("Disponibilité (%)")
             axes[1, 1].set_xlabel("Temps (s)")
             axes[1, 1].set_ylabel("Disponibilité (%)")
@@ -198,7 +201,7 @@ def main():
         
         # Charger le modèle s'il existe
         try:
-            modele.charger("modele.pkl")
+            modele = obtenir_modele("modele.pkl")
             st.success("Modèle chargé avec succès")
             
             # Afficher les informations du modèle